@@ -0,0 +1,6 @@
+"""These are the benchmarks of single, which measure how fast providers load, how fast searches fan out to the
+sources and how many requests the server handles, using synthetic providers so that no package manager is touched.
+
+Run them with `python -m benchmarks`, which prints (or saves) the results as JSON and can compare them against the
+results of an earlier run to catch regressions.
+"""
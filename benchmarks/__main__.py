@@ -0,0 +1,64 @@
+import typer as ty
+from benchmarks import suite
+from loguru import logger
+from pathlib import Path
+import typing as t
+import json
+
+app = ty.Typer(help="This runs the benchmarks of single.")
+
+
+@app.command()
+def run(
+    providers: int = ty.Option(20, help="The amount of synthetic providers."),
+    packages: int = ty.Option(1000, help="The amount of packages of every provider."),
+    delay: float = ty.Option(
+        0.0, help="The amount of seconds every call to a source takes."
+    ),
+    repeat: int = ty.Option(5, help="The amount of times provider loads are measured."),
+    requests: int = ty.Option(200, help="The amount of requests sent to the server."),
+    clients: int = ty.Option(4, help="The amount of clients sending requests at once."),
+    output: t.Optional[Path] = ty.Option(
+        None, help="Where to save the results. By default they're printed."
+    ),
+    baseline: t.Optional[Path] = ty.Option(
+        None, help="The results of an earlier run to compare against."
+    ),
+    tolerance: float = ty.Option(
+        suite.DEFAULT_TOLERANCE,
+        help="How much (relatively) worse than the baseline a result may be.",
+    ),
+) -> None:
+    """Use this command to run the benchmarks, optionally failing if they regressed since a baseline."""
+    logger.remove()
+    results = suite.run(providers, packages, delay, repeat, requests, clients)
+    if output is None:
+        ty.echo(json.dumps(results, indent=4))
+    else:
+        output.write_text(json.dumps(results, indent=4))
+
+    if baseline is None:
+        return
+
+    try:
+        comparisons = suite.compare(suite.load(baseline), results, tolerance)
+    except ValueError as error:
+        ty.echo(
+            f"The results can't be compared against the baseline: {error}", err=True
+        )
+        raise ty.Exit(2)
+
+    for comparison in comparisons:
+        verdict = "REGRESSED" if comparison.regressed else "ok"
+        ty.echo(
+            f"{comparison.name}: {comparison.baseline:.6g} -> {comparison.current:.6g} "
+            f"({comparison.change:+.1%} worse) {verdict}",
+            err=True,
+        )
+
+    if any(comparison.regressed for comparison in comparisons):
+        raise ty.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,349 @@
+"""This is the benchmark suite, along with the results it gives back and how they're compared against a baseline."""
+from benchmarks.synthetic import write_providers
+from single.core import ProviderMetadata
+from single.glue import SinglePackageManager
+from single.server import core, search as search_
+from single.server.catalog import Catalog
+from single.server.engines import SingleThreadedServer
+from single.server.fuzzy import FuzzyIndex
+from single.server.providers.core import get_providers
+from single.server.providers.manifest import ProviderManifest
+from single.server.providers.support import SupportCache
+from concurrent import futures
+from pathlib import Path
+import typing as t
+import contextlib
+import threading
+import tempfile
+import platform
+import json
+import time
+import attr
+
+# the version of the results file, bumped whenever results stop being comparable with older ones.
+RESULTS_VERSION = 2
+# by default, a result this much (relatively) worse than its baseline is a regression.
+DEFAULT_TOLERANCE = 0.2
+# what is searched for by the search benchmarks; a few parts of names which match some packages and one which matches
+# none.
+QUERIES = ("kalo", "libba", "-dev", "nothing-matches")
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Result:
+    """This is a single measurement.
+
+    Args:
+        value: The measured value.
+        unit: The unit of the value, such as `s` or `req/s`.
+        higher_is_better: Whether a higher value is an improvement (such as for throughput) or a regression (such as
+                          for latency).
+    """
+
+    value: float
+    unit: str
+    higher_is_better: bool = False
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Comparison:
+    """This is how a measurement compares against its baseline.
+
+    Args:
+        name: The name of the measurement.
+        baseline: The value in the baseline.
+        current: The value now.
+        change: The relative change from the baseline, where a positive change is always for the worse.
+        regressed: Whether or not the change is beyond the tolerance.
+    """
+
+    name: str
+    baseline: float
+    current: float
+    change: float
+    regressed: bool
+
+
+def percentile(samples: t.Sequence[float], percent: float) -> float:
+    """This gets a percentile of samples, using the nearest rank.
+
+    Args:
+        samples: The samples, which mustn't be empty.
+        percent: The percentile, from 0 to 100.
+
+    Examples:
+        >>> percentile([4, 1, 3, 2], 50)
+        2
+
+    Returns:
+        The percentile.
+    """
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def latencies(prefix: str, samples: t.Sequence[float]) -> t.Dict[str, Result]:
+    """This summarizes latency samples.
+
+    Args:
+        prefix: What the names of the results start with.
+        samples: The latencies, in seconds.
+
+    Returns:
+        The median and the 99th percentile of the latencies.
+    """
+    return {
+        f"{prefix}_p50": Result(percentile(samples, 50), "s"),
+        f"{prefix}_p99": Result(percentile(samples, 99), "s"),
+    }
+
+
+def bench_provider_loading(providers_dir: Path, repeat: int = 5) -> t.Dict[str, Result]:
+    """This measures how long `get_providers` takes to load every provider, with nothing cached (cold) and with the
+    provider manifest and the support cache of an earlier load (warm).
+
+    Args:
+        providers_dir: The directory of the providers.
+        repeat: The amount of times each load is measured; the fastest time is kept.
+
+    Returns:
+        The load times.
+    """
+    cold, warm, lazy = [], [], []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            manifest_path = Path(cache_dir) / "providers.json"
+            support_path = Path(cache_dir) / "support.json"
+
+            started = time.perf_counter()
+            manifest = ProviderManifest.load(manifest_path)
+            verdicts = SupportCache.load(support_path)
+            get_providers([providers_dir], manifest, verdicts=verdicts)
+            cold.append(time.perf_counter() - started)
+            manifest.save()
+            verdicts.save()
+
+            for lazy_, times in ((False, warm), (True, lazy)):
+                started = time.perf_counter()
+                get_providers(
+                    [providers_dir],
+                    ProviderManifest.load(manifest_path),
+                    lazy=lazy_,
+                    verdicts=SupportCache.load(support_path),
+                )
+                times.append(time.perf_counter() - started)
+
+    return {
+        "load_cold": Result(min(cold), "s"),
+        "load_warm": Result(min(warm), "s"),
+        "load_warm_lazy": Result(min(lazy), "s"),
+    }
+
+
+def bench_fanout(
+    providers: t.List[ProviderMetadata], repeat: int = 20
+) -> t.Dict[str, Result]:
+    """This measures how long a search takes to fan out to the `package` method of every source and come back,
+    without any cache or catalog in the way.
+
+    Args:
+        providers: The providers.
+        repeat: The amount of searches measured.
+
+    Returns:
+        The latencies of the searches.
+    """
+    sources = {provider.name: provider.source_reference() for provider in providers}
+    samples = []
+    for index in range(repeat):
+        started = time.perf_counter()
+        search_.search(
+            [QUERIES[index % len(QUERIES)]],
+            providers,
+            Catalog(":memory:"),
+            lambda provider: sources[provider.name],
+        )
+        samples.append(time.perf_counter() - started)
+    search_.unindexable.difference_update(sources)
+
+    return latencies("fanout", samples)
+
+
+@contextlib.contextmanager
+def serving(providers: t.List[ProviderMetadata]) -> t.Iterator[SingleThreadedServer]:
+    """This serves providers from a server started on a free local port, with the search cache turned off.
+
+    Args:
+        providers: The providers.
+
+    Returns:
+        The server, which is closed once the context is left.
+    """
+    saved = {
+        name: getattr(core, name)
+        for name in ("catalog", "search_cache", "fuzzy_index", "sources")
+    }
+    saved_providers = list(core.providers)
+    core.providers[:] = providers
+    core.catalog = Catalog(":memory:")
+    core.search_cache = search_.SearchCache(ttl=0)
+    core.fuzzy_index = FuzzyIndex()
+    core.sources = {
+        provider.name: provider.source_reference() for provider in providers
+    }
+    server = SingleThreadedServer(
+        core.SinglePackageManagerService, hostname="127.0.0.1", port=0
+    )
+    server._listen()
+    threading.Thread(target=server.start, daemon=True).start()
+    try:
+        yield server
+    finally:
+        server.close()
+        core.providers[:] = saved_providers
+        search_.unindexable.difference_update(provider.name for provider in providers)
+        for name, value in saved.items():
+            setattr(core, name, value)
+
+
+def bench_rpc(
+    providers: t.List[ProviderMetadata], requests: int = 200, clients: int = 4
+) -> t.Dict[str, Result]:
+    """This measures the throughput and the latency of searches through `SinglePackageManager`, from several clients
+    at the same time, against a local server.
+
+    Args:
+        providers: The providers the server serves.
+        requests: The total amount of requests.
+        clients: The amount of clients sending requests at the same time.
+
+    Returns:
+        The requests per second and the latencies of the requests.
+    """
+    with serving(providers) as server:
+
+        def client(index: int) -> t.List[float]:
+            manager = SinglePackageManager.from_host("127.0.0.1", server.port)
+            samples = []
+            try:
+                for request in range(index, requests, clients):
+                    started = time.perf_counter()
+                    manager.search([QUERIES[request % len(QUERIES)]], [])
+                    samples.append(time.perf_counter() - started)
+            finally:
+                manager.close()
+            return samples
+
+        started = time.perf_counter()
+        with futures.ThreadPoolExecutor(max_workers=clients) as executor:
+            samples = [
+                sample
+                for samples_ in executor.map(client, range(clients))
+                for sample in samples_
+            ]
+        elapsed = time.perf_counter() - started
+
+    return {
+        "rpc_throughput": Result(len(samples) / elapsed, "req/s", True),
+        **latencies("rpc_search", samples),
+    }
+
+
+def run(
+    providers: int = 20,
+    packages: int = 1000,
+    delay: float = 0.0,
+    repeat: int = 5,
+    requests: int = 200,
+    clients: int = 4,
+) -> t.Dict[str, t.Any]:
+    """This runs the whole suite against freshly written synthetic providers.
+
+    Args:
+        providers: The amount of synthetic providers.
+        packages: The amount of packages of every provider.
+        delay: The amount of seconds every call to a source takes on top of the work it does.
+        repeat: The amount of times the provider loads are measured.
+        requests: The amount of requests sent to the server.
+        clients: The amount of clients sending requests at the same time.
+
+    Returns:
+        The results, along with what they were measured with, ready to be saved as JSON.
+    """
+    parameters = dict(
+        providers=providers,
+        packages=packages,
+        delay=delay,
+        repeat=repeat,
+        requests=requests,
+        clients=clients,
+    )
+    with tempfile.TemporaryDirectory() as root:
+        providers_dir = Path(root)
+        write_providers(providers_dir, providers, packages, delay)
+        results = bench_provider_loading(providers_dir, repeat)
+        loaded, _ = get_providers([providers_dir])
+        results.update(bench_fanout(loaded, repeat * 4))
+        results.update(bench_rpc(loaded, requests, clients))
+
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "results": {name: attr.asdict(result) for name, result in results.items()},
+    }
+
+
+def compare(
+    baseline: t.Dict[str, t.Any],
+    current: t.Dict[str, t.Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> t.List[Comparison]:
+    """This compares results against a baseline.
+
+    Args:
+        baseline: The results of an earlier run.
+        current: The results of this run.
+        tolerance: How much (relatively) worse than its baseline a result may be before it's a regression.
+
+    Raises:
+        ValueError: If the results can't be compared, because they use another version of the results file or were
+                    measured with other parameters.
+
+    Returns:
+        How every result found in both compares.
+    """
+    if baseline.get("version") != current.get("version"):
+        raise ValueError(
+            f"the baseline uses version {baseline.get('version')} of the results file, expected version "
+            f"{current.get('version')}"
+        )
+    if baseline.get("parameters") != current.get("parameters"):
+        raise ValueError("the baseline was measured with other parameters")
+
+    comparisons = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+
+        before, after = baseline["results"][name]["value"], result["value"]
+        change = (after - before) / before if before else 0.0
+        if result["higher_is_better"]:
+            change = -change
+        comparisons.append(Comparison(name, before, after, change, change > tolerance))
+
+    return comparisons
+
+
+def load(path: Path) -> t.Dict[str, t.Any]:
+    """This loads results saved as JSON.
+
+    Args:
+        path: The path of the results.
+
+    Returns:
+        The results.
+    """
+    return json.loads(path.read_text())
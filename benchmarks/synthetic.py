@@ -0,0 +1,45 @@
+"""These are the synthetic providers the benchmarks run against, written out in the usual provider layout."""
+from single.synthetic import write_provider
+from pathlib import Path
+import typing as t
+
+
+def provider_name(index: int) -> str:
+    """This gets the name of a synthetic provider.
+
+    Args:
+        index: The index of the provider.
+
+    Returns:
+        The name of the provider.
+    """
+    return f"synthetic-{index}"
+
+
+def write_providers(
+    root: Path, count: int, packages: int = 1000, delay: float = 0.0
+) -> t.List[Path]:
+    """This writes synthetic providers into a directory, which can then be loaded like any providers directory.
+
+    The providers can't list their packages, so that searches have to go through `Source.package`.
+
+    Args:
+        root: The directory to write the providers into.
+        count: The amount of providers.
+        packages: The amount of packages of every provider.
+        delay: The amount of seconds every search of a source takes on top of the work it does.
+
+    Returns:
+        The directories of the providers.
+    """
+    return [
+        write_provider(
+            root / provider_name(index),
+            provider_name(index),
+            packages=packages,
+            seed=index,
+            latency=delay,
+            indexable=False,
+        )
+        for index in range(count)
+    ]
@@ -1,6 +1,33 @@
-"""These contain the most common imports a developer would have and the version number for single."""
-from single.models import Package, Source
-from single.exceptions import UnsupportedSystemError
-from single.enums import System
+"""These contain the most common imports a developer would have and the version number for single.
+
+The imports are only made once they're first used, so that the command lines (which don't need them) start fast.
+"""
+import importlib
+import sys
+import typing as t
 
 __version__ = "0.1.0"
+# the most common imports, by the module they come from.
+_EXPORTS = {
+    "Package": "single.models",
+    "Source": "single.models",
+    "PackageTable": "single.models",
+    "UnsupportedSystemError": "single.exceptions",
+    "System": "single.enums",
+}
+__all__ = ["__version__", *_EXPORTS]
+
+if t.TYPE_CHECKING or sys.version_info < (3, 7):
+    # modules can only have a __getattr__ from python 3.7 on.
+    from single.models import Package, Source, PackageTable
+    from single.exceptions import UnsupportedSystemError
+    from single.enums import System
+else:
+
+    def __getattr__(name: str) -> t.Any:
+        if name not in _EXPORTS:
+            raise AttributeError(f"module 'single' has no attribute '{name}'")
+
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
@@ -12,3 +12,21 @@ class LoggingLevel(e.Enum):
     ERROR = "ERROR"
     CRITICAL = "CRITICAL"
     SUCCESS = "SUCCESS"
+
+
+class ServerEngine(e.Enum):
+    """This is how the server serves its connections."""
+
+    THREADED = "threaded"
+    POOL = "pool"
+    ASYNC = "async"
+
+
+class JobState(e.Enum):
+    """This is where a job on the server is at."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
@@ -3,6 +3,182 @@ import attr
 from pathlib import Path
 import rpyc  # type: ignore
 from rpyc.utils.factory import unix_connect  # type: ignore
+import typing as t
+import contextlib
+import threading
+import time
+
+T = t.TypeVar("T")
+# the default amount of idle connections a pool keeps around.
+DEFAULT_POOL_SIZE = 4
+# the default amount of seconds a connection may sit idle before it's checked to still be alive when it's reused.
+DEFAULT_KEEPALIVE = 30.0
+
+
+@attr.s(auto_attribs=True)
+class ConnectionPool:
+    """This is a pool of connections to a server, so that many operations can reuse connections instead of paying for
+    a new connection every time.
+
+    A connection which sat idle for longer than `keepalive` is pinged before it's reused, and a connection which turns
+    out to be dead is replaced by a new one, so a restarted server is reconnected to transparently.
+
+    Args:
+        connect: A function which opens a new connection to the server.
+        size: The maximum amount of idle connections kept around.
+        keepalive: The amount of seconds a connection may sit idle before it's checked to still be alive.
+    """
+
+    connect: t.Callable[[], rpyc.Connection]
+    size: int = DEFAULT_POOL_SIZE
+    keepalive: float = DEFAULT_KEEPALIVE
+    _idle: t.List[t.Tuple[rpyc.Connection, float]] = attr.ib(
+        factory=list, init=False, repr=False
+    )
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, init=False, repr=False)
+    _closed: bool = attr.ib(default=False, init=False, repr=False)
+
+    def _alive(self, conn: rpyc.Connection, last_used: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.keepalive:
+            return True
+
+        try:
+            conn.ping(timeout=1)
+        except Exception:
+            return False
+
+        return True
+
+    def acquire(self) -> rpyc.Connection:
+        """This takes a live connection out of the pool, opening a new one if there's no idle connection left.
+
+        Raises:
+            ValueError: If the pool is closed.
+
+        Returns:
+            The connection.
+        """
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise ValueError("the connection pool is closed")
+                if not self._idle:
+                    break
+
+                # the most recently used connection is the most likely to still be alive.
+                conn, last_used = self._idle.pop()
+
+            if self._alive(conn, last_used):
+                return conn
+
+            conn.close()
+
+        return self.connect()
+
+    def release(self, conn: rpyc.Connection) -> None:
+        """This puts a connection back into the pool, closing it if the pool is full.
+
+        Args:
+            conn: The connection.
+
+        Returns:
+            Nothing.
+        """
+        if conn.closed:
+            return
+
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append((conn, time.monotonic()))
+                return
+
+        conn.close()
+
+    @contextlib.contextmanager
+    def connection(self) -> t.Iterator[rpyc.Connection]:
+        """This borrows a connection from the pool for as long as the context lasts.
+
+        Returns:
+            The connection.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except (EOFError, OSError):
+            # the connection broke, so it shouldn't go back into the pool.
+            conn.close()
+            raise
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """This closes the pool and every idle connection in it.
+
+        Returns:
+            Nothing.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for conn, _ in idle:
+            conn.close()
+
+
+@attr.s(auto_attribs=True)
+class SharedConnection(ConnectionPool):
+    """This is a "pool" made of a single connection which was opened by the caller, so that a "glue" object can still
+    be made from an existing connection. Every operation shares the connection, like they would without a pool.
+
+    Args:
+        conn: The connection.
+    """
+
+    connect: t.Callable[[], rpyc.Connection] = attr.ib(init=False, repr=False)
+    conn: rpyc.Connection = attr.ib(default=None, kw_only=True)
+
+    def __attrs_post_init__(self) -> None:
+        self.connect = lambda: self.conn
+
+    def acquire(self) -> rpyc.Connection:
+        """This gives the shared connection.
+
+        Raises:
+            ValueError: If the pool is closed.
+
+        Returns:
+            The connection.
+        """
+        if self._closed:
+            raise ValueError("the connection pool is closed")
+
+        return self.conn
+
+    def release(self, conn: rpyc.Connection) -> None:
+        """This does nothing, since the connection is shared instead of being borrowed.
+
+        Args:
+            conn: The connection.
+
+        Returns:
+            Nothing.
+        """
+
+    def close(self) -> None:
+        """This closes the shared connection.
+
+        Returns:
+            Nothing.
+        """
+        self._closed = True
+        self.conn.close()
+
+
+def _as_pool(pool: t.Union[ConnectionPool, rpyc.Connection]) -> ConnectionPool:
+    # a connection made by the caller is shared by every operation, like it was before connections were pooled.
+    return pool if isinstance(pool, ConnectionPool) else SharedConnection(conn=pool)
 
 
 @attr.s(auto_attribs=True)
@@ -15,37 +191,85 @@ class Glue:
     This is also merely just helper methods that other classes should override just to make things a little easier.
 
     Args:
-        _conn: The connection to the server. You shouldn't use this; you should instead use the helper class methods
-               like from_host and from_unix_socket.
+        _pool: The pool of connections to the server, or a single connection to share between every operation. You
+               shouldn't use this; you should instead use the helper class methods like from_host and from_unix_socket.
     """
 
-    _conn: rpyc.Connection
+    _pool: ConnectionPool = attr.ib(converter=_as_pool)
 
     @classmethod
-    def from_host(cls, host: str, port: int) -> "Glue":
+    def from_host(
+        cls,
+        host: str,
+        port: int,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keepalive: float = DEFAULT_KEEPALIVE,
+    ) -> "Glue":
         """This establishes a connection to a server using a hostname and a port (ip addresses are also accepted).
 
         Args:
             host: The host (or ip address).
             port: The port.
+            pool_size: The maximum amount of idle connections kept around.
+            keepalive: The amount of seconds a connection may sit idle before it's checked to still be alive.
 
         Returns:
             A "glue" object with a connection established from a hostname and a port.
         """
-        conn = rpyc.connect(host, port)
+        pool = ConnectionPool(
+            lambda: rpyc.connect(host, port, keepalive=True), pool_size, keepalive
+        )
+        pool.release(pool.acquire())
 
-        return cls(conn)
+        return cls(pool)
 
     @classmethod
-    def from_unix_socket(cls, path: Path) -> "Glue":
+    def from_unix_socket(
+        cls,
+        path: Path,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keepalive: float = DEFAULT_KEEPALIVE,
+    ) -> "Glue":
         """This establishes a connection to the server using a path that uses unix sockets.
 
         Args:
             path: A path that uses unix sockets.
+            pool_size: The maximum amount of idle connections kept around.
+            keepalive: The amount of seconds a connection may sit idle before it's checked to still be alive.
 
         Returns:
             A "glue" object with a connection established from a unix socket.
         """
-        conn = unix_connect(str(path))
+        pool = ConnectionPool(lambda: unix_connect(str(path)), pool_size, keepalive)
+        pool.release(pool.acquire())
+
+        return cls(pool)
+
+    def _call(self, call: t.Callable[[t.Any], T], retry: bool = True) -> T:
+        """This calls the server using a connection from the pool.
+
+        Args:
+            call: A function which calls the server through the root of a connection.
+            retry: Whether or not to retry once on a new connection if the connection broke, which is only safe if the
+                   call can be safely done twice.
+
+        Returns:
+            What the call gave back.
+        """
+        try:
+            with self._pool.connection() as conn:
+                return call(conn.root)
+        except EOFError:
+            if not retry:
+                raise
 
-        return cls(conn)
+        with self._pool.connection() as conn:
+            return call(conn.root)
+
+    def close(self) -> None:
+        """This closes every connection to the server.
+
+        Returns:
+            Nothing.
+        """
+        self._pool.close()
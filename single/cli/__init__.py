@@ -1,3 +1,25 @@
-from single.cli.client import app as client_app
-from single.cli.server import app as server_app
-from single.cli.combined import app as combined_app
+"""These are the command lines of single. Every command line lives in its own module, which only imports what its
+commands use once they run, so that the command lines start fast."""
+import importlib
+import sys
+import typing as t
+
+# the command line apps, by the module they come from.
+_APPS = {
+    "client_app": "single.cli.client",
+    "server_app": "single.cli.server",
+    "combined_app": "single.cli.combined",
+}
+
+if t.TYPE_CHECKING or sys.version_info < (3, 7):
+    # modules can only have a __getattr__ from python 3.7 on.
+    from single.cli.client import app as client_app
+    from single.cli.server import app as server_app
+    from single.cli.combined import app as combined_app
+else:
+
+    def __getattr__(name: str) -> t.Any:
+        if name not in _APPS:
+            raise AttributeError(f"module 'single.cli' has no attribute '{name}'")
+
+        return importlib.import_module(_APPS[name]).app
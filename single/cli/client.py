@@ -1,3 +1,4 @@
+from pathlib import Path
 import typer as ty
 import typing as t
 
@@ -47,5 +48,46 @@ def update(
     pass
 
 
+@app.command()
+def outdated(
+    providers: t.List[str] = ty.Option(
+        [],
+        "--providers",
+        metavar="PROVIDERS",
+        help="The providers to use. By default every provider is used.",
+    ),
+    host: str = ty.Option("localhost", help="The host of the server."),
+    port: int = ty.Option(25000, help="The port of the server."),
+    unix_socket: t.Optional[Path] = ty.Option(
+        None,
+        help="Connect to the server through this unix socket instead of the host and the port.",
+    ),
+    max_age: t.Optional[float] = ty.Option(
+        None,
+        help="The amount of seconds the server may use what it knows of the providers' packages for.",
+    ),
+) -> None:
+    """This lists the packages which have a newer version available, as soon as each provider is done."""
+    from single.glue import SinglePackageManager
+
+    try:
+        manager = (
+            SinglePackageManager.from_unix_socket(unix_socket)
+            if unix_socket is not None
+            else SinglePackageManager.from_host(host, port)
+        )
+    except OSError as error:
+        ty.echo(f"Couldn't connect to the server: {error}", err=True)
+        raise ty.Exit(1)
+
+    try:
+        for package in manager.outdated_iter(providers, max_age):
+            ty.echo(
+                f"{package.provider}: {package.name} {package.installed} -> {package.available}"
+            )
+    finally:
+        manager.close()
+
+
 if __name__ == "__main__":
     app()
@@ -1,6 +1,13 @@
 import typer as ty
 from single import _enums as enums
-from single.server import start as start_
+from single.constants import (
+    SOCKET_PATH,
+    USER_PROVIDERS_DIR,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_QUEUE_DEPTH,
+)
+from pathlib import Path
+import typing as t
 
 app = ty.Typer(help="This is the command line frontend for the single server.")
 
@@ -8,10 +15,115 @@ app = ty.Typer(help="This is the command line frontend for the single server.")
 @app.command()
 def start(
     port: int = ty.Option(25000, help="The port to broadcast to."),
+    tcp: bool = ty.Option(
+        True,
+        help="Listen on the port. Turn this off to only listen on the unix socket.",
+    ),
+    unix_socket: bool = ty.Option(
+        False,
+        help="Also listen on a unix socket, which local clients connect to the fastest.",
+    ),
+    socket_path: Path = ty.Option(
+        SOCKET_PATH, help="The path of the unix socket to listen on."
+    ),
     logging_level: enums.LoggingLevel = ty.Option("INFO", help="The logging level."),
+    watch: bool = ty.Option(
+        False, help="Reload providers as soon as their directories change."
+    ),
+    lazy: bool = ty.Option(
+        False, help="Only load each provider once it is first used."
+    ),
+    engine: enums.ServerEngine = ty.Option(
+        "threaded",
+        help="How connections are served: a thread per connection, a bounded thread pool or an event loop.",
+    ),
+    max_workers: int = ty.Option(
+        DEFAULT_MAX_WORKERS,
+        help="The amount of connections (requests for the async engine) served at the same time.",
+    ),
+    queue_depth: int = ty.Option(
+        DEFAULT_QUEUE_DEPTH,
+        help="The amount of connections (requests for the async engine) which may wait for a free worker.",
+    ),
+    metrics_file: t.Optional[Path] = ty.Option(
+        None, help="Export the metrics to this file in the Prometheus text format."
+    ),
+    metrics_port: t.Optional[int] = ty.Option(
+        None, help="Serve the metrics on this local port in the Prometheus text format."
+    ),
+    profile: bool = ty.Option(
+        False,
+        help="Profile the requests and source calls; the profiles are written once the server stops.",
+    ),
+    profile_mode: str = ty.Option(
+        "cprofile",
+        help="How to profile: cprofile (pstats files) or sampling (collapsed stacks, for flamegraphs).",
+    ),
+    profile_rate: float = ty.Option(
+        1.0, help="The share of the requests and source calls profiled, from 0 to 1."
+    ),
+    profile_interval: float = ty.Option(
+        0.005, help="The amount of seconds between two samples when sampling."
+    ),
 ) -> None:
     """Use this command to start the server."""
-    start_(port, logging_level)
+    from single.server import start as start_
+
+    start_(
+        port if tcp else None,
+        logging_level,
+        watch,
+        lazy,
+        engine,
+        max_workers,
+        queue_depth,
+        socket_path if unix_socket else None,
+        metrics_file,
+        metrics_port,
+        profile_mode if profile else None,
+        profile_rate,
+        profile_interval,
+    )
+
+
+@app.command()
+def synthetic(
+    count: int = ty.Argument(1, help="The amount of synthetic providers."),
+    directory: Path = ty.Option(
+        USER_PROVIDERS_DIR, help="Where to write the synthetic providers."
+    ),
+    preset: t.Optional[str] = ty.Option(
+        None,
+        help="Behave like a package manager; either apt or pip.",
+    ),
+    packages: t.Optional[int] = ty.Option(
+        None, help="The amount of packages of every provider."
+    ),
+    latency: t.Optional[float] = ty.Option(
+        None, help="The median amount of seconds a search takes."
+    ),
+    failure_rate: t.Optional[float] = ty.Option(
+        None, help="The chance of a call failing, from 0 to 1."
+    ),
+) -> None:
+    """Use this command to write synthetic providers, which behave like package managers without touching any, to
+    load test the server. Fine tune them through the synthetic table of their provider.toml."""
+    from single import synthetic as synthetic_
+
+    options = dict(
+        preset=preset, packages=packages, latency=latency, failure_rate=failure_rate
+    )
+    table = {key: value for key, value in options.items() if value is not None}
+    for index in range(count):
+        name = f"synthetic-{preset or 'provider'}-{index}"
+        try:
+            path = synthetic_.write_provider(
+                directory / name, name, seed=index, **table
+            )
+        except ValueError as error:
+            ty.echo(f"The synthetic provider can't be written: {error}", err=True)
+            raise ty.Exit(1)
+        ty.echo(f"Wrote the synthetic provider '{name}' to '{path}'")
 
 
 if __name__ == "__main__":
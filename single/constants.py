@@ -6,6 +6,18 @@ APP_NAME = "single"
 AUTHOR = "ALinuxPerson"
 _appdirs = appdirs.AppDirs(APP_NAME, AUTHOR)
 USER_DATA_DIR = Path(_appdirs.user_data_dir)
+USER_CACHE_DIR = Path(_appdirs.user_cache_dir)
 USER_PROVIDERS_DIR = USER_DATA_DIR / "providers"
 GLOBAL_PROVIDERS_DIR = Path(__file__).parent / "providers"
 PROVIDERS_DIRS = [GLOBAL_PROVIDERS_DIR, USER_PROVIDERS_DIR]
+CATALOG_PATH = USER_CACHE_DIR / "catalog.sqlite3"
+PROVIDER_MANIFEST_PATH = USER_CACHE_DIR / "providers.json"
+SUPPORT_CACHE_PATH = USER_CACHE_DIR / "support.json"
+SOCKET_PATH = USER_CACHE_DIR / "server.sock"
+INSTALLED_PATH = USER_DATA_DIR / "installed.sqlite3"
+PROFILES_DIR = USER_CACHE_DIR / "profiles"
+
+# the default amount of connections (or requests, for the async engine) that are served at the same time.
+DEFAULT_MAX_WORKERS = 16
+# the default amount of connections (or requests, for the async engine) that may wait for a free worker.
+DEFAULT_QUEUE_DEPTH = 64
@@ -1,4 +1,5 @@
 """This is where the context system and most classes overriding the context system lives."""
+import typing as t
 import loguru
 import attr
 
@@ -141,46 +142,88 @@ class VoidContext(Context):
 
 @attr.s(auto_attribs=True)
 class ServerContext(Context):
+    """This is a server context.
+
+    This is a context where every message is logged by the server, line by line. Messages below `minimum_level` are
+    thrown away right away, without even being put together.
+    """
+
     logger: "loguru.Logger"
+    # the severity of the least severe message which gets logged, as a loguru level number. it's shared by every
+    # server context, and kept in sync with the logging level of the server.
+    minimum_level: t.ClassVar[int] = 0
 
-    def trace(self, *message: str) -> None:
-        combined_message = " ".join(message)
+    def _log(self, method: str, level: int, message: t.Tuple[str, ...]) -> None:
+        if level < ServerContext.minimum_level:
+            return
 
-        for line in combined_message.splitlines():
-            self.logger.trace(line)
+        # the depth makes the messages point at whoever called the context, not at the context itself.
+        log = getattr(self.logger.opt(depth=2), method)
+        for line in " ".join(message).splitlines():
+            log(line)
 
-    def debug(self, *message: str) -> None:
-        combined_message = " ".join(message)
+    def trace(self, *message: str) -> None:
+        self._log("trace", 5, message)
 
-        for line in combined_message.splitlines():
-            self.logger.debug(line)
+    def debug(self, *message: str) -> None:
+        self._log("debug", 10, message)
 
     def info(self, *message: str) -> None:
-        combined_message = " ".join(message)
+        self._log("info", 20, message)
+
+    def warn(self, *message: str) -> None:
+        self._log("warning", 30, message)
 
-        for line in combined_message.splitlines():
-            self.logger.info(line)
+    def error(self, *message: str) -> None:
+        self._log("error", 40, message)
+
+    def critical(self, *message: str) -> None:
+        self._log("critical", 50, message)
+
+    def success(self, *message: str) -> None:
+        self._log("success", 25, message)
+
+
+@attr.s(auto_attribs=True)
+class BufferedContext(Context):
+    """This is a buffered context.
+
+    This is a context which holds on to every message until it is replayed into another context. This is useful
+    when sources are run on worker threads but their messages should still come out in a predictable order.
+    """
+
+    messages: t.List[t.Tuple[str, t.Tuple[str, ...]]] = attr.ib(factory=list)
+
+    def trace(self, *message: str) -> None:
+        self.messages.append(("trace", message))
+
+    def debug(self, *message: str) -> None:
+        self.messages.append(("debug", message))
+
+    def info(self, *message: str) -> None:
+        self.messages.append(("info", message))
 
     def warn(self, *message: str) -> None:
-        combined_message = " ".join(message)
+        self.messages.append(("warn", message))
 
-        for line in combined_message.splitlines():
-            self.logger.warning(line)
+    def success(self, *message: str) -> None:
+        self.messages.append(("success", message))
 
     def error(self, *message: str) -> None:
-        combined_message = " ".join(message)
-
-        for line in combined_message.splitlines():
-            self.logger.error(line)
+        self.messages.append(("error", message))
 
     def critical(self, *message: str) -> None:
-        combined_message = " ".join(message)
+        self.messages.append(("critical", message))
 
-        for line in combined_message.splitlines():
-            self.logger.critical(line)
+    def replay(self, context: Context) -> None:
+        """This replays every buffered message into another context, in the order they came in.
 
-    def success(self, *message: str) -> None:
-        combined_message = " ".join(message)
+        Args:
+            context: The context to replay the messages into.
 
-        for line in combined_message.splitlines():
-            self.logger.success(line)
+        Returns:
+            Nothing.
+        """
+        messages, self.messages = self.messages, []
+        for level, message in messages:
+            getattr(context, level)(*message)
@@ -15,24 +15,57 @@ class ProviderMetadata:
         name: The name of the provider.
         version: The version of the provider.
         description: The description of the provider.
-        source_reference: The raw, uninitialized source class.
-        package_reference: The raw, uninitialized package class.
+        source_reference: The raw, uninitialized source class, or a lazy reference to it.
+        package_reference: The raw, uninitialized package class, or a lazy reference to it.
         dependencies: The python dependencies the provider needs.
     """
 
     name: str
     version: str
     description: str
-    source_reference: t.Type[Source]
-    package_reference: t.Type[Package]
+    _source_reference: t.Union[t.Type[Source], u.LazyReference]
+    _package_reference: t.Union[t.Type[Package], u.LazyReference]
     dependencies: t.List[str]
 
+    @property
+    def source_reference(self) -> t.Type[Source]:
+        """The raw, uninitialized source class. The provider's module is executed if it's lazy and wasn't yet.
+
+        Returns:
+            The source class.
+        """
+        return u.resolve(self._source_reference)
+
+    @property
+    def package_reference(self) -> t.Type[Package]:
+        """The raw, uninitialized package class. The provider's module is executed if it's lazy and wasn't yet.
+
+        Returns:
+            The package class.
+        """
+        return u.resolve(self._package_reference)
+
+    @property
+    def deferred(self) -> bool:
+        """Whether or not this provider's module still has to be executed.
+
+        Returns:
+            Whether or not this provider's module still has to be executed.
+        """
+        return (
+            isinstance(self._source_reference, u.LazyReference)
+            and not self._source_reference.module.loaded
+        )
+
     @classmethod
-    def from_provider(cls, provider_path: Path) -> "ProviderMetadata":
+    def from_provider(
+        cls, provider_path: Path, lazy: bool = False
+    ) -> "ProviderMetadata":
         """This gets ProviderMetadata from a provider folder.
 
         Args:
             provider_path: The provider path.
+            lazy: Whether or not to defer executing the provider's module until its classes are first used.
 
         Raises:
             FileNotFoundError: If the provider path doesn't exist
@@ -50,9 +83,32 @@ class ProviderMetadata:
 
         metadata_path = provider_path / "provider.toml"
         metadata = toml.loads(metadata_path.read_text())["metadata"]
-        module = u.get_module(provider_path / "__init__.py")
-        source_ref = getattr(module, metadata["source_name"])
-        package_ref = getattr(module, metadata["package_name"])
+        return cls.from_metadata(provider_path, metadata, lazy)
+
+    @classmethod
+    def from_metadata(
+        cls, provider_path: Path, metadata: t.Dict[str, t.Any], lazy: bool = False
+    ) -> "ProviderMetadata":
+        """This gets ProviderMetadata from the already parsed metadata of a provider folder.
+
+        Args:
+            provider_path: The provider path.
+            metadata: The metadata table of the provider's provider.toml.
+            lazy: Whether or not to defer executing the provider's module until its classes are first used.
+
+        Returns:
+            The provider metadata.
+        """
+        source_ref: t.Union[t.Type[Source], u.LazyReference]
+        package_ref: t.Union[t.Type[Package], u.LazyReference]
+        if lazy:
+            lazy_module = u.LazyModule(provider_path / "__init__.py")
+            source_ref = u.LazyReference(lazy_module, metadata["source_name"])
+            package_ref = u.LazyReference(lazy_module, metadata["package_name"])
+        else:
+            module = u.get_module(provider_path / "__init__.py")
+            source_ref = getattr(module, metadata["source_name"])
+            package_ref = getattr(module, metadata["package_name"])
         return cls(
             metadata["name"],
             metadata["version"],
@@ -3,12 +3,29 @@ import attr
 from single._models import Glue
 from single import utils
 from single.core import ProviderMetadata
-from single import Package
+from single import wire
 import typing as t
 
+# how the client refers to providers, which are sent to the server as their names.
+Providers = t.Sequence[t.Union[str, ProviderMetadata]]
+
 
 @attr.s(auto_attribs=True)
 class SinglePackageManager(Glue):
+    @staticmethod
+    def _arguments(
+        packages: t.Iterable[str], providers_: Providers
+    ) -> t.Tuple[t.Tuple[str, ...], t.Tuple[str, ...]]:
+        # tuples of strings are sent by value, unlike lists, which the server would have to read item by item.
+        return tuple(packages), tuple(wire.provider_names(providers_))
+
+    @staticmethod
+    def _outdated_arguments(
+        providers_: Providers, max_age: t.Optional[float]
+    ) -> t.Tuple[t.Any, ...]:
+        names = tuple(wire.provider_names(providers_))
+        return (names,) if max_age is None else (names, max_age)
+
     @property
     def status(self) -> utils.ServerState:
         """This gets the current status of the server, including all recoverable errors found.
@@ -16,7 +33,7 @@ class SinglePackageManager(Glue):
         Returns:
             The status of the server.
         """
-        return self._conn.root.status
+        return self._call(lambda root: root.status)
 
     def reload_providers(self) -> None:
         """This reloads providers.
@@ -24,53 +41,96 @@ class SinglePackageManager(Glue):
         Returns:
             Nothing.
         """
-        return self._conn.root.reload_providers()
+        return self._call(lambda root: root.reload_providers())
 
     def search(
-        self, packages: t.List[str], providers_: t.List[ProviderMetadata]
-    ) -> t.List[Package]:
+        self, packages: t.List[str], providers_: Providers
+    ) -> t.List[wire.PackageRecord]:
         """This searches for packages in all providers (or some).
 
         Args:
             packages: The packages to search for.
-            providers_: The providers to search packages from.
+            providers_: The providers (or their names) to search packages from.
 
         Returns:
             A list of packages found.
         """
-        return self._conn.root.search(packages, providers_)
+        arguments = self._arguments(packages, providers_)
+        return wire.unpack_packages(self._call(lambda root: root.search(*arguments)))
+
+    def suggest(
+        self, name: str, providers_: Providers = (), limit: int = 10
+    ) -> t.List[wire.PackageRecord]:
+        """This suggests the packages with the names most similar to a (possibly mistyped) name.
+
+        Args:
+            name: The name.
+            providers_: The providers (or their names) to suggest packages from. By default every provider is used.
+            limit: The maximum amount of suggestions.
+
+        Returns:
+            The suggestions, most similar first.
+        """
+        names = tuple(wire.provider_names(providers_))
+        return wire.unpack_packages(
+            self._call(lambda root: root.suggest(name, names, limit))
+        )
+
+    def search_iter(
+        self,
+        packages: t.List[str],
+        providers_: Providers,
+        page_size: int = 100,
+    ) -> t.Iterator[wire.PackageRecord]:
+        """This searches for packages in all providers (or some), giving back the packages as soon as they're found
+        instead of waiting for every provider to be done.
+
+        Args:
+            packages: The packages to search for.
+            providers_: The providers (or their names) to search packages from.
+            page_size: The maximum amount of packages fetched from the server at once.
+
+        Returns:
+            An iterator of the packages found.
+        """
+        with self._pool.connection() as conn:
+            cursor_id = conn.root.search_start(*self._arguments(packages, providers_))
+            try:
+                done = False
+                while not done:
+                    page, done = conn.root.search_next(cursor_id, page_size)
+                    yield from wire.unpack_packages(page)
+            finally:
+                if not done and not conn.closed:
+                    conn.root.search_close(cursor_id)
 
-    def install(
-        self, packages: t.List[str], providers_: t.List[ProviderMetadata]
-    ) -> None:
+    def install(self, packages: t.List[str], providers_: Providers) -> None:
         """This installs packages by finding and installing them from different providers.
 
         Args:
             packages: The packages to install.
-            providers_: The providers to search and install packages from.
+            providers_: The providers (or their names) to search and install packages from.
 
         Returns:
             Nothing.
         """
-        return self._conn.root.install(packages, providers_)
+        arguments = self._arguments(packages, providers_)
+        return self._call(lambda root: root.install(*arguments), retry=False)
 
-    def remove(
-        self, packages: t.List[str], providers_: t.List[ProviderMetadata]
-    ) -> None:
+    def remove(self, packages: t.List[str], providers_: Providers) -> None:
         """This removes packages from different providers if they are from a register.
 
         Args:
             packages: The packages to remove.
-            providers_: The provider to remove packages from.
+            providers_: The providers (or their names) to remove packages from.
 
         Returns:
             Nothing.
         """
-        return self._conn.root.remove(packages, providers_)
+        arguments = self._arguments(packages, providers_)
+        return self._call(lambda root: root.remove(*arguments), retry=False)
 
-    def update(
-        self, packages: t.List[str], providers_: t.List[ProviderMetadata]
-    ) -> None:
+    def update(self, packages: t.List[str], providers_: Providers) -> None:
         """This updates packages from different providers. If the package list is empty then it will try to update
         all packages.
 
@@ -80,9 +140,175 @@ class SinglePackageManager(Glue):
 
         Args:
             packages: The packages to update.
-            providers_: The providers to find updates from.
+            providers_: The providers (or their names) to find updates from.
 
         Returns:
             Nothing.
         """
-        return self._conn.root.update(packages, providers_)
+        arguments = self._arguments(packages, providers_)
+        return self._call(lambda root: root.update(*arguments), retry=False)
+
+    def submit(
+        self,
+        operation: str,
+        packages: t.List[str],
+        providers_: Providers,
+        priority: int = 0,
+    ) -> str:
+        """This submits an install, a removal or an update as a job, which runs on the server in the background.
+
+        Args:
+            operation: Either `install`, `remove` or `update`.
+            packages: The packages.
+            providers_: The providers (or their names).
+            priority: The priority of the job. Jobs with a higher priority run first.
+
+        Returns:
+            The id of the job.
+        """
+        arguments = self._arguments(packages, providers_)
+        return self._call(
+            lambda root: root.submit(operation, *arguments, priority), retry=False
+        )
+
+    def job(self, job_id: str, timeout: float = 0.0) -> wire.JobRecord:
+        """This gets a job, optionally waiting for it to finish first.
+
+        Args:
+            job_id: The id of the job.
+            timeout: The maximum amount of seconds to wait for the job to finish.
+
+        Returns:
+            The job.
+        """
+        return wire.unpack_jobs(self._call(lambda root: root.job(job_id, timeout)))[0]
+
+    def jobs(self) -> t.List[wire.JobRecord]:
+        """This gets every job which is queued, running or finished recently.
+
+        Returns:
+            The jobs.
+        """
+        return wire.unpack_jobs(self._call(lambda root: root.jobs()))
+
+    def cancel(self, job_id: str) -> bool:
+        """This cancels a job. A queued job never runs, and a running install stops before its next step.
+
+        Args:
+            job_id: The id of the job.
+
+        Returns:
+            Whether or not the job could still be cancelled.
+        """
+        return self._call(lambda root: root.cancel(job_id))
+
+    def installed(self, providers_: Providers = ()) -> t.List[wire.InstalledRecord]:
+        """This lists the packages installed through single.
+
+        Args:
+            providers_: The providers (or their names) to list the packages of. By default every provider is listed.
+
+        Returns:
+            The installed packages.
+        """
+        names = tuple(wire.provider_names(providers_))
+        return wire.unpack_installed(self._call(lambda root: root.installed(names)))
+
+    def owners(self, name: str) -> t.List[wire.InstalledRecord]:
+        """This finds which providers a package was installed from.
+
+        Args:
+            name: The name of the package.
+
+        Returns:
+            The package as installed from every provider it was installed from.
+        """
+        return wire.unpack_installed(self._call(lambda root: root.owners(name)))
+
+    def outdated(
+        self, providers_: Providers = (), max_age: t.Optional[float] = None
+    ) -> t.List[wire.OutdatedRecord]:
+        """This finds the packages installed through single which have a newer version available.
+
+        Args:
+            providers_: The providers (or their names) to look at. By default every provider is looked at.
+            max_age: The amount of seconds the server may use the catalog for before asking the providers again. By
+                     default the server decides.
+
+        Returns:
+            The outdated packages.
+        """
+        arguments = self._outdated_arguments(providers_, max_age)
+        return wire.unpack_outdated(self._call(lambda root: root.outdated(*arguments)))
+
+    def outdated_iter(
+        self,
+        providers_: Providers = (),
+        max_age: t.Optional[float] = None,
+        page_size: int = 100,
+    ) -> t.Iterator[wire.OutdatedRecord]:
+        """This finds the packages installed through single which have a newer version available, giving back the
+        packages of each provider as soon as it's done instead of waiting for every provider.
+
+        Args:
+            providers_: The providers (or their names) to look at. By default every provider is looked at.
+            max_age: The amount of seconds the server may use the catalog for before asking the providers again. By
+                     default the server decides.
+            page_size: The maximum amount of packages fetched from the server at once.
+
+        Returns:
+            An iterator of the outdated packages.
+        """
+        arguments = self._outdated_arguments(providers_, max_age)
+        with self._pool.connection() as conn:
+            cursor_id = conn.root.outdated_start(*arguments)
+            try:
+                done = False
+                while not done:
+                    page, done = conn.root.outdated_next(cursor_id, page_size)
+                    yield from wire.unpack_outdated(page)
+            finally:
+                if not done and not conn.closed:
+                    conn.root.outdated_close(cursor_id)
+
+    def metrics(self) -> t.Dict[str, t.Any]:
+        """This gets the metrics of the server; how long every request and every call to a source took, how many are
+        running, how many failed and how much they gave back.
+
+        Returns:
+            The requests by method, and the source calls by provider and call.
+        """
+        return wire.unpack_metrics(self._call(lambda root: root.metrics()))
+
+    def prometheus_metrics(self) -> str:
+        """This gets the metrics of the server in the Prometheus text format.
+
+        Returns:
+            The metrics.
+        """
+        return self._call(lambda root: root.metrics(True)).decode()
+
+    def start_profiling(
+        self, mode: str = "cprofile", rate: float = 1.0, interval: float = 0.005
+    ) -> t.List[str]:
+        """This starts profiling the requests and the calls made to sources on the server, throwing away the profiles
+        taken so far after writing them.
+
+        Args:
+            mode: Either `cprofile`, whose profiles are written as pstats files, or `sampling`, whose profiles are
+                  written as collapsed stacks which can be rendered as flamegraphs.
+            rate: The share of the requests and source calls which are profiled, from 0 to 1.
+            interval: The amount of seconds between two samples, in the sampling mode.
+
+        Returns:
+            The paths (on the server) of the profiles written, if profiling was already on.
+        """
+        return list(self._call(lambda root: root.profile(mode, rate, interval)))
+
+    def stop_profiling(self) -> t.List[str]:
+        """This stops profiling the server and writes the profiles taken.
+
+        Returns:
+            The paths (on the server) of the profiles written.
+        """
+        return list(self._call(lambda root: root.profile(None)))
@@ -4,17 +4,22 @@ from single.context import VoidContext, Context
 from single.enums import System
 from single import utils
 from single.exceptions import UnsupportedSystemError
+from array import array
 import typing as t
 import abc
 
 
-@attr.s(auto_attribs=True, frozen=True)
+@attr.s(auto_attribs=True, frozen=True, slots=True)
 class Package(abc.ABC):
     """This class only provides metadata for a package.
 
     This class only provides metadata for a package. In order to install this, you must install it through
     its respective method in its source, usually install_package.
 
+    Packages have no `__dict__` and share their versions with every other package of the same version, since sources
+    may give back hundreds of thousands of them. A source giving back that many packages can give back a
+    `PackageTable` instead, which is more compact still.
+
     Attributes:
         name: The name of the package.
         version: The version of the package.
@@ -24,16 +29,225 @@ class Package(abc.ABC):
     """
 
     name: str
-    version: str
+    version: str = attr.ib(converter=utils.intern)
     description: str
     install_size: float
     download_size: float
     original_source: "Source"
 
 
+@attr.s(auto_attribs=True, frozen=True, slots=True)
+class PackageView:
+    """This is a package of a package table, which reads its metadata from the table instead of holding it.
+
+    Attributes:
+        table: The table.
+        index: The index of the package in the table.
+    """
+
+    table: "PackageTable"
+    index: int
+
+    @property
+    def name(self) -> str:
+        return self.table.names[self.index]
+
+    @property
+    def version(self) -> str:
+        return self.table.version(self.index)
+
+    @property
+    def description(self) -> str:
+        return self.table.descriptions[self.index]
+
+    @property
+    def install_size(self) -> float:
+        return self.table.install_sizes[self.index]
+
+    @property
+    def download_size(self) -> float:
+        return self.table.download_sizes[self.index]
+
+    @property
+    def original_source(self) -> t.Optional["Source"]:
+        return self.table.source
+
+    def package(self) -> Package:
+        """This makes an actual package out of the view, which is needed to install (or remove, or update) it.
+
+        Returns:
+            The package.
+        """
+        return self.table[self.index]
+
+
+@attr.s(auto_attribs=True, eq=False)
+class PackageTable(t.Sequence[Package]):
+    """This is a compact list of packages, all from the same source, which keeps every field of the packages in a
+    column of its own instead of keeping an object per package.
+
+    The packages are only made once they're taken out of the table, and views of them (which read the table) can be
+    taken out instead where the package doesn't have to be given to its source. A table can be given back wherever a
+    list of packages is, such as from `Source.package` and `Source.catalog`.
+
+    Attributes:
+        source: The source of the packages.
+        package_type: The type of the packages made out of the table.
+        names: The names of the packages.
+        descriptions: The descriptions of the packages.
+        install_sizes: The install sizes of the packages.
+        download_sizes: The download sizes of the packages.
+    """
+
+    source: t.Optional["Source"] = None
+    package_type: t.Type[Package] = Package
+    names: t.List[str] = attr.ib(factory=list, init=False)
+    descriptions: t.List[str] = attr.ib(factory=list, init=False)
+    install_sizes: "array[float]" = attr.ib(factory=lambda: array("d"), init=False)
+    download_sizes: "array[float]" = attr.ib(factory=lambda: array("d"), init=False)
+    # the versions are kept once each, and the packages only keep which version they have.
+    _versions: "array[int]" = attr.ib(
+        factory=lambda: array("I"), init=False, repr=False
+    )
+    _version_pool: t.List[str] = attr.ib(factory=list, init=False, repr=False)
+    _version_ids: t.Dict[str, int] = attr.ib(factory=dict, init=False, repr=False)
+
+    @classmethod
+    def from_packages(
+        cls,
+        packages: t.Iterable[Package],
+        source: t.Optional["Source"] = None,
+        package_type: t.Type[Package] = Package,
+    ) -> "PackageTable":
+        """This makes a table out of packages.
+
+        Args:
+            packages: The packages.
+            source: The source of the packages.
+            package_type: The type of the packages made out of the table.
+
+        Returns:
+            The table.
+        """
+        table = cls(source, package_type)
+        table.extend(packages)
+        return table
+
+    def append(
+        self,
+        name: str,
+        version: str,
+        description: str,
+        install_size: float,
+        download_size: float,
+    ) -> None:
+        """This adds a package to the table.
+
+        Args:
+            name: The name of the package.
+            version: The version of the package.
+            description: The description of the package.
+            install_size: The install size of the package.
+            download_size: The download size of the package.
+
+        Returns:
+            Nothing.
+        """
+        version_id = self._version_ids.get(version)
+        if version_id is None:
+            version_id = self._version_ids[version] = len(self._version_pool)
+            self._version_pool.append(utils.intern(version))
+
+        self.names.append(name)
+        self._versions.append(version_id)
+        self.descriptions.append(description)
+        self.install_sizes.append(install_size)
+        self.download_sizes.append(download_size)
+
+    def extend(self, packages: t.Iterable[Package]) -> None:
+        """This adds packages to the table.
+
+        Args:
+            packages: The packages, whose sources are assumed to be the source of the table.
+
+        Returns:
+            Nothing.
+        """
+        for package in packages:
+            self.append(
+                package.name,
+                package.version,
+                package.description,
+                package.install_size,
+                package.download_size,
+            )
+
+    def version(self, index: int) -> str:
+        """This gets the version of a package.
+
+        Args:
+            index: The index of the package.
+
+        Returns:
+            The version.
+        """
+        return self._version_pool[self._versions[index]]
+
+    def view(self, index: int) -> PackageView:
+        """This gets a view of a package, which reads the table instead of holding the package's metadata.
+
+        Args:
+            index: The index of the package.
+
+        Returns:
+            The view.
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError("package table index out of range")
+
+        return PackageView(self, index % len(self))
+
+    def views(self) -> t.Iterator[PackageView]:
+        """This goes through views of every package of the table.
+
+        Returns:
+            The views, in order.
+        """
+        return (PackageView(self, index) for index in range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @t.overload
+    def __getitem__(self, index: int) -> Package:
+        ...
+
+    @t.overload
+    def __getitem__(self, index: slice) -> t.List[Package]:
+        ...
+
+    def __getitem__(
+        self, index: t.Union[int, slice]
+    ) -> t.Union[Package, t.List[Package]]:
+        if isinstance(index, slice):
+            return [self[index_] for index_ in range(*index.indices(len(self)))]
+
+        return self.package_type(  # type: ignore
+            self.names[index],
+            self.version(index),
+            self.descriptions[index],
+            self.install_sizes[index],
+            self.download_sizes[index],
+            self.source,
+        )
+
+
 @attr.s(auto_attribs=True)
 class Source(abc.ABC):
     context: Context = VoidContext()
+    # how the versions of the packages are numbered, which is what tells whether or not an installed package is
+    # outdated; one of `generic`, `pep440`, `debian`, `semver` or `rpm`.
+    version_scheme: t.ClassVar[str] = "generic"
 
     @property
     @abc.abstractmethod
@@ -83,6 +297,38 @@ class Source(abc.ABC):
             A list of packages found.
         """
 
+    def catalog(self) -> t.List[Package]:
+        """This lists every package this source is able to provide.
+
+        This is used by the server to build a package index so that it doesn't have to ask the source every time a
+        search is done.
+
+        Notes:
+            This is optional; if this isn't overridden the server will fall back to searching through `package`.
+
+        Returns:
+            Every package the source is able to provide, or raise a NotImplementedError.
+        """
+        raise NotImplementedError
+
+    def dependencies(self, package: Package) -> t.List[str]:
+        """This lists the packages a package needs to be installed first.
+
+        A dependency is the name of a package, which is looked up in every provider, or the name of a provider and
+        the name of a package separated by a colon (such as `pip:requests`), which is only looked up in that provider.
+
+        Notes:
+            This is optional; if this isn't overridden the package is assumed to have no dependencies, or at least none
+            that the source doesn't take care of by itself.
+
+        Args:
+            package: The package.
+
+        Returns:
+            The dependencies of the package.
+        """
+        return []
+
     @abc.abstractmethod
     def install_package(self, *packages: Package) -> None:
         """This installs a package.
@@ -0,0 +1,363 @@
+"""This is the package catalog, a persistent index of every package the providers are able to provide."""
+from single import Package
+from single import utils
+from pathlib import Path
+import typing as t
+import threading
+import sqlite3
+import attr
+import time
+import re
+
+SCHEMA_VERSION = 1
+# the amount of seconds before a provider's listing in the catalog is considered stale.
+DEFAULT_MAX_AGE = 24 * 60 * 60
+# this is higher than any character that can appear in a package name, which makes it usable as an upper bound for
+# prefix lookups.
+_HIGHEST_CHARACTER = "\U0010ffff"
+# the maximum amount of parameters of a query; sqlite may be built to allow no more than 999.
+_MAX_PARAMETERS = 900
+# what separates the words of a package name.
+_SEPARATORS = re.compile(r"[-_.\s]+")
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS providers (
+    provider TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    refreshed_at REAL NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS packages (
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    version TEXT NOT NULL,
+    description TEXT NOT NULL,
+    install_size REAL NOT NULL,
+    download_size REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS packages_by_key ON packages (key);
+CREATE INDEX IF NOT EXISTS packages_by_provider ON packages (provider);
+"""
+
+
+def normalize_name(name: str) -> str:
+    """This normalizes a package name so that lookups aren't thrown off by casing or separators.
+
+    Args:
+        name: The package name.
+
+    Examples:
+        >>> normalize_name("Python_Dateutil")
+        'python-dateutil'
+
+    Returns:
+        The normalized package name.
+    """
+    return _SEPARATORS.sub("-", name.strip()).lower()
+
+
+@attr.s(auto_attribs=True, frozen=True, slots=True)
+class CatalogEntry:
+    """This is a package as it is stored in the catalog.
+
+    Args:
+        provider: The name of the provider of the package.
+        name: The name of the package.
+        version: The version of the package.
+        description: The description of the package.
+        install_size: The install size of the package.
+        download_size: The download size of the package.
+    """
+
+    provider: str = attr.ib(converter=utils.intern)
+    name: str
+    version: str = attr.ib(converter=utils.intern)
+    description: str
+    install_size: float
+    download_size: float
+
+
+@attr.s(auto_attribs=True)
+class Catalog:
+    """This is a persistent package index backed by SQLite.
+
+    The catalog is filled in per provider from the listings of their sources, and can then answer exact, prefix and
+    substring lookups without asking the sources. The database is only opened once it is first used.
+
+    Args:
+        path: The path of the database, or ':memory:' for a catalog that doesn't survive restarts.
+    """
+
+    path: t.Union[Path, str]
+    _conn: t.Optional[sqlite3.Connection] = attr.ib(
+        default=None, init=False, repr=False
+    )
+    _lock: threading.RLock = attr.ib(factory=threading.RLock, init=False, repr=False)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The connection to the database, which is opened (and migrated, if needed) on first use.
+
+        Returns:
+            The connection to the database.
+        """
+        with self._lock:
+            if self._conn is None:
+                if isinstance(self.path, Path):
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+
+                conn = sqlite3.connect(str(self.path), check_same_thread=False)
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    conn.executescript(
+                        "DROP TABLE IF EXISTS providers; DROP TABLE IF EXISTS packages;"
+                    )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.commit()
+                self._conn = conn
+
+            return self._conn
+
+    def close(self) -> None:
+        """This closes the database, if it was opened.
+
+        Returns:
+            Nothing.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def is_fresh(
+        self, provider: str, version: str, max_age: float = DEFAULT_MAX_AGE
+    ) -> bool:
+        """This checks whether or not a provider's listing is in the catalog and is recent enough to be used.
+
+        Args:
+            provider: The name of the provider.
+            version: The version of the provider; a listing made by another version is never fresh.
+            max_age: The amount of seconds a listing stays fresh.
+
+        Returns:
+            Whether or not the provider's listing is fresh.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT version, refreshed_at FROM providers WHERE provider = ?",
+                (provider,),
+            ).fetchone()
+
+        return row is not None and row[0] == version and time.time() - row[1] < max_age
+
+    def refresh(
+        self, provider: str, version: str, packages: t.Iterable[Package]
+    ) -> int:
+        """This replaces the listing of a single provider, leaving the listings of the other providers untouched.
+
+        Args:
+            provider: The name of the provider.
+            version: The version of the provider.
+            packages: Every package the provider is able to provide.
+
+        Returns:
+            The amount of packages in the new listing.
+        """
+        rows = [
+            (
+                normalize_name(package.name),
+                package.name,
+                provider,
+                package.version,
+                package.description,
+                package.install_size,
+                package.download_size,
+            )
+            for package in packages
+        ]
+
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM packages WHERE provider = ?", (provider,))
+            self.conn.executemany(
+                "INSERT INTO packages VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO providers VALUES (?, ?, ?, ?)",
+                (provider, version, time.time(), len(rows)),
+            )
+
+        return len(rows)
+
+    def refreshed_at(self, provider: str) -> t.Optional[float]:
+        """This gets when the listing of a provider was last refreshed.
+
+        Args:
+            provider: The name of the provider.
+
+        Returns:
+            When the listing was refreshed, as a timestamp, or None if the provider has no listing.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT refreshed_at FROM providers WHERE provider = ?", (provider,)
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def listing(self, provider: str) -> t.List[CatalogEntry]:
+        """This gets the whole listing of a provider.
+
+        Args:
+            provider: The name of the provider.
+
+        Returns:
+            Every package of the provider, by name.
+        """
+        return self._lookup("1", [], [provider])
+
+    def versions(
+        self, provider: str, names: t.Iterable[str]
+    ) -> t.List[t.Tuple[str, str]]:
+        """This looks up the versions of many packages of a provider at once, without the rest of their metadata.
+
+        Args:
+            provider: The name of the provider.
+            names: The names of the packages.
+
+        Returns:
+            The names of the packages found with their versions, by name.
+        """
+        keys = sorted({normalize_name(name) for name in names})
+        found: t.List[t.Tuple[str, str]] = []
+        for start in range(0, len(keys), _MAX_PARAMETERS):
+            chunk = keys[start : start + _MAX_PARAMETERS]
+            with self._lock:
+                found += self.conn.execute(
+                    "SELECT name, version FROM packages WHERE provider = ? "
+                    f"AND key IN ({', '.join('?' for _ in chunk)}) ORDER BY key",
+                    [provider, *chunk],
+                ).fetchall()
+
+        return found
+
+    def forget(self, provider: str) -> None:
+        """This removes the listing of a provider from the catalog.
+
+        Args:
+            provider: The name of the provider.
+
+        Returns:
+            Nothing.
+        """
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM packages WHERE provider = ?", (provider,))
+            self.conn.execute("DELETE FROM providers WHERE provider = ?", (provider,))
+
+    def _lookup(
+        self,
+        condition: str,
+        parameters: t.Sequence[t.Any],
+        providers: t.Optional[t.Sequence[str]],
+        order: str = "key",
+        order_parameters: t.Sequence[t.Any] = (),
+        limit: t.Optional[int] = None,
+    ) -> t.List[CatalogEntry]:
+        """This runs a lookup against the packages table.
+
+        Args:
+            condition: The condition a package must meet.
+            parameters: The parameters of the condition.
+            providers: The providers to look in, or None for every provider.
+            order: How the packages found are ordered.
+            order_parameters: The parameters of the ordering.
+            limit: The maximum amount of packages to return.
+
+        Returns:
+            The packages found.
+        """
+        query = (
+            "SELECT provider, name, version, description, install_size, download_size "
+            f"FROM packages WHERE {condition}"
+        )
+        parameters = list(parameters)
+        if providers is not None:
+            query += f" AND provider IN ({', '.join('?' for _ in providers)})"
+            parameters.extend(providers)
+        query += f" ORDER BY {order}"
+        parameters.extend(order_parameters)
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(query, parameters).fetchall()
+
+        return [CatalogEntry(*row) for row in rows]
+
+    def exact(
+        self, name: str, providers: t.Optional[t.Sequence[str]] = None
+    ) -> t.List[CatalogEntry]:
+        """This looks up packages whose (normalized) name is exactly the given name.
+
+        Args:
+            name: The name of the package.
+            providers: The providers to look in. By default every provider is looked in.
+
+        Returns:
+            The packages found.
+        """
+        return self._lookup("key = ?", [normalize_name(name)], providers)
+
+    def prefix(
+        self,
+        prefix: str,
+        providers: t.Optional[t.Sequence[str]] = None,
+        limit: t.Optional[int] = None,
+    ) -> t.List[CatalogEntry]:
+        """This looks up packages whose (normalized) name starts with the given prefix.
+
+        Args:
+            prefix: The prefix of the package names.
+            providers: The providers to look in. By default every provider is looked in.
+            limit: The maximum amount of packages to return.
+
+        Returns:
+            The packages found.
+        """
+        key = normalize_name(prefix)
+        return self._lookup(
+            "key >= ? AND key < ?",
+            [key, key + _HIGHEST_CHARACTER],
+            providers,
+            limit=limit,
+        )
+
+    def substring(
+        self,
+        substring: str,
+        providers: t.Optional[t.Sequence[str]] = None,
+        limit: t.Optional[int] = None,
+    ) -> t.List[CatalogEntry]:
+        """This looks up packages whose (normalized) name contains the given substring.
+
+        The packages are ranked; exact matches come first, then the names starting with the substring and then the
+        rest.
+
+        Args:
+            substring: The substring of the package names.
+            providers: The providers to look in. By default every provider is looked in.
+            limit: The maximum amount of packages to return.
+
+        Returns:
+            The packages found.
+        """
+        key = normalize_name(substring)
+        return self._lookup(
+            "instr(key, ?) > 0",
+            [key],
+            providers,
+            order="CASE WHEN key = ? THEN 0 WHEN instr(key, ?) = 1 THEN 1 ELSE 2 END, key",
+            order_parameters=[key, key],
+            limit=limit,
+        )
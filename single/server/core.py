@@ -1,92 +1,615 @@
 """These are some critical functions and classes for core single server functionality."""
-from single import _enums as enums, Package
+from single import _enums as enums, Package, Source
 from single.server import utils
-from single.server import providers as provs
+from single.server import search as search_
+from single.server import planner
+from single.server import metrics as metrics_
+from single.server import profiling
+from single.server import jobs as jobs_
+from single.server import versions
+from single.server.catalog import Catalog, DEFAULT_MAX_AGE
+from single.server.fuzzy import FuzzyIndex
+from single.server.installed import InstalledState
+from single.server.providers.reload import ProviderReloader, ReloadResult
+from single.server.providers.watch import ProviderWatcher
 from single.core import ProviderMetadata
-from single.utils import ServerState
+from single.constants import CATALOG_PATH, INSTALLED_PATH, PROFILES_DIR
+from single.context import Context, ServerContext
+from single import wire
+from single.utils import ServerState, prettify_list
 from loguru import logger
-from rpyc.utils.server import ThreadedServer  # type: ignore  # no stubs found
+from single.server.engines import (
+    make_server,
+    SingleThreadedServer,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_QUEUE_DEPTH,
+)
 from rpyc import Service  # type: ignore  # no stubs found
+from concurrent import futures
+from pathlib import Path
 import typing as t
+import threading
 import errno
 import sys
 
 providers: t.List[ProviderMetadata] = []
 errors: t.List[Exception] = []
+sources: t.Dict[str, Source] = {}
+sources_lock = threading.RLock()
+# the locks of the providers whose sources are being initialized, so that only the users of a provider wait for it.
+activation_locks: t.Dict[str, threading.Lock] = {}
+catalog = Catalog(CATALOG_PATH)
+fuzzy_index = FuzzyIndex()
+installed = InstalledState(INSTALLED_PATH)
+reloader = ProviderReloader(providers, errors)
+# the amount of batches installed at the same time from a provider, by the provider's name. providers which aren't in
+# here get one batch at a time.
+provider_limits: t.Dict[str, int] = {}
+jobs = jobs_.JobScheduler(provider_limits=provider_limits)
+# the operations which can be submitted as jobs.
+JOB_OPERATIONS = ("install", "remove", "update")
+metrics = metrics_.Metrics()
+profiler = profiling.Profiler(PROFILES_DIR)
+cursors = search_.SearchCursors()
+outdated_cursors = search_.SearchCursors()
+search_cache = search_.SearchCache()
 
 
-def prepare_server(logging_level: enums.LoggingLevel) -> None:
+def get_source(provider: ProviderMetadata) -> t.Optional[Source]:
+    """This gets the source of a provider, initializing it if it wasn't initialized yet.
+
+    Args:
+        provider: The provider.
+
+    Returns:
+        The source of the provider, or None if the provider turned out to be unusable once it was first used.
+    """
+    with sources_lock:
+        if provider.name in sources:
+            return sources[provider.name]
+
+        lock = activation_locks.setdefault(provider.name, threading.Lock())
+
+    # initializing a source may execute the provider's module and run its checks, so it's done outside sources_lock.
+    with lock:
+        with sources_lock:
+            if provider.name in sources:
+                return sources[provider.name]
+
+        source = reloader.activate(provider)
+        if source is None:
+            return None
+
+        source = metrics.instrument_source(
+            provider.name, profiler.instrument_source(provider.name, source)
+        )
+        with sources_lock:
+            sources[provider.name] = source
+            activation_locks.pop(provider.name, None)
+
+        return source
+
+
+def resolve_providers(
+    providers_: t.Sequence[t.Union[str, ProviderMetadata]]
+) -> t.List[ProviderMetadata]:
+    """This resolves the providers a client asked for into the loaded providers.
+
+    Args:
+        providers_: The names of the providers (or the providers themselves). If it's empty, every provider is used.
+
+    Returns:
+        The loaded providers, skipping the ones which aren't loaded.
+    """
+    if not providers_:
+        return list(providers)
+
+    loaded = {provider.name: provider for provider in providers}
+    resolved = []
+    for name in wire.provider_names(providers_):
+        if name not in loaded:
+            logger.warning(f"The provider '{name}' isn't loaded, skipping it")
+            continue
+
+        resolved.append(loaded[name])
+
+    return resolved
+
+
+def find_packages(
+    packages: t.List[str],
+    providers_: t.List[ProviderMetadata],
+    prefer_installed: bool = False,
+) -> t.List[search_.FoundPackage]:
+    """This finds the packages with exactly the given names.
+
+    Args:
+        packages: The names of the packages.
+        providers_: The providers to find the packages in, in order of preference.
+        prefer_installed: Whether or not to prefer the providers a package was installed from over the given order.
+
+    Raises:
+        PackageNotFoundError: If a package isn't provided by any of the providers.
+
+    Returns:
+        The packages with the name of their provider.
+    """
+    found = []
+    for name in packages:
+        candidates = providers_
+        if prefer_installed:
+            owners = {package.provider for package in installed.owners(name)}
+            candidates = sorted(
+                providers_, key=lambda provider: provider.name not in owners
+            )
+
+        package = search_.find_exact(name, candidates, catalog, get_source)
+        if package is None:
+            raise planner.PackageNotFoundError(
+                f"the package '{name}' wasn't found in any provider"
+            )
+        found.append(package)
+
+    return found
+
+
+def outdated(
+    provider: ProviderMetadata, max_age: float = DEFAULT_MAX_AGE
+) -> t.List[versions.Update]:
+    """This finds the packages installed from a provider which have a newer version available in it.
+
+    The versions are looked up all at once, in the catalog if the provider has a listing in it and through a single
+    search of the source otherwise, and compared using the version scheme of the source.
+
+    Args:
+        provider: The provider.
+        max_age: The amount of seconds the provider's listing in the catalog can be used for before it's refreshed.
+
+    Returns:
+        The outdated packages, by name.
+    """
+    installed_ = [
+        (package.name, package.version)
+        for package in installed.installed([provider.name])
+    ]
+    if not installed_:
+        return []
+    source = get_source(provider)
+    if source is None:
+        return []
+
+    names = [name for name, _ in installed_]
+    if search_.refresh_catalog(catalog, provider, source, max_age=max_age):
+        available = catalog.versions(provider.name, names)
+    else:
+        available = [
+            (package.name, package.version) for package in source.package(*names)
+        ]
+
+    return versions.updates(installed_, available, source.version_scheme)
+
+
+def iter_outdated(
+    providers_: t.List[ProviderMetadata],
+    max_age: float = DEFAULT_MAX_AGE,
+    max_workers: int = search_.DEFAULT_MAX_WORKERS,
+) -> t.Iterator[t.Tuple[ProviderMetadata, t.List[versions.Update]]]:
+    """This finds the outdated packages of every provider at the same time, giving back the packages of each provider
+    as soon as that provider is done.
+
+    Args:
+        providers_: The providers.
+        max_age: The amount of seconds the listings in the catalog can be used for before they're refreshed.
+        max_workers: The maximum amount of providers looked at the same time.
+
+    Returns:
+        An iterator of each provider with its outdated packages, in the order the providers finish. A provider which
+        fails is left out.
+    """
+    if not providers_:
+        return
+
+    executor = futures.ThreadPoolExecutor(max_workers=min(max_workers, len(providers_)))
+    pending = {
+        executor.submit(outdated, provider, max_age): provider
+        for provider in providers_
+    }
+
+    try:
+        for future in futures.as_completed(pending):
+            provider = pending[future]
+            try:
+                updates = future.result()
+            except Exception as error:
+                logger.error(
+                    f"The provider '{provider.name}' failed to look for outdated packages: {error}"
+                )
+                continue
+
+            yield provider, updates
+    finally:
+        # the caller may stop early, in which case the providers still being looked at are left to finish on their own.
+        executor.shutdown(wait=False)
+
+
+def record(
+    operation: str, provider: ProviderMetadata, packages: t.List[Package]
+) -> None:
+    """This records a successful removal or update in the installed state.
+
+    Args:
+        operation: Either `remove` or `update`.
+        provider: The provider the packages were removed or updated from.
+        packages: The packages. If it's empty when updating, every package installed from the provider was updated,
+                  so the ones which had a newer version available are recorded at that version.
+
+    Returns:
+        Nothing.
+    """
+    if operation == "remove":
+        installed.record_removed(provider.name, [package.name for package in packages])
+    elif packages:
+        installed.record_installed(provider.name, packages)
+    else:
+        installed.record_versions(
+            provider.name,
+            [(update.name, update.available) for update in outdated(provider)],
+        )
+
+
+def install(
+    packages: t.List[str],
+    providers_: t.List[ProviderMetadata],
+    context: t.Optional[Context] = None,
+    checkpoint: t.Optional[t.Callable[[], None]] = None,
+) -> None:
+    """This installs packages together with their dependencies, which may come from any provider.
+
+    Args:
+        packages: The packages to install.
+        providers_: The providers to find the packages in. Dependencies may come from any provider.
+        context: The context to report progress to. By default it's logged.
+        checkpoint: A function called between the steps of the install, which may raise to stop it.
+
+    Raises:
+        PackageNotFoundError: If a package or a dependency isn't provided by any provider.
+        DependencyCycleError: If packages depend on each other.
+        Exception: The first error raised while installing.
+
+    Returns:
+        Nothing.
+    """
+
+    def resolve(
+        provider_name: t.Optional[str], name: str
+    ) -> t.Optional[search_.FoundPackage]:
+        candidates = (
+            providers if provider_name is None else resolve_providers([provider_name])
+        )
+        return search_.find_exact(name, candidates, catalog, get_source)
+
+    context = context or ServerContext(logger)
+    plan = planner.plan_install(find_packages(packages, providers_), resolve)
+    context.info(
+        f"Installing {len(plan.packages)} package(s) in {len(plan.levels)} step(s)"
+    )
+    result = planner.PlanResult()
+    try:
+        planner.execute_plan(
+            plan, context, provider_limits, checkpoint=checkpoint, result=result
+        )
+    finally:
+        # whatever got installed (even partly) may show up differently in searches now.
+        search_cache.invalidate({provider for provider, _ in plan.packages})
+        by_provider: t.Dict[str, t.List[Package]] = {}
+        for key in result.installed:
+            by_provider.setdefault(key[0], []).append(plan.packages[key][1])
+        for provider_name, installed_ in by_provider.items():
+            installed.record_installed(provider_name, installed_)
+
+    if result.failed:
+        raise next(iter(result.failed.values()))
+
+
+def operate(
+    operation: str,
+    packages: t.List[str],
+    providers_: t.List[ProviderMetadata],
+    context: t.Optional[Context] = None,
+) -> None:
+    """This removes or updates packages, with a single call per provider and every provider at the same time.
+
+    Args:
+        operation: Either `remove` or `update`.
+        packages: The packages. If it's empty when updating, every package of the providers is updated.
+        providers_: The providers to find the packages in.
+        context: The context to report failures to. By default they're logged.
+
+    Raises:
+        PackageNotFoundError: If a package isn't provided by any of the providers.
+        Exception: The first error raised by a provider, once every provider is done.
+
+    Returns:
+        Nothing.
+    """
+    context = context or ServerContext(logger)
+    batches: t.Dict[str, t.Tuple[Source, t.List[Package]]] = {}
+    if packages:
+        for provider_name, package in find_packages(
+            packages, providers_, prefer_installed=operation == "remove"
+        ):
+            batches.setdefault(provider_name, (package.original_source, []))[1].append(
+                package
+            )
+    else:
+        for provider in providers_:
+            source = get_source(provider)
+            if source is not None:
+                batches[provider.name] = source, []
+
+    if not batches:
+        return
+
+    with futures.ThreadPoolExecutor(max_workers=len(batches)) as executor:
+        results = {
+            provider_name: executor.submit(
+                getattr(source, f"{operation}_package"), *batch
+            )
+            for provider_name, (source, batch) in batches.items()
+        }
+
+    search_cache.invalidate(batches)
+    loaded = {provider.name: provider for provider in providers_}
+    errors = []
+    for provider_name, future in results.items():
+        error = future.exception()
+        if error is not None:
+            context.error(
+                f"Couldn't {operation} packages from '{provider_name}': {error}"
+            )
+            errors.append(error)
+        elif provider_name in loaded:
+            record(operation, loaded[provider_name], batches[provider_name][1])
+
+    if errors:
+        raise errors[0]
+
+
+def run_job(
+    operation: str,
+    packages: t.List[str],
+    providers_: t.List[ProviderMetadata],
+    job: jobs_.Job,
+    claim: bool = False,
+) -> None:
+    """This does the work of a job.
+
+    Args:
+        operation: Either `install`, `remove` or `update`.
+        packages: The packages.
+        providers_: The providers.
+        job: The job.
+        claim: Whether or not the job was submitted without providers, and has to claim the providers of its packages
+               (or every provider if it has no packages) before doing anything.
+
+    Returns:
+        Nothing.
+    """
+    if claim:
+        if packages:
+            owners = {
+                provider_name
+                for provider_name, _ in find_packages(
+                    packages, providers_, prefer_installed=operation == "remove"
+                )
+            }
+            providers_ = [
+                provider for provider in providers_ if provider.name in owners
+            ]
+        jobs.claim(job, [provider.name for provider in providers_])
+
+    context = jobs_.JobContext(job, ServerContext(logger))
+    if operation == "install":
+        install(packages, providers_, context, job.check_cancelled)
+    else:
+        operate(operation, packages, providers_, context)
+
+
+def reload_providers(force: bool = False) -> ReloadResult:
+    """This reloads the providers that changed and forgets everything that was known about the unloaded ones, unless
+    a provider which is still loaded has the same name.
+
+    Args:
+        force: Whether or not to reload every provider, even the ones which didn't change.
+
+    Returns:
+        What changed during the reload.
+    """
+    result = reloader.reload(force)
+    # another provider directory may declare the same name, and what's known about the name is still its own then.
+    kept = {
+        provider.name
+        for provider in reloader.provider_list
+        if all(provider is not loaded for loaded in result.loaded)
+    }
+    with sources_lock:
+        for provider in result.unloaded:
+            if provider.name in kept:
+                continue
+            sources.pop(provider.name, None)
+            search_.unindexable.discard(provider.name)
+            catalog.forget(provider.name)
+            fuzzy_index.forget(provider.name)
+    search_cache.invalidate(
+        [provider.name for provider in result.loaded + result.unloaded]
+    )
+
+    return result
+
+
+def prepare_server(
+    logging_level: enums.LoggingLevel, watch: bool = False, lazy: bool = False
+) -> None:
     """This prepares the server for starting.
 
     Args:
         logging_level: The logging level.
+        watch: Whether or not to watch the provider directories and reload providers as they change.
+        lazy: Whether or not to defer loading each provider until it is first used.
 
     Returns:
         Nothing.
     """
     utils.set_logging_level(logging_level)
+    reloader.lazy = lazy
     logger.debug("Preparing to start the server...")
-    provs.load_providers(providers, errors)
+    logger.info("Loading the providers....")
+    reload_providers()
+    if watch:
+        ProviderWatcher(reload_providers).start()
 
 
-def start(port: int, logging_level: enums.LoggingLevel) -> None:
+def make_servers(
+    port: t.Optional[int],
+    socket_path: t.Optional[Path],
+    engine: enums.ServerEngine,
+    max_workers: int,
+    queue_depth: int,
+) -> t.List[SingleThreadedServer]:
+    """This makes the servers listening on a unix socket and on a port, exiting if either can't be listened on.
+
+    Args:
+        port: The port to broadcast the server on, or None to not listen on a port.
+        socket_path: The path of the unix socket to listen on, or None to not listen on a unix socket.
+        engine: How the servers serve their connections.
+        max_workers: The amount of connections (or requests, for the async engine) served at the same time.
+        queue_depth: The amount of connections (or requests, for the async engine) which may wait for a free worker.
+
+    Returns:
+        The servers, the one listening on the unix socket first.
+    """
+    servers: t.List[SingleThreadedServer] = []
+    if socket_path is not None:
+        try:
+            utils.prepare_socket_path(socket_path)
+            # only the user running the server may talk to it through the unix socket, from the moment it's bound.
+            with utils.umask(0o077):
+                servers.append(
+                    make_server(
+                        engine,
+                        SinglePackageManagerService,
+                        max_workers,
+                        queue_depth,
+                        socket_path=str(socket_path),
+                    )
+                )
+        except OSError as error:
+            if error.errno == errno.EADDRINUSE:
+                logger.critical(f"The unix socket '{socket_path}' is already in use.")
+            else:
+                logger.critical(
+                    f"The unix socket '{socket_path}' can't be listened on: {error}"
+                )
+            sys.exit(1)
+
+    if port is not None:
+        try:
+            servers.append(
+                make_server(
+                    engine,
+                    SinglePackageManagerService,
+                    max_workers,
+                    queue_depth,
+                    port=port,
+                )
+            )
+        except OverflowError:
+            logger.critical(f"The port {port} is not within 0-65535.")
+            sys.exit(1)
+        except PermissionError:
+            logger.critical(f"The server is not allowed to use the port {port}.")
+            sys.exit(1)
+        except OSError as error:
+            if error.errno == errno.EADDRINUSE:
+                logger.critical(f"The port {port} is already in use.")
+                sys.exit(1)
+            else:
+                raise
+
+    return servers
+
+
+def start(
+    port: t.Optional[int],
+    logging_level: enums.LoggingLevel,
+    watch: bool = False,
+    lazy: bool = False,
+    engine: enums.ServerEngine = enums.ServerEngine.THREADED,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    queue_depth: int = DEFAULT_QUEUE_DEPTH,
+    socket_path: t.Optional[Path] = None,
+    metrics_file: t.Optional[Path] = None,
+    metrics_port: t.Optional[int] = None,
+    profile: t.Optional[str] = None,
+    profile_rate: float = 1.0,
+    profile_interval: float = profiling.DEFAULT_INTERVAL,
+) -> None:
     """This starts the server.
 
     Args:
-        port: The port to broadcast the server on.
+        port: The port to broadcast the server on, or None to only listen on the unix socket.
         logging_level: The logging level.
+        watch: Whether or not to watch the provider directories and reload providers as they change.
+        lazy: Whether or not to defer loading each provider until it is first used.
+        engine: How the server serves its connections.
+        max_workers: The amount of connections (or requests, for the async engine) served at the same time.
+        queue_depth: The amount of connections (or requests, for the async engine) which may wait for a free worker.
+        socket_path: The path of a unix socket to listen on as well, which is cheaper to connect to for local clients.
+        metrics_file: The path of a file to export the metrics to every once in a while, in the Prometheus text format.
+        metrics_port: The local port to serve the metrics on over HTTP, in the Prometheus text format.
+        profile: The profiling mode to profile the server with from the start, if any; `cprofile` or `sampling`.
+        profile_rate: The share of the requests and source calls which are profiled, from 0 to 1.
+        profile_interval: The amount of seconds between two samples, in the sampling mode.
 
     Returns:
         Nothing.
     """
-    prepare_server(logging_level)
-    try:
-        server = SingleThreadedServer(SinglePackageManagerService, port=port)
-        server.start()
-    except OverflowError:
-        logger.critical(f"The port {port} is not within 0-65535.")
+    if port is None and socket_path is None:
+        logger.critical("The server has to listen on either a port or a unix socket.")
         sys.exit(1)
-    except PermissionError:
-        logger.critical(f"The server is not allowed to use the port {port}.")
-        sys.exit(1)
-    except OSError as error:
-        if error.errno == errno.EADDRINUSE:
-            logger.critical(f"The port {port} is already in use.")
-            sys.exit(1)
-        else:
-            raise
 
-
-class SingleThreadedServer(ThreadedServer):
-    def _serve_client(self, sock, credentials):
-        client_host, client_port = sock.getpeername()
-        if credentials:
-            logger.info(
-                f"A client ({client_host}) has connected to the server using the port {client_port} "
-                f"(creds is {credentials})"
-            )
-        else:
-            logger.info(
-                f"A client ({client_host}) has connected to the server using the port {client_port}"
+    prepare_server(logging_level, watch, lazy)
+    servers = make_servers(port, socket_path, engine, max_workers, queue_depth)
+    logger.debug(f"Using the {engine.value} server engine")
+    if metrics_file is not None:
+        metrics_.export_to_file(metrics, metrics_file)
+        logger.info(f"Exporting the metrics to '{metrics_file}'")
+    if metrics_port is not None:
+        try:
+            metrics_.serve(metrics, metrics_port)
+        except OSError as error:
+            logger.critical(
+                f"The metrics can't be served on the port {metrics_port}: {error}"
             )
-        super()._serve_client(sock, credentials)
-
-    def start(self):
-        logger.debug("Listening...")
-        self._listen()
-        logger.debug("Registering...")
-        self._register()
-        logger.info(f"Server is now active and is listening on port {self.port}")
+            sys.exit(1)
+        logger.info(f"Serving the metrics on http://127.0.0.1:{metrics_port}/metrics")
+    if profile is not None:
         try:
-            while self.active:
-                self.accept()
-        except EOFError:
-            logger.info("Server closed by another thread")
-        except KeyboardInterrupt:
-            logger.info("A keyboard interrupt has been received, stopping server")
-        finally:
-            logger.info("The server has been terminated")
-            self.close()
+            profiler.start(profile, profile_rate, profile_interval)
+        except ValueError as error:
+            logger.critical(f"The server can't be profiled: {error}")
+            sys.exit(1)
+    for server in servers[1:]:
+        threading.Thread(target=server.start, daemon=True).start()
+
+    try:
+        servers[0].start()
+    finally:
+        for server in servers[1:]:
+            server.close()
+        if socket_path is not None and socket_path.is_socket():
+            socket_path.unlink()
+        profiler.stop()
 
 
 class SinglePackageManagerService(Service):
@@ -98,7 +621,7 @@ class SinglePackageManagerService(Service):
             Nothing.
         """
         logger.info("Being asked to reload the providers")
-        provs.load_providers(providers, errors)
+        reload_providers()
 
     @property
     def exposed_status(self) -> ServerState:
@@ -108,57 +631,157 @@ class SinglePackageManagerService(Service):
             The status of the server.
         """
         logger.info("Being asked to get the status of the server")
-        return ServerState.from_errors(errors)
+        return ServerState.from_errors(errors, search_cache.stats())
 
     @staticmethod
-    def exposed_search(
-        packages: t.List[str], providers_: t.List[ProviderMetadata]
-    ) -> t.List[Package]:
+    def exposed_search(packages: t.List[str], providers_: t.List[str]) -> bytes:
         """This searches for packages in all providers (or some).
 
         Args:
             packages: The packages to search for.
-            providers_: The providers to search packages from.
+            providers_: The names of the providers to search packages from.
+
+        Returns:
+            The packages found, packed using the wire format. At most `search.DEFAULT_LIMIT` packages are found in the
+            catalog per provider and per package searched for; broader searches are done with `search_start`.
+        """
+        logger.info(f"Being asked to search for {prettify_list(packages)}")
+        return wire.pack_packages(
+            search_.search(
+                packages,
+                resolve_providers(providers_),
+                catalog,
+                get_source,
+                search_cache,
+                fuzzy_index,
+                search_.DEFAULT_LIMIT,
+            )
+        )
+
+    @staticmethod
+    def exposed_suggest(
+        name: str,
+        providers_: t.List[str],
+        limit: int = search_.DEFAULT_SUGGESTIONS,
+    ) -> bytes:
+        """This suggests the packages with the names most similar to a (possibly mistyped) name.
+
+        Args:
+            name: The name.
+            providers_: The names of the providers to suggest packages from.
+            limit: The maximum amount of suggestions.
+
+        Returns:
+            The suggestions, most similar first, packed using the wire format.
+        """
+        logger.info(f"Being asked for packages like {name}")
+        return wire.pack_packages(
+            search_.suggest(
+                name,
+                resolve_providers(providers_),
+                catalog,
+                get_source,
+                fuzzy_index,
+                limit,
+            )
+        )
+
+    @staticmethod
+    def exposed_search_start(packages: t.List[str], providers_: t.List[str]) -> str:
+        """This starts searching for packages in all providers (or some) in the background, so that the packages can
+        be fetched page by page as soon as they're found.
+
+        Args:
+            packages: The packages to search for.
+            providers_: The names of the providers to search packages from.
+
+        Returns:
+            The id of the search cursor.
+        """
+        logger.info(f"Being asked to start searching for {prettify_list(packages)}")
+        found = search_.iter_search(
+            packages,
+            resolve_providers(providers_),
+            catalog,
+            get_source,
+            cache=search_cache,
+            index=fuzzy_index,
+        )
+        return cursors.open(
+            search_.SearchCursor(
+                [(provider.name, package) for package in search_.readable(packages_)]
+                for provider, packages_ in found
+            )
+        )
+
+    @staticmethod
+    def exposed_search_next(
+        cursor_id: str,
+        page_size: int = search_.DEFAULT_PAGE_SIZE,
+        timeout: float = 1.0,
+    ) -> t.Tuple[bytes, bool]:
+        """This fetches the next page of packages of a search.
+
+        Args:
+            cursor_id: The id of the search cursor.
+            page_size: The maximum amount of packages in the page.
+            timeout: The amount of seconds to wait for the first package of the page.
+
+        Raises:
+            KeyError: If there's no such search cursor, or it was closed.
+
+        Returns:
+            The page packed using the wire format, which may be empty if no package was found on time, and whether or
+            not the search is done.
+        """
+        page, done = cursors.get(cursor_id).fetch(page_size, timeout)
+        if done:
+            cursors.close(cursor_id)
+
+        return wire.pack_packages(page), done
+
+    @staticmethod
+    def exposed_search_close(cursor_id: str) -> None:
+        """This closes a search cursor, stopping the search if it's still running.
+
+        Args:
+            cursor_id: The id of the search cursor.
 
         Returns:
-            A list of packages found.
+            Nothing.
         """
-        raise NotImplementedError
+        cursors.close(cursor_id)
 
     @staticmethod
-    def exposed_install(
-        packages: t.List[str], providers_: t.List[ProviderMetadata]
-    ) -> None:
+    def exposed_install(packages: t.List[str], providers_: t.List[str]) -> None:
         """This installs packages by finding and installing them from different providers.
 
         Args:
             packages: The packages to install.
-            providers_: The providers to search and install packages from.
+            providers_: The names of the providers to search and install packages from.
 
         Returns:
             Nothing.
         """
-        raise NotImplementedError
+        logger.info(f"Being asked to install {prettify_list(list(packages))}")
+        install(list(packages), resolve_providers(providers_))
 
     @staticmethod
-    def exposed_remove(
-        packages: t.List[str], providers_: t.List[ProviderMetadata]
-    ) -> None:
-        """This removes packages from different providers if they are from a register.
+    def exposed_remove(packages: t.List[str], providers_: t.List[str]) -> None:
+        """This removes packages from different providers, preferring the providers they were installed from.
 
         Args:
             packages: The packages to remove.
-            providers_: The provider to remove packages from.
+            providers_: The names of the providers to remove packages from.
 
         Returns:
             Nothing.
         """
-        raise NotImplementedError
+        logger.info(f"Being asked to remove {prettify_list(list(packages))}")
+        operate("remove", list(packages), resolve_providers(providers_))
 
     @staticmethod
-    def exposed_update(
-        packages: t.List[str], providers_: t.List[ProviderMetadata]
-    ) -> None:
+    def exposed_update(packages: t.List[str], providers_: t.List[str]) -> None:
         """This updates packages from different providers. If the package list is empty then it will try to update
         all packages.
 
@@ -168,12 +791,257 @@ class SinglePackageManagerService(Service):
 
         Args:
             packages: The packages to update.
-            providers_: The providers to find updates from.
+            providers_: The names of the providers to find updates from.
+
+        Returns:
+            Nothing.
+        """
+        logger.info("Being asked to update packages")
+        operate("update", list(packages), resolve_providers(providers_))
+
+    @staticmethod
+    def exposed_submit(
+        operation: str,
+        packages: t.List[str],
+        providers_: t.List[str],
+        priority: int = 0,
+    ) -> str:
+        """This submits an install, a removal or an update as a job, which runs in the background.
+
+        Args:
+            operation: Either `install`, `remove` or `update`.
+            packages: The packages.
+            providers_: The names of the providers.
+            priority: The priority of the job. Jobs with a higher priority run first.
+
+        Raises:
+            ValueError: If the operation isn't one of the above.
+
+        Returns:
+            The id of the job.
+        """
+        if operation not in JOB_OPERATIONS:
+            raise ValueError(
+                f"the operation has to be one of {prettify_list(list(JOB_OPERATIONS))}, not '{operation}'"
+            )
+
+        logger.info(
+            f"Being asked to {operation} {prettify_list(list(packages))} as a job"
+        )
+        packages, resolved = list(packages), resolve_providers(providers_)
+        # a job which may use any provider only holds up the other jobs on the providers it turns out to use.
+        claim = not providers_
+        job = jobs.submit(
+            operation,
+            lambda job_: run_job(operation, packages, resolved, job_, claim),
+            packages,
+            [] if claim else [provider.name for provider in resolved],
+            priority,
+        )
+        return job.id
+
+    @staticmethod
+    def exposed_job(job_id: str, timeout: float = 0.0) -> bytes:
+        """This gets a job, optionally waiting for it to finish first.
+
+        Args:
+            job_id: The id of the job.
+            timeout: The maximum amount of seconds to wait for the job to finish.
+
+        Raises:
+            KeyError: If there's no such job, or it finished too long ago.
+
+        Returns:
+            The job, packed using the wire format.
+        """
+        job = jobs.wait(job_id, timeout) if timeout > 0 else jobs.get(job_id)
+        return wire.pack_jobs([job])
+
+    @staticmethod
+    def exposed_jobs() -> bytes:
+        """This gets every job which is queued, running or finished recently.
+
+        Returns:
+            The jobs, packed using the wire format.
+        """
+        return wire.pack_jobs(jobs.jobs())
+
+    @staticmethod
+    def exposed_cancel(job_id: str) -> bool:
+        """This cancels a job. A queued job never runs, and a running install stops before its next step.
+
+        Args:
+            job_id: The id of the job.
+
+        Raises:
+            KeyError: If there's no such job, or it finished too long ago.
+
+        Returns:
+            Whether or not the job could still be cancelled.
+        """
+        logger.info(f"Being asked to cancel the job {job_id}")
+        return jobs.cancel(job_id)
+
+    @staticmethod
+    def exposed_installed(providers_: t.List[str]) -> bytes:
+        """This lists the packages installed through single.
+
+        Args:
+            providers_: The names of the providers to list the packages of. If it's empty, every provider is listed,
+                        even the ones which aren't loaded anymore.
+
+        Returns:
+            The installed packages, packed using the wire format.
+        """
+        logger.info("Being asked to list the installed packages")
+        return wire.pack_installed(installed.installed(list(providers_) or None))
+
+    @staticmethod
+    def exposed_owners(name: str) -> bytes:
+        """This finds which providers a package was installed from.
+
+        Args:
+            name: The name of the package.
+
+        Returns:
+            The package as installed from every provider it was installed from, packed using the wire format.
+        """
+        logger.info(f"Being asked which providers {name} was installed from")
+        return wire.pack_installed(installed.owners(name))
+
+    @staticmethod
+    def exposed_outdated(
+        providers_: t.List[str], max_age: float = DEFAULT_MAX_AGE
+    ) -> bytes:
+        """This finds the packages installed through single which have a newer version available, looking at every
+        provider (or some) at the same time.
+
+        Args:
+            providers_: The names of the providers to look at.
+            max_age: The amount of seconds the listings in the catalog can be used for before they're refreshed.
+
+        Returns:
+            The outdated packages, packed using the wire format.
+        """
+        logger.info("Being asked which packages are outdated")
+        resolved = resolve_providers(providers_)
+        found = {
+            provider.name: updates
+            for provider, updates in iter_outdated(resolved, max_age)
+        }
+        return wire.pack_outdated(
+            (provider.name, update)
+            for provider in resolved
+            for update in found.get(provider.name, [])
+        )
+
+    @staticmethod
+    def exposed_outdated_start(
+        providers_: t.List[str], max_age: float = DEFAULT_MAX_AGE
+    ) -> str:
+        """This starts finding the outdated packages in the background, so that they can be fetched page by page as
+        soon as each provider is done.
+
+        Args:
+            providers_: The names of the providers to look at.
+            max_age: The amount of seconds the listings in the catalog can be used for before they're refreshed.
+
+        Returns:
+            The id of the cursor.
+        """
+        logger.info("Being asked to start looking for outdated packages")
+        found = iter_outdated(resolve_providers(providers_), max_age)
+        return outdated_cursors.open(
+            search_.SearchCursor(
+                [(provider.name, update) for update in updates]
+                for provider, updates in found
+            )
+        )
+
+    @staticmethod
+    def exposed_outdated_next(
+        cursor_id: str,
+        page_size: int = search_.DEFAULT_PAGE_SIZE,
+        timeout: float = 1.0,
+    ) -> t.Tuple[bytes, bool]:
+        """This fetches the next page of outdated packages.
+
+        Args:
+            cursor_id: The id of the cursor.
+            page_size: The maximum amount of packages in the page.
+            timeout: The amount of seconds to wait for the first package of the page.
+
+        Raises:
+            KeyError: If there's no such cursor, or it was closed.
+
+        Returns:
+            The page packed using the wire format, which may be empty if no package was found on time, and whether or
+            not every provider is done.
+        """
+        page, done = outdated_cursors.get(cursor_id).fetch(page_size, timeout)
+        if done:
+            outdated_cursors.close(cursor_id)
+
+        return wire.pack_outdated(page), done
+
+    @staticmethod
+    def exposed_outdated_close(cursor_id: str) -> None:
+        """This closes a cursor of outdated packages, stopping it if it's still running.
+
+        Args:
+            cursor_id: The id of the cursor.
 
         Returns:
             Nothing.
         """
-        raise NotImplementedError
+        outdated_cursors.close(cursor_id)
+
+    @staticmethod
+    def exposed_metrics(prometheus: bool = False) -> bytes:
+        """This gets the metrics of the server; how long every request and every call to a source took, how many are
+        running, how many failed and how much they gave back.
+
+        Args:
+            prometheus: Whether to give back the metrics in the Prometheus text format instead of the wire format.
+
+        Returns:
+            The metrics, packed using the wire format or encoded in the Prometheus text format.
+        """
+        if prometheus:
+            return metrics.prometheus().encode()
+
+        return wire.pack_metrics(metrics.snapshot())
+
+    @staticmethod
+    def exposed_profile(
+        mode: t.Optional[str],
+        rate: float = 1.0,
+        interval: float = profiling.DEFAULT_INTERVAL,
+    ) -> t.Tuple[str, ...]:
+        """This starts or stops profiling the requests and the calls made to sources.
+
+        Args:
+            mode: The profiling mode to start profiling with, `cprofile` or `sampling`, or None to stop profiling.
+            rate: The share of the requests and source calls which are profiled, from 0 to 1.
+            interval: The amount of seconds between two samples, in the sampling mode.
+
+        Raises:
+            ValueError: If the mode doesn't exist, or the rate or the interval are out of range.
+
+        Returns:
+            The paths of the profiles written, once profiling stops (or restarts).
+        """
+        if mode is None:
+            logger.info("Being asked to stop profiling")
+            return tuple(str(path) for path in profiler.stop())
+
+        logger.info(f"Being asked to start profiling using {mode}")
+        paths = profiler.stop()
+        profiler.start(mode, rate, interval)
+        return tuple(str(path) for path in paths)
 
     def on_disconnect(self, conn) -> None:
         logger.info("A client has disconnected from the server")
+
+
+metrics.instrument_service(profiler.instrument_service(SinglePackageManagerService))
@@ -0,0 +1,313 @@
+"""These are the server engines, which decide how connections to the server are served."""
+from single import _enums as enums
+from single.constants import DEFAULT_MAX_WORKERS, DEFAULT_QUEUE_DEPTH
+from loguru import logger
+from rpyc.utils.server import ThreadedServer  # type: ignore  # no stubs found
+from rpyc.core.stream import SocketStream  # type: ignore  # no stubs found
+from rpyc.core.channel import Channel  # type: ignore  # no stubs found
+from concurrent import futures
+import typing as t
+import threading
+import asyncio
+import socket
+
+
+class SingleThreadedServer(ThreadedServer):
+    """This is a server which spawns a thread for every connection, without any limit."""
+
+    def _log_client(self, sock: socket.socket, credentials: t.Any = None) -> None:
+        peer = sock.getpeername()
+        if not isinstance(peer, tuple):
+            logger.info("A client has connected to the server through the unix socket")
+            return
+
+        client_host, client_port = peer
+        if credentials:
+            logger.info(
+                f"A client ({client_host}) has connected to the server using the port {client_port} "
+                f"(creds is {credentials})"
+            )
+        else:
+            logger.info(
+                f"A client ({client_host}) has connected to the server using the port {client_port}"
+            )
+
+    @property
+    def address(self) -> str:
+        """This describes where the server is listening on, for logging.
+
+        Returns:
+            The port or the unix socket the server is listening on.
+        """
+        if isinstance(self.port, str):
+            return f"the unix socket '{self.port}'"
+
+        return f"port {self.port}"
+
+    def _serve_client(self, sock, credentials):
+        self._log_client(sock, credentials)
+        super()._serve_client(sock, credentials)
+
+    def start(self):
+        logger.debug("Listening...")
+        self._listen()
+        logger.debug("Registering...")
+        self._register()
+        logger.info(f"Server is now active and is listening on {self.address}")
+        try:
+            while self.active:
+                self.accept()
+        except EOFError:
+            logger.info("Server closed by another thread")
+        except KeyboardInterrupt:
+            logger.info("A keyboard interrupt has been received, stopping server")
+        finally:
+            logger.info("The server has been terminated")
+            self.close()
+
+
+class SingleThreadPoolServer(SingleThreadedServer):
+    """This is a server which serves connections on a bounded thread pool.
+
+    At most `max_workers` connections are served at the same time, and at most `queue_depth` more wait for a free
+    worker. Any connection past that is turned away right away instead of piling up threads.
+
+    Args:
+        *args: The arguments of the rpyc server.
+        max_workers: The amount of connections served at the same time.
+        queue_depth: The amount of connections which may wait for a free worker.
+        **kwargs: The keyword arguments of the rpyc server.
+    """
+
+    def __init__(
+        self,
+        *args: t.Any,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        queue_depth: int = DEFAULT_QUEUE_DEPTH,
+        **kwargs: t.Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="single-worker"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + queue_depth)
+
+    def _accept_method(self, sock):
+        if not self._slots.acquire(blocking=False):
+            logger.warning(
+                f"Turning a client away, {self.max_workers} connection(s) are being served and "
+                f"{self.queue_depth} are waiting already"
+            )
+            self.clients.discard(sock)
+            sock.close()
+            return
+
+        self._executor.submit(self._serve_and_release, sock)
+
+    def _serve_and_release(self, sock: socket.socket) -> None:
+        try:
+            self._authenticate_and_serve_client(sock)
+        except Exception:
+            pass  # it's logged by rpyc already
+        finally:
+            self._slots.release()
+
+    def close(self):
+        super().close()
+        self._executor.shutdown(wait=False)
+
+
+class SingleAsyncServer(SingleThreadedServer):
+    """This is a server driven by an event loop.
+
+    Accepting connections and waiting for requests is done by an asyncio event loop, so an idle connection costs
+    nothing but a file descriptor. Once a request comes in it is served on a bounded thread pool; while every worker is
+    busy and `queue_depth` requests are waiting, the event loop stops reading from connections until a worker frees
+    up, so clients are slowed down instead of the server falling over.
+
+    Args:
+        *args: The arguments of the rpyc server.
+        max_workers: The amount of requests served at the same time.
+        queue_depth: The amount of requests which may wait for a free worker.
+        **kwargs: The keyword arguments of the rpyc server.
+    """
+
+    def __init__(
+        self,
+        *args: t.Any,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        queue_depth: int = DEFAULT_QUEUE_DEPTH,
+        **kwargs: t.Any,
+    ) -> None:
+        if kwargs.get("authenticator") is not None:
+            raise ValueError("the async engine doesn't support authenticators")
+
+        super().__init__(*args, **kwargs)
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="single-worker"
+        )
+        self._loop: t.Optional[asyncio.AbstractEventLoop] = None
+        self._connections: t.Dict[int, t.Tuple[t.Any, socket.socket]] = {}
+        self._pending = 0
+        self._paused: t.List[int] = []
+
+    def start(self):
+        logger.debug("Listening...")
+        self._listen()
+        logger.debug("Registering...")
+        self._register()
+        logger.info(f"Server is now active and is listening on {self.address}")
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._accept_forever())
+        except KeyboardInterrupt:
+            logger.info("A keyboard interrupt has been received, stopping server")
+        finally:
+            logger.info("The server has been terminated")
+            for fileno in list(self._connections):
+                self._drop(fileno)
+            loop.close()
+            self.close()
+
+    def close(self):
+        super().close()
+        self._executor.shutdown(wait=False)
+
+    async def _accept_forever(self) -> None:
+        loop = asyncio.get_event_loop()
+        self.listener.setblocking(False)
+        while self.active:
+            try:
+                sock, _ = await asyncio.wait_for(loop.sock_accept(self.listener), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            except OSError:
+                if not self.active:
+                    logger.info("Server closed by another thread")
+                    return
+                raise
+
+            sock.setblocking(True)
+            self.clients.add(sock)
+            try:
+                conn = self._connect(sock)
+            except Exception as error:
+                logger.warning(f"Couldn't set up a connection with a client: {error}")
+                self.clients.discard(sock)
+                sock.close()
+                continue
+
+            self._connections[sock.fileno()] = conn, sock
+            self._watch(sock.fileno())
+
+    def _connect(self, sock: socket.socket) -> t.Any:
+        self._log_client(sock)
+        config = dict(
+            self.protocol_config,
+            credentials=None,
+            endpoints=(sock.getsockname(), sock.getpeername()),
+            logger=self.logger,
+        )
+        return self.service._connect(Channel(SocketStream(sock)), config)
+
+    def _watch(self, fileno: int) -> None:
+        if self._loop is None or fileno not in self._connections:
+            return
+
+        if self._pending >= self.max_workers + self.queue_depth:
+            # every worker is busy and the queue is full, so this connection isn't read from until there's room.
+            self._paused.append(fileno)
+            return
+
+        self._loop.add_reader(fileno, self._on_readable, fileno)
+
+    def _on_readable(self, fileno: int) -> None:
+        assert self._loop is not None
+        # the connection isn't watched while its request is served, so only one worker ever reads from it.
+        self._loop.remove_reader(fileno)
+        self._pending += 1
+        future = self._executor.submit(self._serve_request, fileno)
+        future.add_done_callback(
+            lambda future_: self._loop.call_soon_threadsafe(  # type: ignore
+                self._on_served, fileno, future_
+            )
+        )
+
+    def _serve_request(self, fileno: int) -> bool:
+        connection = self._connections.get(fileno)
+        if connection is None:
+            return False
+
+        try:
+            connection[0].serve(1)
+        except EOFError:
+            return False
+
+        return True
+
+    def _on_served(self, fileno: int, future: futures.Future) -> None:
+        self._pending -= 1
+        try:
+            alive = future.result()
+        except Exception:
+            logger.exception("A client connection terminated abruptly")
+            alive = False
+
+        if alive:
+            self._watch(fileno)
+        else:
+            self._drop(fileno)
+
+        while self._paused and self._pending < self.max_workers + self.queue_depth:
+            self._watch(self._paused.pop(0))
+
+    def _drop(self, fileno: int) -> None:
+        connection = self._connections.pop(fileno, None)
+        if connection is None:
+            return
+
+        conn, sock = connection
+        if self._loop is not None:
+            self._loop.remove_reader(fileno)
+        self.clients.discard(sock)
+        conn.close()
+
+
+ENGINES: t.Dict[enums.ServerEngine, t.Type[SingleThreadedServer]] = {
+    enums.ServerEngine.THREADED: SingleThreadedServer,
+    enums.ServerEngine.POOL: SingleThreadPoolServer,
+    enums.ServerEngine.ASYNC: SingleAsyncServer,
+}
+
+
+def make_server(
+    engine: enums.ServerEngine,
+    service: t.Any,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    queue_depth: int = DEFAULT_QUEUE_DEPTH,
+    **kwargs: t.Any,
+) -> SingleThreadedServer:
+    """This makes a server using the given engine.
+
+    Args:
+        engine: The server engine.
+        service: The service to serve.
+        max_workers: The amount of connections or requests served at the same time. Unused by the threaded engine.
+        queue_depth: The amount of connections or requests which may wait for a free worker. Unused by the threaded
+                     engine.
+        **kwargs: The keyword arguments of the rpyc server.
+
+    Returns:
+        The server.
+    """
+    if engine is enums.ServerEngine.THREADED:
+        return SingleThreadedServer(service, **kwargs)
+
+    return ENGINES[engine](
+        service, max_workers=max_workers, queue_depth=queue_depth, **kwargs
+    )
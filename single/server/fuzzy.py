@@ -0,0 +1,417 @@
+"""This is the fuzzy index, an in-memory index over the catalog listings which answers substring lookups and ranked
+"did you mean" suggestions without going through SQLite or the sources.
+
+Each provider gets its own segment, which is rebuilt from the catalog whenever the provider's listing in the catalog
+is refreshed, so refreshing a provider never touches the segments of the other providers. A segment keeps posting
+lists of the packages using each trigram of their names, which narrow substring lookups down to the packages having
+the rarest trigram of what was searched for, and which suggestions are made from. The names are also sorted and joined
+into a single string, so lookups too short to have a trigram are a scan done by `str.find` instead of a loop over the
+packages. The words of the descriptions are kept sorted, with posting lists of the packages using each word, so that
+the words starting with what was searched for are found by a binary search.
+Posting lists are arrays of package indexes, which are much more compact than lists, and the packages themselves are
+kept in a package table, which has a column per field instead of an object per package.
+"""
+from single.models import PackageTable
+from single.server.catalog import Catalog, CatalogEntry, normalize_name
+from array import array
+import typing as t
+import threading
+import bisect
+import collections
+import heapq
+import attr
+
+# the default minimum similarity (shared trigrams over all trigrams) of a suggestion to what was searched for.
+DEFAULT_SIMILARITY = 0.3
+# the default maximum amount of suggestions given back.
+DEFAULT_SUGGESTIONS = 10
+# the amount of trigram postings counted to pick the candidates of a suggestion. the rarest trigrams are counted first
+# and the commonest ones past this are skipped.
+SUGGESTION_BUDGET = 20000
+# the amount of candidates compared in full per suggestion given back.
+SUGGESTION_CANDIDATES = 20
+# how matches are ranked, best first.
+EXACT, PREFIX, SUBSTRING, DESCRIPTION = range(4)
+_SEPARATOR = "\n"
+
+
+def trigrams(key: str) -> t.Set[str]:
+    """This splits a normalized package name into its trigrams, including the ones at its start and end.
+
+    Args:
+        key: The normalized package name.
+
+    Examples:
+        >>> sorted(trigrams("vim"))
+        [' vi', 'im ', 'vim']
+
+    Returns:
+        The trigrams.
+    """
+    padded = f" {key} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+def _join(texts: t.Sequence[str]) -> t.Tuple[str, "array[int]"]:
+    """This joins texts into a single string, along with where each text starts in it.
+
+    Args:
+        texts: The texts, which mustn't contain the separator.
+
+    Returns:
+        The joined texts and the offsets of each text.
+    """
+    offsets = array("I")
+    position = 0
+    for text in texts:
+        offsets.append(position)
+        position += len(text) + 1
+
+    return _SEPARATOR.join(texts), offsets
+
+
+def _key(name: str) -> str:
+    # most names are already normalized, and those share their string with their key.
+    key = normalize_name(name)
+    return name if key == name else key
+
+
+@attr.s(auto_attribs=True, eq=False)
+class Segment:
+    """This is the part of the fuzzy index holding the packages of a single provider.
+
+    Args:
+        stamp: When the provider's listing in the catalog was refreshed, which tells whether or not the segment is
+               still up to date.
+        provider: The name of the provider.
+        table: The packages, ordered by their normalized name.
+        keys: The normalized names of the packages. By default they're normalized from the names in the table.
+    """
+
+    stamp: float
+    provider: str
+    table: PackageTable
+    keys: t.List[str] = attr.ib(factory=list, repr=False)
+    _names: str = attr.ib(init=False, repr=False)
+    _name_offsets: "array[int]" = attr.ib(init=False, repr=False)
+    _grams: t.Dict[str, "array[int]"] = attr.ib(init=False, repr=False)
+    _words: t.List[str] = attr.ib(init=False, repr=False)
+    _word_postings: t.List["array[int]"] = attr.ib(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        if not self.keys:
+            self.keys = [_key(name) for name in self.table.names]
+        self._names, self._name_offsets = _join(self.keys)
+
+        grams: t.Dict[str, array] = collections.defaultdict(lambda: array("I"))
+        words: t.Dict[str, array] = collections.defaultdict(lambda: array("I"))
+        for index, description in enumerate(self.table.descriptions):
+            for gram in trigrams(self.keys[index]):
+                grams[gram].append(index)
+            for word in set(description.lower().split()):
+                words[word].append(index)
+        self._grams = dict(grams)
+
+        self._words = sorted(words)
+        self._word_postings = [words[word] for word in self._words]
+
+    @classmethod
+    def from_entries(
+        cls, stamp: float, provider: str, entries: t.Iterable[CatalogEntry]
+    ) -> "Segment":
+        """This makes a segment out of packages in any order.
+
+        Args:
+            stamp: When the provider's listing in the catalog was refreshed.
+            provider: The name of the provider.
+            entries: The packages.
+
+        Returns:
+            The segment.
+        """
+        table = PackageTable()
+        keyed = sorted(
+            ((_key(entry.name), entry) for entry in entries), key=lambda item: item[0]
+        )
+        for _, entry in keyed:
+            table.append(
+                entry.name,
+                entry.version,
+                entry.description,
+                entry.install_size,
+                entry.download_size,
+            )
+
+        return cls(stamp, provider, table, [key for key, _ in keyed])
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def entry(self, index: int) -> CatalogEntry:
+        """This gets a package of the segment as a catalog entry.
+
+        Args:
+            index: The index of the package.
+
+        Returns:
+            The package.
+        """
+        view = self.table.view(index)
+        return CatalogEntry(
+            self.provider,
+            view.name,
+            view.version,
+            view.description,
+            view.install_size,
+            view.download_size,
+        )
+
+    @staticmethod
+    def _scan(text: str, offsets: "array[int]", needle: str) -> t.Iterator[int]:
+        """This finds the texts containing a needle, in order.
+
+        Args:
+            text: The joined texts.
+            offsets: Where each text starts.
+            needle: The needle, which mustn't contain the separator.
+
+        Returns:
+            An iterator of the indexes of the texts containing the needle, each given back once.
+        """
+        position = text.find(needle)
+        while position != -1:
+            index = bisect.bisect_right(offsets, position) - 1
+            yield index
+            # the next match can't be in this text anymore, so the scan carries on from the next one.
+            if index + 1 == len(offsets):
+                return
+            position = text.find(needle, offsets[index + 1])
+
+    def _substring(self, key: str) -> t.Iterable[int]:
+        """This finds the packages whose normalized name contains a normalized name.
+
+        Args:
+            key: The normalized name.
+
+        Returns:
+            The indexes of the packages found, in order.
+        """
+        if len(key) < 3:
+            return self._scan(self._names, self._name_offsets, key)
+
+        # a name containing the key has every trigram of the key, so only the packages having its rarest one are
+        # candidates.
+        postings = [
+            self._grams.get(key[index : index + 3], ()) for index in range(len(key) - 2)
+        ]
+        return (index for index in min(postings, key=len) if key in self.keys[index])
+
+    def _described(self, query: str) -> t.List[int]:
+        """This finds the packages whose description has words starting with every word of what was searched for.
+
+        Args:
+            query: What was searched for.
+
+        Returns:
+            The indexes of the packages found, in order.
+        """
+        found: t.Optional[t.Set[int]] = None
+        # the longest words go first, as they're usually the ones found in the fewest descriptions.
+        for needle in sorted(set(query.lower().split()), key=len, reverse=True):
+            matches: t.Set[int] = set()
+            word = bisect.bisect_left(self._words, needle)
+            while word < len(self._words) and self._words[word].startswith(needle):
+                matches.update(self._word_postings[word])
+                word += 1
+
+            found = matches if found is None else found & matches
+            if not found:
+                return []
+
+        return sorted(found or ())
+
+    def find(
+        self, query: str, limit: t.Optional[int] = None, descriptions: bool = True
+    ) -> t.List[t.Tuple[int, CatalogEntry]]:
+        """This finds the packages whose name (or description) contains what was searched for.
+
+        Args:
+            query: What was searched for.
+            limit: The maximum amount of packages to find.
+            descriptions: Whether or not to look in the descriptions as well, after the names. A package matches if
+                          every word searched for starts a word of its description.
+
+        Returns:
+            The packages found with their rank; exact matches come first, then the names starting with the query, the
+            other names containing it and the descriptions matching it, each by name.
+        """
+        key = normalize_name(query)
+        if not key or _SEPARATOR in key:
+            return []
+
+        found: t.List[t.Tuple[int, CatalogEntry]] = []
+        seen: t.Set[int] = set()
+
+        def add(rank: int, index: int) -> bool:
+            if index not in seen:
+                seen.add(index)
+                found.append((rank, self.entry(index)))
+            return limit is not None and len(found) >= limit
+
+        end = bisect.bisect_left(self.keys, key)
+        while end < len(self.keys) and self.keys[end] == key:
+            if add(EXACT, end):
+                return found
+            end += 1
+        while end < len(self.keys) and self.keys[end].startswith(key):
+            if add(PREFIX, end):
+                return found
+            end += 1
+
+        for index in self._substring(key):
+            if add(SUBSTRING, index):
+                return found
+
+        if descriptions:
+            for index in self._described(query):
+                if add(DESCRIPTION, index):
+                    return found
+
+        return found
+
+    def suggest(
+        self,
+        query: str,
+        limit: int = DEFAULT_SUGGESTIONS,
+        similarity: float = DEFAULT_SIMILARITY,
+    ) -> t.List[t.Tuple[float, CatalogEntry]]:
+        """This suggests packages whose name looks like what was searched for, for when it was mistyped.
+
+        The names sharing the most of the rarer trigrams of the query are picked first, and only those are then
+        compared with the query in full, so that trigrams most names have (such as the ones of `lib`) don't make the
+        lookup go through most of the segment.
+
+        Args:
+            query: What was searched for.
+            limit: The maximum amount of suggestions.
+            similarity: The minimum similarity of a suggestion, from 0 to 1.
+
+        Returns:
+            The suggestions with their similarity, most similar first.
+        """
+        grams = trigrams(normalize_name(query))
+        postings = sorted(
+            (self._grams[gram] for gram in grams if gram in self._grams), key=len
+        )
+        shared: t.Counter[int] = collections.Counter()
+        counted = 0
+        for posting in postings:
+            if counted and counted + len(posting) > SUGGESTION_BUDGET:
+                break
+            shared.update(posting)
+            counted += len(posting)
+
+        scored = []
+        for index, _ in shared.most_common(limit * SUGGESTION_CANDIDATES):
+            key_grams = trigrams(self.keys[index])
+            count = len(grams & key_grams)
+            score = count / (len(grams) + len(key_grams) - count)
+            if score >= similarity:
+                scored.append((score, -index))
+
+        return [
+            (score, self.entry(-index))
+            for score, index in heapq.nlargest(limit, scored)
+        ]
+
+
+@attr.s(auto_attribs=True)
+class FuzzyIndex:
+    """This is the fuzzy index over the catalog listings of every provider."""
+
+    _segments: t.Dict[str, Segment] = attr.ib(factory=dict, init=False, repr=False)
+    # the locks of the providers whose segments are being built, so that a segment is only built once at a time.
+    _building: t.Dict[str, threading.Lock] = attr.ib(
+        factory=dict, init=False, repr=False
+    )
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, init=False, repr=False)
+
+    def segment(self, provider: str, catalog: Catalog) -> t.Optional[Segment]:
+        """This gets the segment of a provider, (re)building it if its listing in the catalog changed.
+
+        Args:
+            provider: The name of the provider.
+            catalog: The catalog the segment is built from.
+
+        Returns:
+            The segment, or None if the provider has no listing in the catalog.
+        """
+        stamp = catalog.refreshed_at(provider)
+        with self._lock:
+            segment = self._segments.get(provider)
+            if stamp is None:
+                self._segments.pop(provider, None)
+                return None
+            if segment is not None and segment.stamp == stamp:
+                return segment
+            building = self._building.setdefault(provider, threading.Lock())
+
+        # the build is done outside the index's lock, so a provider being rebuilt doesn't hold up the other providers,
+        # while the other searches of the same provider wait for it instead of building the segment themselves.
+        with building:
+            with self._lock:
+                segment = self._segments.get(provider)
+            if segment is not None and segment.stamp >= stamp:
+                return segment
+
+            segment = Segment.from_entries(stamp, provider, catalog.listing(provider))
+            with self._lock:
+                current = self._segments.get(provider)
+                if current is None or current.stamp < segment.stamp:
+                    self._segments[provider] = segment
+
+        return segment
+
+    def forget(self, provider: str) -> None:
+        """This removes the segment of a provider.
+
+        Args:
+            provider: The name of the provider.
+
+        Returns:
+            Nothing.
+        """
+        with self._lock:
+            self._segments.pop(provider, None)
+
+    def suggest(
+        self,
+        query: str,
+        providers: t.Sequence[str],
+        catalog: Catalog,
+        limit: int = DEFAULT_SUGGESTIONS,
+        similarity: float = DEFAULT_SIMILARITY,
+    ) -> t.List[CatalogEntry]:
+        """This suggests packages whose name looks like what was searched for, across providers.
+
+        Args:
+            query: What was searched for.
+            providers: The names of the providers to look in.
+            catalog: The catalog the segments are built from.
+            limit: The maximum amount of suggestions.
+            similarity: The minimum similarity of a suggestion, from 0 to 1.
+
+        Returns:
+            The suggestions, most similar first.
+        """
+        scored = []
+        for order, provider in enumerate(providers):
+            segment = self.segment(provider, catalog)
+            if segment is not None:
+                scored.extend(
+                    (-score, order, entry)
+                    for score, entry in segment.suggest(query, limit, similarity)
+                )
+
+        scored.sort(key=lambda item: item[:2])
+        return [item[2] for item in scored[:limit]]
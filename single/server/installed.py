@@ -0,0 +1,207 @@
+"""This is the installed state, a durable record of every package installed through single and which provider it was
+installed from."""
+from single import Package
+from single.server.catalog import normalize_name
+from pathlib import Path
+import typing as t
+import threading
+import sqlite3
+import attr
+import time
+
+SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS installed (
+    provider TEXT NOT NULL,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    installed_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (provider, key)
+);
+CREATE INDEX IF NOT EXISTS installed_by_key ON installed (key);
+"""
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class InstalledPackage:
+    """This is a package as it is recorded in the installed state.
+
+    Args:
+        provider: The name of the provider the package was installed from.
+        name: The name of the package.
+        version: The version of the package when it was last installed or updated through single.
+        installed_at: When the package was installed, as a timestamp.
+        updated_at: When the package was last installed or updated, as a timestamp.
+    """
+
+    provider: str
+    name: str
+    version: str
+    installed_at: float
+    updated_at: float
+
+
+@attr.s(auto_attribs=True)
+class InstalledState:
+    """This is the installed state, backed by SQLite.
+
+    Unlike the catalog, which is only a cache, this is the only record of what was installed through single, so it's
+    never thrown away; a database made by a newer version of single is refused instead. The database is only opened
+    once it is first used.
+
+    Args:
+        path: The path of the database, or ':memory:' for a state that doesn't survive restarts.
+    """
+
+    path: t.Union[Path, str]
+    _conn: t.Optional[sqlite3.Connection] = attr.ib(
+        default=None, init=False, repr=False
+    )
+    _lock: threading.RLock = attr.ib(factory=threading.RLock, init=False, repr=False)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The connection to the database, which is opened (and created, if needed) on first use.
+
+        Raises:
+            RuntimeError: If the database was made by a newer version of single.
+
+        Returns:
+            The connection to the database.
+        """
+        with self._lock:
+            if self._conn is None:
+                if isinstance(self.path, Path):
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+
+                conn = sqlite3.connect(str(self.path), check_same_thread=False)
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version > SCHEMA_VERSION:
+                    conn.close()
+                    raise RuntimeError(
+                        f"the installed state at '{self.path}' was made by a newer version of single"
+                    )
+
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.commit()
+                self._conn = conn
+
+            return self._conn
+
+    def close(self) -> None:
+        """This closes the database, if it was opened.
+
+        Returns:
+            Nothing.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def record_installed(self, provider: str, packages: t.Iterable[Package]) -> None:
+        """This records that packages were installed (or updated) from a provider, all at once.
+
+        Args:
+            provider: The name of the provider.
+            packages: The packages.
+
+        Returns:
+            Nothing.
+        """
+        self.record_versions(
+            provider, [(package.name, package.version) for package in packages]
+        )
+
+    def record_versions(
+        self, provider: str, versions: t.Iterable[t.Tuple[str, str]]
+    ) -> None:
+        """This records that packages were installed (or updated) from a provider at some versions, all at once.
+
+        Args:
+            provider: The name of the provider.
+            versions: The names of the packages with their versions.
+
+        Returns:
+            Nothing.
+        """
+        now = time.time()
+        rows = [
+            (provider, normalize_name(name), name, version, now)
+            for name, version in versions
+        ]
+
+        # upserts (ON CONFLICT ... DO UPDATE) need SQLite 3.24, so the packages which weren't installed yet are added
+        # first, and then every package is updated.
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO installed VALUES (?, ?, ?, ?, ?5, ?5)", rows
+            )
+            self.conn.executemany(
+                "UPDATE installed SET name = ?3, version = ?4, updated_at = ?5 "
+                "WHERE provider = ?1 AND key = ?2",
+                rows,
+            )
+
+    def record_removed(self, provider: str, names: t.Iterable[str]) -> None:
+        """This records that packages were removed from a provider, all at once.
+
+        Args:
+            provider: The name of the provider.
+            names: The names of the packages.
+
+        Returns:
+            Nothing.
+        """
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "DELETE FROM installed WHERE provider = ? AND key = ?",
+                [(provider, normalize_name(name)) for name in names],
+            )
+
+    def installed(
+        self, providers: t.Optional[t.Sequence[str]] = None
+    ) -> t.List[InstalledPackage]:
+        """This lists the installed packages.
+
+        Args:
+            providers: The providers to list the packages of. By default the packages of every provider are listed.
+
+        Returns:
+            The installed packages, by provider and name.
+        """
+        query = (
+            "SELECT provider, name, version, installed_at, updated_at FROM installed"
+        )
+        parameters: t.List[str] = []
+        if providers is not None:
+            query += f" WHERE provider IN ({', '.join('?' for _ in providers)})"
+            parameters.extend(providers)
+        query += " ORDER BY provider, key"
+
+        with self._lock:
+            rows = self.conn.execute(query, parameters).fetchall()
+
+        return [InstalledPackage(*row) for row in rows]
+
+    def owners(self, name: str) -> t.List[InstalledPackage]:
+        """This finds which providers a package was installed from.
+
+        Args:
+            name: The name of the package.
+
+        Returns:
+            The package as installed from every provider it was installed from.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT provider, name, version, installed_at, updated_at FROM installed "
+                "WHERE key = ? ORDER BY provider",
+                (normalize_name(name),),
+            ).fetchall()
+
+        return [InstalledPackage(*row) for row in rows]
@@ -0,0 +1,349 @@
+"""These are jobs, which are long running operations (such as installing packages) that the server runs in the
+background instead of keeping a connection busy until they're done."""
+from single import _enums as enums
+from single.context import Context, VoidContext
+from loguru import logger
+import typing as t
+import threading
+import itertools
+import heapq
+import uuid
+import time
+import attr
+
+# the default amount of jobs running at the same time.
+DEFAULT_MAX_JOBS = 4
+# the default amount of jobs running at the same time on a single provider.
+DEFAULT_PROVIDER_LIMIT = 1
+# the amount of finished jobs remembered, so that their outcome can still be looked up for a while.
+HISTORY_SIZE = 256
+# the amount of messages remembered per job.
+MAX_MESSAGES = 100
+
+
+class JobCancelled(Exception):
+    """This is raised inside a job once it notices that it got cancelled."""
+
+
+@attr.s(auto_attribs=True, eq=False)
+class Job:
+    """This is a job.
+
+    Args:
+        operation: The name of the operation, such as `install`.
+        packages: The packages the job works on.
+        providers: The names of the providers the job works on.
+        priority: The priority of the job. Jobs with a higher priority run first.
+    """
+
+    operation: str
+    packages: t.List[str]
+    providers: t.List[str]
+    priority: int = 0
+    id: str = attr.ib(factory=lambda: uuid.uuid4().hex)
+    state: enums.JobState = enums.JobState.QUEUED
+    submitted_at: float = attr.ib(factory=time.time)
+    started_at: t.Optional[float] = None
+    finished_at: t.Optional[float] = None
+    error: t.Optional[str] = None
+    messages: t.List[str] = attr.ib(factory=list)
+    _cancelled: threading.Event = attr.ib(
+        factory=threading.Event, init=False, repr=False
+    )
+
+    @property
+    def finished(self) -> bool:
+        """Whether or not the job is done running, whatever the outcome.
+
+        Returns:
+            Whether or not the job is finished.
+        """
+        return self.state in (
+            enums.JobState.DONE,
+            enums.JobState.FAILED,
+            enums.JobState.CANCELLED,
+        )
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether or not the job was asked to stop.
+
+        Returns:
+            Whether or not the job was cancelled.
+        """
+        return self._cancelled.is_set()
+
+    def check_cancelled(self) -> None:
+        """This stops the job if it was asked to stop. A running job is only stopped at the points it calls this.
+
+        Raises:
+            JobCancelled: If the job was cancelled.
+
+        Returns:
+            Nothing.
+        """
+        if self.cancelled:
+            raise JobCancelled
+
+
+@attr.s(auto_attribs=True)
+class JobContext(Context):
+    """This is a context which notes down the messages of a job on the job, so the client can follow its progress,
+    and passes them on to another context.
+
+    Args:
+        job: The job.
+        context: The context to pass the messages on to.
+    """
+
+    job: Job
+    context: Context = VoidContext()
+
+    def _note(self, level: str, message: t.Tuple[str, ...]) -> None:
+        self.job.messages.append(f"{level}: {' '.join(message)}")
+        del self.job.messages[:-MAX_MESSAGES]
+        getattr(self.context, level)(*message)
+
+    def trace(self, *message: str) -> None:
+        self.context.trace(*message)
+
+    def debug(self, *message: str) -> None:
+        self.context.debug(*message)
+
+    def info(self, *message: str) -> None:
+        self._note("info", message)
+
+    def warn(self, *message: str) -> None:
+        self._note("warn", message)
+
+    def success(self, *message: str) -> None:
+        self._note("success", message)
+
+    def error(self, *message: str) -> None:
+        self._note("error", message)
+
+    def critical(self, *message: str) -> None:
+        self._note("critical", message)
+
+
+@attr.s(auto_attribs=True)
+class JobScheduler:
+    """This runs jobs in the background, highest priority first.
+
+    At most `max_jobs` jobs run at the same time, and at most the limit of a provider run on that provider at the same
+    time. A job which has to wait for one of its providers doesn't hold up the jobs behind it which don't. A job whose
+    providers are only known once it runs (such as the providers of its packages) is submitted without providers and
+    claims them once it knows them.
+
+    Args:
+        max_jobs: The amount of jobs running at the same time.
+        provider_limits: The amount of jobs running at the same time on a provider, by the provider's name. Providers
+                         which aren't in here get one job at a time.
+    """
+
+    max_jobs: int = DEFAULT_MAX_JOBS
+    provider_limits: t.Dict[str, int] = attr.ib(factory=dict)
+    _jobs: t.Dict[str, Job] = attr.ib(factory=dict, init=False, repr=False)
+    _queue: t.List[t.Tuple[int, int, Job, t.Callable[[Job], None]]] = attr.ib(
+        factory=list, init=False, repr=False
+    )
+    _order: t.Iterator[int] = attr.ib(factory=itertools.count, init=False, repr=False)
+    _running: t.Dict[str, int] = attr.ib(factory=dict, init=False, repr=False)
+    _running_jobs: int = attr.ib(default=0, init=False, repr=False)
+    _history: t.List[str] = attr.ib(factory=list, init=False, repr=False)
+    _condition: threading.Condition = attr.ib(
+        factory=threading.Condition, init=False, repr=False
+    )
+
+    def submit(
+        self,
+        operation: str,
+        run: t.Callable[[Job], None],
+        packages: t.List[str],
+        providers: t.List[str],
+        priority: int = 0,
+    ) -> Job:
+        """This queues a job.
+
+        Args:
+            operation: The name of the operation.
+            run: The function doing the work of the job.
+            packages: The packages the job works on.
+            providers: The names of the providers the job works on.
+            priority: The priority of the job. Jobs with a higher priority run first.
+
+        Returns:
+            The job.
+        """
+        job = Job(operation, list(packages), sorted(set(providers)), priority)
+        with self._condition:
+            self._jobs[job.id] = job
+            heapq.heappush(self._queue, (-priority, next(self._order), job, run))
+            self._dispatch()
+
+        logger.debug(f"Queued the job {job.id} ({operation})")
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """This gets a job.
+
+        Args:
+            job_id: The id of the job.
+
+        Raises:
+            KeyError: If there's no such job, or it finished too long ago.
+
+        Returns:
+            The job.
+        """
+        with self._condition:
+            return self._jobs[job_id]
+
+    def jobs(self) -> t.List[Job]:
+        """This gets every job which is queued, running or finished recently.
+
+        Returns:
+            The jobs, in the order they were submitted.
+        """
+        with self._condition:
+            return sorted(self._jobs.values(), key=lambda job: job.submitted_at)
+
+    def cancel(self, job_id: str) -> bool:
+        """This cancels a job. A queued job never runs, and a running job stops the next time it checks.
+
+        Args:
+            job_id: The id of the job.
+
+        Raises:
+            KeyError: If there's no such job, or it finished too long ago.
+
+        Returns:
+            Whether or not the job could still be cancelled.
+        """
+        with self._condition:
+            job = self._jobs[job_id]
+            if job.finished:
+                return False
+
+            job._cancelled.set()
+            # a job waiting to claim its providers stops waiting.
+            self._condition.notify_all()
+            if job.state is enums.JobState.QUEUED:
+                self._queue = [entry for entry in self._queue if entry[2] is not job]
+                heapq.heapify(self._queue)
+                self._finish(job, enums.JobState.CANCELLED)
+
+        logger.info(f"Cancelled the job {job_id}")
+        return True
+
+    def wait(self, job_id: str, timeout: t.Optional[float] = None) -> Job:
+        """This waits for a job to finish.
+
+        Args:
+            job_id: The id of the job.
+            timeout: The maximum amount of seconds to wait.
+
+        Returns:
+            The job, which may not be finished if the timeout ran out.
+        """
+        with self._condition:
+            job = self._jobs[job_id]
+            self._condition.wait_for(lambda: job.finished, timeout)
+            return job
+
+    def claim(self, job: Job, providers: t.Iterable[str]) -> None:
+        """This makes a running job submitted without providers wait until it can run on the providers it turned out to
+        work on. Other jobs may run in its place while it waits.
+
+        Args:
+            job: The job.
+            providers: The names of the providers.
+
+        Raises:
+            JobCancelled: If the job was cancelled while waiting.
+
+        Returns:
+            Nothing.
+        """
+        names = sorted(set(providers))
+        with self._condition:
+            self._running_jobs -= 1
+            self._dispatch()
+            self._condition.wait_for(
+                lambda: job.cancelled
+                or (self._running_jobs < self.max_jobs and self._fits(names))
+            )
+            self._running_jobs += 1
+            job.check_cancelled()
+
+            job.providers = names
+            for provider in names:
+                self._running[provider] = self._running.get(provider, 0) + 1
+
+    def _limit(self, provider: str) -> int:
+        return self.provider_limits.get(provider, DEFAULT_PROVIDER_LIMIT)
+
+    def _fits(self, providers: t.List[str]) -> bool:
+        return all(
+            self._running.get(provider, 0) < self._limit(provider)
+            for provider in providers
+        )
+
+    def _dispatch(self) -> None:
+        # this has to be called while holding the condition. the queue is walked in priority order, starting every job
+        # that fits, so a job waiting for a busy provider doesn't block the jobs behind it.
+        waiting = []
+        while self._queue and self._running_jobs < self.max_jobs:
+            entry = heapq.heappop(self._queue)
+            job = entry[2]
+            if not self._fits(job.providers):
+                waiting.append(entry)
+                continue
+
+            self._start(job, entry[3])
+
+        for entry in waiting:
+            heapq.heappush(self._queue, entry)
+
+    def _start(self, job: Job, run: t.Callable[[Job], None]) -> None:
+        job.state = enums.JobState.RUNNING
+        job.started_at = time.time()
+        self._running_jobs += 1
+        for provider in job.providers:
+            self._running[provider] = self._running.get(provider, 0) + 1
+
+        threading.Thread(
+            target=self._run, args=(job, run), name=f"job-{job.id}", daemon=True
+        ).start()
+
+    def _run(self, job: Job, run: t.Callable[[Job], None]) -> None:
+        logger.info(f"Running the job {job.id} ({job.operation})")
+        state = enums.JobState.DONE
+        try:
+            job.check_cancelled()
+            run(job)
+        except JobCancelled:
+            state = enums.JobState.CANCELLED
+        except Exception as error:
+            logger.error(f"The job {job.id} ({job.operation}) failed: {error}")
+            job.error = f"{error.__class__.__name__}: {error}"
+            state = enums.JobState.FAILED
+
+        with self._condition:
+            self._running_jobs -= 1
+            for provider in job.providers:
+                self._running[provider] -= 1
+            self._finish(job, state)
+            self._dispatch()
+
+        logger.info(f"The job {job.id} ({job.operation}) is {state.value}")
+
+    def _finish(self, job: Job, state: enums.JobState) -> None:
+        # this has to be called while holding the condition.
+        job.state = state
+        job.finished_at = time.time()
+        self._history.append(job.id)
+        for job_id in self._history[:-HISTORY_SIZE]:
+            self._jobs.pop(job_id, None)
+        del self._history[:-HISTORY_SIZE]
+        self._condition.notify_all()
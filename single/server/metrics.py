@@ -0,0 +1,443 @@
+"""These are the metrics of the server, which time every request and every call made to a source.
+
+Every exposed method of the service and every call to a source keeps a latency histogram, the amount of calls in
+flight, the amount of calls which failed and how much was given back (bytes for requests, packages for sources). The
+metrics can be read through the `metrics` request, or exported in the Prometheus text format to a file or a local
+HTTP endpoint.
+"""
+from single import Source
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from loguru import logger
+from pathlib import Path
+import typing as t
+import functools
+import threading
+import bisect
+import time
+import attr
+
+# the upper bounds of the latency histogram buckets, in seconds.
+BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+# the calls made to sources which are timed.
+SOURCE_CALLS = (
+    "supported",
+    "package",
+    "catalog",
+    "dependencies",
+    "install_package",
+    "remove_package",
+    "update_package",
+)
+# the default amount of seconds between exports of the metrics to a file.
+DEFAULT_EXPORT_INTERVAL = 15.0
+_HELP = {
+    "rpc": ("request", "bytes given back by", "method"),
+    "source": ("source call", "packages given back by", "call"),
+}
+
+
+@attr.s(auto_attribs=True)
+class Series:
+    """This is what's measured for a single request or a single call of a provider.
+
+    Args:
+        buckets: The amount of calls which took at most as long as each of BUCKETS (and longer, for the last one).
+        count: The amount of calls which finished.
+        total: The total amount of seconds the finished calls took.
+        in_flight: The amount of calls still running.
+        errors: The amount of calls which failed.
+        returned: How much the calls gave back; bytes for requests and packages for sources.
+    """
+
+    buckets: t.List[int] = attr.ib(factory=lambda: [0] * (len(BUCKETS) + 1))
+    count: int = 0
+    total: float = 0.0
+    in_flight: int = 0
+    errors: int = 0
+    returned: int = 0
+
+    def quantile(self, quantile: float) -> float:
+        """This estimates a quantile of the latencies as the upper bound of the bucket it falls in.
+
+        Args:
+            quantile: The quantile, from 0 to 1.
+
+        Returns:
+            The estimated latency, which is infinite if it's beyond the last bucket and 0 if nothing was measured.
+        """
+        if not self.count:
+            return 0.0
+
+        rank, seen = quantile * self.count, 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return float("inf")
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """This converts the series into plain data.
+
+        Returns:
+            The series as plain data.
+        """
+        return dict(
+            count=self.count,
+            total=self.total,
+            in_flight=self.in_flight,
+            errors=self.errors,
+            returned=self.returned,
+            p50=self.quantile(0.5),
+            p99=self.quantile(0.99),
+            buckets=list(self.buckets),
+        )
+
+
+def _returned(result: t.Any) -> int:
+    """This measures how much a call gave back.
+
+    Args:
+        result: What the call gave back.
+
+    Returns:
+        The size of bytes, the length of lists and the sum of those in tuples.
+    """
+    if isinstance(result, (bytes, list)):
+        return len(result)
+    if isinstance(result, tuple):
+        return sum(_returned(item) for item in result)
+
+    return 0
+
+
+# how a call is wrapped; with what it is (its kind and labels), the function and its arguments.
+Call = t.Callable[..., t.Any]
+
+
+def instrument_source(call: Call, provider: str, source: Source) -> Source:
+    """This makes every call to a source go through a wrapper, such as `Metrics.call`.
+
+    Args:
+        call: The wrapper, which is given `source`, the name of the provider and the call as the labels, then the
+              method and its arguments.
+        provider: The name of the provider of the source.
+        source: The source, whose methods are replaced with wrapped ones.
+
+    Returns:
+        The source.
+    """
+    for name in SOURCE_CALLS:
+        method = getattr(source, name)
+        wrapped = functools.partial(call, "source", (provider, name), method)
+        setattr(source, name, functools.update_wrapper(wrapped, method))
+
+    return source
+
+
+def instrument_service(call: Call, service: t.Type[t.Any]) -> t.Type[t.Any]:
+    """This makes every request to a service go through a wrapper, such as `Metrics.call`.
+
+    Args:
+        call: The wrapper, which is given `rpc`, the name of the method as the labels, then the method and its
+              arguments.
+        service: The service, whose exposed methods (and properties) are replaced with wrapped ones.
+
+    Returns:
+        The service.
+    """
+    for name, member in list(vars(service).items()):
+        if not name.startswith("exposed_"):
+            continue
+
+        labels = (name[len("exposed_") :],)
+        if isinstance(member, property):
+            fget = member.fget
+            wrapped = functools.partial(call, "rpc", labels, fget)
+            setattr(service, name, property(functools.update_wrapper(wrapped, fget)))  # type: ignore
+        elif isinstance(member, staticmethod):
+            function = member.__func__
+            wrapped = functools.partial(call, "rpc", labels, function)
+            setattr(
+                service, name, staticmethod(functools.update_wrapper(wrapped, function))
+            )
+
+    return service
+
+
+@attr.s(auto_attribs=True)
+class Metrics:
+    """This is where the metrics of the server are kept."""
+
+    _series: t.Dict[t.Tuple[str, t.Tuple[str, ...]], Series] = attr.ib(
+        factory=dict, init=False, repr=False
+    )
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, init=False, repr=False)
+
+    def _get(self, kind: str, labels: t.Tuple[str, ...]) -> Series:
+        key = kind, labels
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = Series()
+
+        return series
+
+    def call(
+        self,
+        kind: str,
+        labels: t.Tuple[str, ...],
+        function: t.Callable[..., t.Any],
+        *args: t.Any,
+        **kwargs: t.Any,
+    ) -> t.Any:
+        """This calls a function, measuring the call.
+
+        Args:
+            kind: Either `rpc` or `source`.
+            labels: What the call is; the name of the method for requests, and the name of the provider and the call
+                    for sources.
+            function: The function.
+            *args: The arguments of the function.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            What the function gave back.
+        """
+        with self._lock:
+            series = self._get(kind, labels)
+            series.in_flight += 1
+
+        started = time.perf_counter()
+        failed, returned = False, 0
+        try:
+            result = function(*args, **kwargs)
+            returned = _returned(result)
+            return result
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                series.in_flight -= 1
+                series.count += 1
+                series.total += elapsed
+                series.buckets[bisect.bisect_left(BUCKETS, elapsed)] += 1
+                series.errors += failed
+                series.returned += returned
+
+    def instrument_source(self, provider: str, source: Source) -> Source:
+        """This makes every call to a source measured.
+
+        Args:
+            provider: The name of the provider of the source.
+            source: The source, whose methods are replaced with measured ones.
+
+        Returns:
+            The source.
+        """
+        return instrument_source(self.call, provider, source)
+
+    def instrument_service(self, service: t.Type[t.Any]) -> t.Type[t.Any]:
+        """This makes every request to a service measured.
+
+        Args:
+            service: The service, whose exposed methods (and properties) are replaced with measured ones.
+
+        Returns:
+            The service.
+        """
+        return instrument_service(self.call, service)
+
+    def snapshot(self) -> t.Dict[str, t.Any]:
+        """This takes a snapshot of the metrics.
+
+        Returns:
+            The requests by method, and the source calls by provider and call.
+        """
+        with self._lock:
+            series = [
+                (kind, labels, value.to_dict())
+                for (kind, labels), value in sorted(self._series.items())
+            ]
+
+        snapshot: t.Dict[str, t.Any] = {"rpc": {}, "source": {}}
+        for kind, labels, data in series:
+            if kind == "rpc":
+                snapshot["rpc"][labels[0]] = data
+            else:
+                snapshot["source"].setdefault(labels[0], {})[labels[1]] = data
+
+        return snapshot
+
+    def prometheus(self) -> str:
+        """This renders the metrics in the Prometheus text format.
+
+        Returns:
+            The metrics.
+        """
+        with self._lock:
+            series = sorted(
+                (kind, labels, attr.evolve(value, buckets=list(value.buckets)))
+                for (kind, labels), value in self._series.items()
+            )
+
+        lines = []
+        for kind, (what, returned, label) in _HELP.items():
+            mine = [item for item in series if item[0] == kind]
+            prefix = f"single_{kind}"
+            lines += [
+                f"# HELP {prefix}_duration_seconds How long each {what} took.",
+                f"# TYPE {prefix}_duration_seconds histogram",
+            ]
+            for _, labels, value in mine:
+                names = _labels(kind, labels, label)
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float("inf"),), value.buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(
+                        f'{prefix}_duration_seconds_bucket{{{names},le="{le}"}} {cumulative}'
+                    )
+                lines.append(
+                    f"{prefix}_duration_seconds_sum{{{names}}} {value.total!r}"
+                )
+                lines.append(
+                    f"{prefix}_duration_seconds_count{{{names}}} {value.count}"
+                )
+
+            for metric, type_, help_, field in (
+                (
+                    "in_flight",
+                    "gauge",
+                    f"The amount of each {what} running.",
+                    "in_flight",
+                ),
+                (
+                    "errors_total",
+                    "counter",
+                    f"The amount of each {what} which failed.",
+                    "errors",
+                ),
+                (
+                    "returned_total",
+                    "counter",
+                    f"The {returned} each {what}.",
+                    "returned",
+                ),
+            ):
+                lines += [
+                    f"# HELP {prefix}_{metric} {help_}",
+                    f"# TYPE {prefix}_{metric} {type_}",
+                ]
+                lines += [
+                    f"{prefix}_{metric}{{{_labels(kind, labels, label)}}} {getattr(value, field)}"
+                    for _, labels, value in mine
+                ]
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(kind: str, labels: t.Tuple[str, ...], label: str) -> str:
+    names = [label] if kind == "rpc" else ["provider", label]
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, labels))
+
+
+def write_prometheus(metrics: Metrics, path: Path) -> None:
+    """This writes the metrics to a file in the Prometheus text format, replacing the file at once so that it's never
+    read half written.
+
+    Args:
+        metrics: The metrics.
+        path: The path of the file.
+
+    Returns:
+        Nothing.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_text(metrics.prometheus())
+    temporary.replace(path)
+
+
+def export_to_file(
+    metrics: Metrics, path: Path, interval: float = DEFAULT_EXPORT_INTERVAL
+) -> threading.Thread:
+    """This exports the metrics to a file in the Prometheus text format every once in a while, in the background.
+
+    Args:
+        metrics: The metrics.
+        path: The path of the file.
+        interval: The amount of seconds between exports.
+
+    Returns:
+        The thread doing the exports.
+    """
+
+    def export() -> None:
+        while True:
+            try:
+                write_prometheus(metrics, path)
+            except OSError as error:
+                logger.warning(f"Couldn't export the metrics to '{path}': {error}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=export, name="metrics-export", daemon=True)
+    thread.start()
+    return thread
+
+
+class _MetricsServer(ThreadingMixIn, HTTPServer):
+    # http.server only has a threading server from python 3.7 on.
+    daemon_threads = True
+
+
+def serve(metrics: Metrics, port: int, hostname: str = "127.0.0.1") -> HTTPServer:
+    """This serves the metrics in the Prometheus text format over HTTP, in the background.
+
+    Args:
+        metrics: The metrics.
+        port: The port to serve the metrics on, or 0 for any free port.
+        hostname: The hostname to serve the metrics on. By default only local clients can read them.
+
+    Returns:
+        The HTTP server, which can be shut down.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: t.Any) -> None:
+            logger.trace(f"Metrics endpoint: {format % args}")
+
+    server = _MetricsServer((hostname, port), Handler)
+    threading.Thread(
+        target=server.serve_forever, name="metrics-endpoint", daemon=True
+    ).start()
+    return server
@@ -0,0 +1,252 @@
+"""This is the install planner, which orders packages so that every package is installed after its dependencies, even
+when they come from different providers, and installs as many of them at the same time as it can."""
+from single import Package, Source
+from single.context import Context, VoidContext
+from single.server.search import FoundPackage
+from concurrent import futures
+import typing as t
+import attr
+
+# a package in a plan, which is the name of its provider and the name of the package.
+Key = t.Tuple[str, str]
+# the default amount of batches of a single provider installed at the same time. most backends hold a lock for the
+# whole transaction, so doing more than one at a time would only make them wait for each other.
+DEFAULT_PROVIDER_LIMIT = 1
+
+
+class PlanError(Exception):
+    """This is an error found while planning an install."""
+
+
+class PackageNotFoundError(PlanError):
+    """This is raised when a requested package, or one of its dependencies, isn't provided by any provider."""
+
+
+class DependencyCycleError(PlanError):
+    """This is raised when packages depend on each other, so there's no order to install them in.
+
+    Args:
+        cycle: The packages in the cycle, with the first package repeated at the end.
+    """
+
+    def __init__(self, cycle: t.List[Key]) -> None:
+        super().__init__(
+            "the packages depend on each other: "
+            + " -> ".join(f"{provider}:{name}" for provider, name in cycle)
+        )
+        self.cycle = cycle
+
+
+def parse_dependency(dependency: str) -> t.Tuple[t.Optional[str], str]:
+    """This splits a dependency into the provider it's restricted to (if any) and the name of the package.
+
+    Args:
+        dependency: The dependency, such as `requests` or `pip:requests`.
+
+    Returns:
+        The name of the provider, or None if any provider may provide it, and the name of the package.
+    """
+    provider, separator, name = dependency.partition(":")
+    if not separator:
+        return None, dependency
+
+    return provider, name
+
+
+@attr.s(auto_attribs=True)
+class InstallPlan:
+    """This is a plan for installing packages, in levels which are installed one after another. The packages of a
+    level only depend on the packages of earlier levels, so they can be installed at the same time.
+
+    Args:
+        packages: Every package in the plan.
+        dependencies: The dependencies of every package in the plan.
+        levels: The levels of the plan.
+    """
+
+    packages: t.Dict[Key, FoundPackage]
+    dependencies: t.Dict[Key, t.List[Key]]
+    levels: t.List[t.List[Key]]
+
+
+@attr.s(auto_attribs=True)
+class PlanResult:
+    """This is what happened when a plan was carried out.
+
+    Args:
+        installed: The packages which were installed.
+        failed: The packages which couldn't be installed, with the error.
+        skipped: The packages which weren't installed because a dependency of theirs couldn't be installed.
+    """
+
+    installed: t.List[Key] = attr.ib(factory=list)
+    failed: t.Dict[Key, Exception] = attr.ib(factory=dict)
+    skipped: t.List[Key] = attr.ib(factory=list)
+
+
+def _key(found: FoundPackage) -> Key:
+    return found[0], found[1].name
+
+
+def _find_cycle(
+    dependencies: t.Dict[Key, t.List[Key]], nodes: t.Set[Key]
+) -> t.List[Key]:
+    # every node left over once the levels are built is either in a cycle or depends on one, so walking down the
+    # dependencies from any of them is bound to run into a cycle.
+    path: t.List[Key] = []
+    seen: t.Dict[Key, int] = {}
+    node = min(nodes)
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = min(
+            dependency for dependency in dependencies[node] if dependency in nodes
+        )
+
+    return path[seen[node] :] + [node]
+
+
+def plan_install(
+    requested: t.List[FoundPackage],
+    resolve: t.Callable[[t.Optional[str], str], t.Optional[FoundPackage]],
+) -> InstallPlan:
+    """This plans installing packages together with all of their dependencies.
+
+    Args:
+        requested: The packages to install, each with the name of its provider.
+        resolve: A function which finds a package given the provider it's restricted to (or None) and its name, or
+                 None if no provider provides it.
+
+    Raises:
+        PackageNotFoundError: If a dependency isn't provided by any provider.
+        DependencyCycleError: If packages depend on each other.
+
+    Returns:
+        The plan.
+    """
+    packages: t.Dict[Key, FoundPackage] = {}
+    dependencies: t.Dict[Key, t.List[Key]] = {}
+    queue = list(requested)
+    while queue:
+        found = queue.pop(0)
+        key = _key(found)
+        if key in packages:
+            continue
+
+        packages[key] = found
+        dependencies[key] = []
+        source: Source = found[1].original_source
+        for dependency in source.dependencies(found[1]):
+            resolved = resolve(*parse_dependency(dependency))
+            if resolved is None:
+                raise PackageNotFoundError(
+                    f"the package '{dependency}' (needed by '{key[0]}:{key[1]}') wasn't found in any provider"
+                )
+
+            dependencies[key].append(_key(resolved))
+            queue.append(resolved)
+
+    # the levels are built by repeatedly taking every package whose dependencies are all in earlier levels.
+    levels: t.List[t.List[Key]] = []
+    placed: t.Set[Key] = set()
+    remaining = set(packages)
+    while remaining:
+        level = sorted(
+            key
+            for key in remaining
+            if all(dependency in placed for dependency in dependencies[key])
+        )
+        if not level:
+            raise DependencyCycleError(_find_cycle(dependencies, remaining))
+
+        levels.append(level)
+        placed.update(level)
+        remaining.difference_update(level)
+
+    return InstallPlan(packages, dependencies, levels)
+
+
+def _chunks(items: t.List[Key], count: int) -> t.List[t.List[Key]]:
+    count = max(1, min(count, len(items)))
+    return [items[index::count] for index in range(count)]
+
+
+def execute_plan(
+    plan: InstallPlan,
+    context: Context = VoidContext(),
+    provider_limits: t.Optional[t.Dict[str, int]] = None,
+    max_workers: int = 8,
+    checkpoint: t.Optional[t.Callable[[], None]] = None,
+    result: t.Optional[PlanResult] = None,
+) -> PlanResult:
+    """This carries out an install plan level by level.
+
+    In every level the packages of each provider are installed in as few calls as the provider's limit allows, and
+    every provider is installed from at the same time. A package whose dependency couldn't be installed is skipped,
+    but every package which doesn't depend on a failed package is still installed.
+
+    Args:
+        plan: The plan.
+        context: The context to report failures to.
+        provider_limits: The amount of batches installed at the same time from a provider, by the provider's name.
+                         Providers which aren't in here get one batch at a time.
+        max_workers: The maximum amount of batches installed at the same time.
+        checkpoint: A function called before every level, which may raise to stop the plan between levels.
+        result: The result to fill in as the plan is carried out, so that what was done is known even if the plan is
+                stopped. By default a new one is made.
+
+    Returns:
+        What happened.
+    """
+    provider_limits = provider_limits or {}
+    result = result if result is not None else PlanResult()
+    broken: t.Set[Key] = set()
+
+    with futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for level in plan.levels:
+            if checkpoint is not None:
+                checkpoint()
+
+            by_provider: t.Dict[str, t.List[Key]] = {}
+            for key in level:
+                if any(dependency in broken for dependency in plan.dependencies[key]):
+                    context.warn(
+                        f"Skipping the package '{key[1]}' from '{key[0]}', since a dependency of it couldn't be "
+                        f"installed"
+                    )
+                    result.skipped.append(key)
+                    broken.add(key)
+                    continue
+
+                by_provider.setdefault(key[0], []).append(key)
+
+            batches = {
+                executor.submit(
+                    _install_batch, [plan.packages[key][1] for key in batch]
+                ): batch
+                for provider, keys in by_provider.items()
+                for batch in _chunks(
+                    keys, provider_limits.get(provider, DEFAULT_PROVIDER_LIMIT)
+                )
+            }
+
+            for future in futures.as_completed(batches):
+                batch = batches[future]
+                error = future.exception()
+                if error is None:
+                    result.installed.extend(batch)
+                    continue
+
+                context.error(
+                    f"Couldn't install {', '.join(name for _, name in batch)} from '{batch[0][0]}': {error}"
+                )
+                for key in batch:
+                    result.failed[key] = error  # type: ignore
+                broken.update(batch)
+
+    return result
+
+
+def _install_batch(packages: t.List[Package]) -> None:
+    # a batch only ever has packages from a single provider, so they all share the same source.
+    packages[0].original_source.install_package(*packages)
@@ -0,0 +1,291 @@
+"""This is the profiler of the server, which finds out where the time of requests and of calls made to sources goes.
+
+Profiling is off until it's started (by `singles start --profile` or the `profile` request), and then profiles a share
+of the requests and source calls, every one of them on its own; every method of the service, and every call of every
+provider, gets its own profile. There are two modes:
+
+- `cprofile` runs the call under cProfile, which sees every function call. The profiles are written as pstats files,
+  which can be read with `python -m pstats` or rendered as flamegraphs by tools such as snakeviz or flameprof.
+- `sampling` looks at the stacks of the threads running the calls every once in a while, which costs next to nothing
+  when it's done rarely enough. The profiles are written as collapsed stacks, which can be rendered as flamegraphs by
+  flamegraph.pl, inferno or speedscope.
+"""
+from single import Source
+from single.server import metrics
+from collections import Counter
+from loguru import logger
+from pathlib import Path
+from types import FrameType
+import typing as t
+import threading
+import cProfile
+import pstats
+import random
+import attr
+import time
+import sys
+import re
+
+MODES = ("cprofile", "sampling")
+# the default amount of seconds between two samples, in the sampling mode.
+DEFAULT_INTERVAL = 0.005
+# what the name of a profile file can't have.
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+def _collapse(frame: t.Optional[FrameType]) -> str:
+    """This collapses a stack into a single line, from the outermost frame to the innermost one.
+
+    Args:
+        frame: The innermost frame.
+
+    Returns:
+        The frames of the stack, separated by semicolons.
+    """
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+
+    return ";".join(reversed(frames))
+
+
+def profile_name(key: t.Tuple[str, ...], suffix: str) -> str:
+    """This gets the name of the file a profile is written to.
+
+    Args:
+        key: What was profiled; `rpc` and the name of the method, or `source`, the name of the provider and the call.
+        suffix: The suffix of the file.
+
+    Returns:
+        The name of the file.
+    """
+    return "-".join(_UNSAFE.sub("_", part) for part in key) + suffix
+
+
+@attr.s(auto_attribs=True)
+class Profiler:
+    """This is where the profiles of the server are kept.
+
+    Args:
+        directory: The directory the profiles are written to.
+    """
+
+    directory: Path
+    enabled: bool = attr.ib(default=False, init=False)
+    mode: str = attr.ib(default="cprofile", init=False)
+    rate: float = attr.ib(default=1.0, init=False)
+    interval: float = attr.ib(default=DEFAULT_INTERVAL, init=False)
+    _stats: t.Dict[t.Tuple[str, ...], pstats.Stats] = attr.ib(
+        factory=dict, init=False, repr=False
+    )
+    _stacks: t.Dict[t.Tuple[str, ...], t.Counter[str]] = attr.ib(
+        factory=dict, init=False, repr=False
+    )
+    # what every thread is running which is being sampled, by the id of the thread; calls may be nested.
+    _running: t.Dict[int, t.List[t.Tuple[str, ...]]] = attr.ib(
+        factory=dict, init=False, repr=False
+    )
+    _local: threading.local = attr.ib(factory=threading.local, init=False, repr=False)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, init=False, repr=False)
+    _sampler: t.Optional[threading.Thread] = attr.ib(
+        default=None, init=False, repr=False
+    )
+    _random: random.Random = attr.ib(factory=random.Random, init=False, repr=False)
+
+    def start(
+        self,
+        mode: str = "cprofile",
+        rate: float = 1.0,
+        interval: float = DEFAULT_INTERVAL,
+    ) -> None:
+        """This starts profiling, writing the profiles taken so far first if it was already on.
+
+        Args:
+            mode: Either `cprofile` or `sampling`.
+            rate: The share of the requests and source calls which are profiled, from 0 to 1.
+            interval: The amount of seconds between two samples, in the sampling mode.
+
+        Raises:
+            ValueError: If the mode doesn't exist, or the rate or the interval are out of range.
+
+        Returns:
+            Nothing.
+        """
+        if mode not in MODES:
+            raise ValueError(
+                f"the profiling mode '{mode}' doesn't exist, use one of {', '.join(MODES)}"
+            )
+        if not 0 < rate <= 1:
+            raise ValueError("the profiling rate has to be above 0 and at most 1")
+        if interval <= 0:
+            raise ValueError("the sampling interval has to be above 0")
+
+        self.stop()
+        with self._lock:
+            self._stats.clear()
+            self._stacks.clear()
+            self.mode, self.rate, self.interval = mode, rate, interval
+            self.enabled = True
+
+        if mode == "sampling":
+            self._sampler = threading.Thread(
+                target=self._sample, name="profiler", daemon=True
+            )
+            self._sampler.start()
+
+        logger.info(
+            f"Profiling {rate:.0%} of the requests and source calls using {mode}"
+        )
+
+    def stop(self) -> t.List[Path]:
+        """This stops profiling and writes the profiles taken.
+
+        Returns:
+            The paths of the profiles written.
+        """
+        if not self.enabled:
+            return []
+
+        self.enabled = False
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+        paths = self.dump()
+        logger.info(f"Wrote {len(paths)} profile(s) to '{self.directory}'")
+        return paths
+
+    def dump(self) -> t.List[Path]:
+        """This writes the profiles taken so far, replacing the ones written before.
+
+        Returns:
+            The paths of the profiles written.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        with self._lock:
+            for key, stats in self._stats.items():
+                path = self.directory / profile_name(key, ".pstats")
+                stats.dump_stats(path)
+                paths.append(path)
+            for key, stacks in self._stacks.items():
+                path = self.directory / profile_name(key, ".collapsed")
+                path.write_text(
+                    "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+                )
+                paths.append(path)
+
+        return sorted(paths)
+
+    def call(
+        self,
+        kind: str,
+        labels: t.Tuple[str, ...],
+        function: t.Callable[..., t.Any],
+        *args: t.Any,
+        **kwargs: t.Any,
+    ) -> t.Any:
+        """This calls a function, profiling the call if profiling is on and the call is picked.
+
+        Args:
+            kind: Either `rpc` or `source`.
+            labels: What the call is; the name of the method for requests, and the name of the provider and the call
+                    for sources.
+            function: The function.
+            *args: The arguments of the function.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            What the function gave back.
+        """
+        if not self.enabled or self._random.random() >= self.rate:
+            return function(*args, **kwargs)
+
+        key = (kind, *labels)
+        if self.mode == "sampling":
+            return self._call_sampled(key, function, *args, **kwargs)
+
+        # a thread runs under a single cProfile profile at a time, so the calls a profiled call makes from the same
+        # thread are part of its profile instead of getting their own.
+        if getattr(self._local, "profiling", False):
+            return function(*args, **kwargs)
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # some other profiler is running, which newer pythons only allow one of at a time.
+            return function(*args, **kwargs)
+
+        self._local.profiling = True
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profile.disable()
+            self._local.profiling = False
+            with self._lock:
+                if key in self._stats:
+                    self._stats[key].add(profile)
+                else:
+                    self._stats[key] = pstats.Stats(profile)
+
+    def _call_sampled(
+        self,
+        key: t.Tuple[str, ...],
+        function: t.Callable[..., t.Any],
+        *args: t.Any,
+        **kwargs: t.Any,
+    ) -> t.Any:
+        thread = threading.get_ident()
+        with self._lock:
+            self._running.setdefault(thread, []).append(key)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            with self._lock:
+                running = self._running[thread]
+                running.pop()
+                if not running:
+                    del self._running[thread]
+
+    def _sample(self) -> None:
+        """This takes samples of the stacks of the threads running profiled calls until profiling stops.
+
+        Returns:
+            Nothing.
+        """
+        while self.enabled:
+            frames = sys._current_frames()
+            with self._lock:
+                for thread, keys in self._running.items():
+                    stack = _collapse(frames.get(thread))
+                    # a sample of a nested call is part of the profiles of the calls it's nested in too.
+                    for key in set(keys):
+                        self._stacks.setdefault(key, Counter())[stack] += 1
+            del frames
+            time.sleep(self.interval)
+
+    def instrument_source(self, provider: str, source: Source) -> Source:
+        """This makes every call to a source profiled when profiling is on.
+
+        Args:
+            provider: The name of the provider of the source.
+            source: The source, whose methods are replaced with profiled ones.
+
+        Returns:
+            The source.
+        """
+        return metrics.instrument_source(self.call, provider, source)
+
+    def instrument_service(self, service: t.Type[t.Any]) -> t.Type[t.Any]:
+        """This makes every request to a service profiled when profiling is on.
+
+        Args:
+            service: The service, whose exposed methods (and properties) are replaced with profiled ones.
+
+        Returns:
+            The service.
+        """
+        return metrics.instrument_service(self.call, service)
@@ -1,12 +1,28 @@
 import typing as t
+from concurrent import futures
 from pathlib import Path
 from loguru import logger
-from single.constants import PROVIDERS_DIRS
+from single.constants import (
+    PROVIDERS_DIRS,
+    PROVIDER_MANIFEST_PATH,
+    SUPPORT_CACHE_PATH,
+)
 from single import utils
 from single.core import ProviderMetadata
 from single.exceptions import UnsupportedSystemError
-from single.context import Context, ServerContext
-from single.server.providers.processing import preprocess_provider, postprocess_provider
+from single.context import Context, ServerContext, BufferedContext
+from single.server.providers.processing import (
+    read_provider,
+    check_provider,
+    preprocess_provider_failed,
+)
+from single.server.providers.errors import postprocess_provider_error
+from single.server.providers.manifest import ProviderManifest
+from single.server.providers.support import SupportCache
+import attr
+
+# providers are mostly waiting on the disk and on subprocesses while they load, so more threads than cpus is fine.
+DEFAULT_MAX_WORKERS = 16
 
 
 def load_providers(
@@ -23,22 +39,31 @@ def load_providers(
     """
     logger.info("Loading the providers....")
 
-    providers, errors = get_providers()
-    provider_list.extend(providers)
+    manifest = ProviderManifest.load(PROVIDER_MANIFEST_PATH)
+    verdicts = SupportCache.load(SUPPORT_CACHE_PATH)
+    providers, errors = get_providers(manifest=manifest, verdicts=verdicts)
+    manifest.save()
+    verdicts.save()
+    # the lists are replaced in place rather than extended, so loading twice doesn't leave duplicates behind.
+    provider_list[:] = providers
     logger.trace(
         f"Provider list after merge with providers from get_providers(): {provider_list}"
     )
-    errors_list.extend(errors)
+    errors_list[:] = errors
     logger.trace(
         f"Error list after merge with errors from get_providers(): {errors_list}"
     )
 
 
-def find_providers(dirs: t.List[Path] = None) -> t.List[Path]:
+def find_providers(
+    dirs: t.List[Path] = None, manifest: t.Optional[ProviderManifest] = None
+) -> t.List[Path]:
     """This finds providers from directories.
 
     Args:
         dirs: The directories.
+        manifest: The provider manifest to take unchanged directory listings from. By default every directory is
+                  listed.
 
     Returns:
         A list of paths which could be providers.
@@ -48,27 +73,174 @@ def find_providers(dirs: t.List[Path] = None) -> t.List[Path]:
     dirs = dirs or PROVIDERS_DIRS
     logger.trace(f"Directories after processing: {dirs}")
     logger.debug(f"Directories chosen: {utils.prettify_list(dirs)}")
+    if manifest is not None:
+        return manifest.find(dirs)
+
     logger.trace(f"Entering for loop to check whether or not directories exist")
+    existing_dirs: t.List[Path] = []
     for dir_ in dirs:
         logger.trace(f"Current directory: {dir_}")
         if not dir_.exists():
             logger.debug(f"Directory {dir_} doesn't exist, continuing.")
-            dirs.remove(dir_)
-    dirs_iterdir = [dir_.iterdir() for dir_ in dirs]
+            continue
+        existing_dirs.append(dir_)
+    dirs_iterdir = [dir_.iterdir() for dir_ in existing_dirs]
     logger.trace(f"All accepted directories after exist check: {dirs_iterdir}")
     all_paths = utils.flatten_list(dirs_iterdir)
     logger.trace(f"Flattened accepted directories: {all_paths}")
-    return [path for path in all_paths if path.is_dir()]
+    return sorted(path for path in all_paths if path.is_dir())
+
+
+@attr.s(auto_attribs=True)
+class ProviderLoad:
+    """This is the outcome of loading a single provider on a worker thread, which is yet to be reported.
+
+    Args:
+        provider_dir: The provider directory.
+        provider: The provider metadata, or the error found while pre-processing.
+        unsupported: The error found while checking the provider's source, if any.
+        messages: The messages the provider's source gave while it was checked and greeted.
+    """
+
+    provider_dir: Path
+    provider: t.Union[ProviderMetadata, Exception]
+    unsupported: t.Optional[UnsupportedSystemError] = None
+    messages: BufferedContext = attr.ib(factory=BufferedContext)
+
+
+def _load(
+    provider_dir: Path,
+    manifest: t.Optional[ProviderManifest],
+    lazy: bool,
+    verdicts: t.Optional[SupportCache],
+) -> ProviderLoad:
+    # this runs on a worker thread, so nothing is reported here; see _report.
+    try:
+        provider = read_provider(provider_dir, manifest, lazy)
+    except Exception as error:
+        return ProviderLoad(provider_dir, error)
+
+    load = ProviderLoad(provider_dir, provider)
+    if lazy:
+        return load
+
+    try:
+        source = check_provider(provider, load.messages, verdicts)
+        source.greet()
+    except UnsupportedSystemError as error:
+        load.unsupported = error
+    except Exception as error:
+        load.provider = error
+
+    return load
+
+
+def _report(
+    load: ProviderLoad, context: Context, lazy: bool
+) -> t.Union[ProviderMetadata, Exception]:
+    logger.trace(f"Current provider: {load.provider_dir}")
+    logger.debug(f"Pre-processing provider (path is '{load.provider_dir}')")
+    provider = load.provider
+    logger.trace(f"Pre-processed provider: {provider}")
+    if isinstance(provider, Exception):
+        return preprocess_provider_failed(provider, load.provider_dir)
+    if lazy:
+        logger.success(f"Loaded provider '{provider.name}' (deferred)")
+        return provider
+
+    logger.debug(f"Post-processing provider '{provider.name}'")
+    if load.unsupported is not None:
+        load.messages.replay(context)
+        return postprocess_provider_error(provider, load.unsupported)
+
+    logger.debug("Now greeting server")
+    load.messages.replay(context)
+    logger.success(f"Loaded provider '{provider.name}'")
+    return provider
+
+
+def load_many(
+    provider_dirs: t.List[Path],
+    context: Context,
+    manifest: t.Optional[ProviderManifest] = None,
+    lazy: bool = False,
+    verdicts: t.Optional[SupportCache] = None,
+    max_workers: t.Optional[int] = None,
+) -> t.List[t.Union[ProviderMetadata, Exception]]:
+    """This loads providers by bringing them through the pre-processing and the post-processing phase.
+
+    Every provider is loaded on a worker pool, since executing provider modules and checking sources may take a
+    while. What each provider did is only reported once it's done, in the same order the providers were given, so
+    the logs and the errors don't depend on which provider happened to finish first.
+
+    Args:
+        provider_dirs: The provider directories.
+        context: The context to give to the providers' sources.
+        manifest: The provider manifest to use. By default nothing is cached.
+        lazy: Whether or not to defer executing the providers' modules and the post-processing phase until the
+              providers are first used.
+        verdicts: The support cache to use. By default every source is probed.
+        max_workers: The maximum amount of providers to load at the same time.
+
+    Returns:
+        For every provider, its provider metadata if the provider is fit to be used, else the error that was found.
+    """
+    if not provider_dirs:
+        return []
+
+    with futures.ThreadPoolExecutor(
+        max_workers=min(max_workers or DEFAULT_MAX_WORKERS, len(provider_dirs))
+    ) as executor:
+        loads = list(
+            executor.map(
+                lambda provider_dir: _load(provider_dir, manifest, lazy, verdicts),
+                provider_dirs,
+            )
+        )
+
+    return [_report(load, context, lazy) for load in loads]
+
+
+def load_provider(
+    provider_dir: Path,
+    context: Context,
+    manifest: t.Optional[ProviderManifest] = None,
+    lazy: bool = False,
+    verdicts: t.Optional[SupportCache] = None,
+) -> t.Union[ProviderMetadata, Exception]:
+    """This loads a single provider by bringing it through the pre-processing and the post-processing phase.
+
+    Args:
+        provider_dir: The provider directory.
+        context: The context to give to the provider's source.
+        manifest: The provider manifest to use. By default nothing is cached.
+        lazy: Whether or not to defer executing the provider's module and the post-processing phase until the
+              provider is first used.
+        verdicts: The support cache to use. By default the source is probed.
+
+    Returns:
+        The provider metadata if the provider is fit to be used, else the error that was found.
+    """
+    return _report(_load(provider_dir, manifest, lazy, verdicts), context, lazy)
 
 
 def get_providers(
     dirs: t.List[Path] = None,
+    manifest: t.Optional[ProviderManifest] = None,
+    lazy: bool = False,
+    verdicts: t.Optional[SupportCache] = None,
+    max_workers: t.Optional[int] = None,
 ) -> t.Tuple[t.List[ProviderMetadata], t.List[Exception]]:
     """This gets all providers from a provider directory (or optionally specified) and put them in a
     series of few tests to determine whether they're fit to be added to a provider list or not.
 
     Args:
         dirs: The provider directories.
+        manifest: The provider manifest to use. By default nothing is cached.
+        lazy: Whether or not to defer executing the providers' modules and the post-processing phase until the
+              providers are first used.
+        verdicts: The support cache to use. By default every source is probed.
+        max_workers: The maximum amount of providers to load at the same time.
 
     Returns:
         A list of provider metadata and a list of all exceptions gathered.
@@ -76,7 +248,7 @@ def get_providers(
     logger.trace(f"get_providers(dirs={dirs})")
     dirs = dirs or PROVIDERS_DIRS
     logger.trace(f"Directories after processing: {dirs}")
-    possible_providers = find_providers(dirs)
+    possible_providers = find_providers(dirs, manifest)
     logger.trace(f"Possible providers: {possible_providers}")
     provider_metadata: t.List[ProviderMetadata] = []
     errors: t.List[Exception] = []
@@ -85,22 +257,15 @@ def get_providers(
     logger.trace(
         "Now iterating through all providers to see if each are fit to be used"
     )
-    for provider in possible_providers:
-        logger.trace(f"Current provider: {provider}")
-        preprocessed_provider = preprocess_provider(provider)
-        logger.trace(f"Pre-processed provider: {preprocessed_provider}")
-        if isinstance(preprocessed_provider, Exception):
-            errors.append(preprocessed_provider)
-            continue
-
-        try:
-            postprocess_provider(preprocessed_provider, context)
-        except UnsupportedSystemError as error:
-            errors.append(error)
+    loaded_providers = load_many(
+        possible_providers, context, manifest, lazy, verdicts, max_workers
+    )
+    for loaded_provider in loaded_providers:
+        if isinstance(loaded_provider, Exception):
+            errors.append(loaded_provider)
             continue
 
-        logger.success(f"Loaded provider '{preprocessed_provider.name}'")
-        provider_metadata.append(preprocessed_provider)
+        provider_metadata.append(loaded_provider)
 
     logger.trace(
         f"After for loop: provider_metadata={provider_metadata}, errors={errors}"
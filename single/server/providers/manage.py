@@ -1,11 +1,19 @@
 from single import Source, Package, System, __version__ as single_version
+from concurrent import futures
+from types import MappingProxyType
 import attr
+import time
 import typing as t
 
 
-@attr.s(auto_attribs=True, frozen=True)
+# what a single package has on top of a regular package by default. it can't be changed, since it's shared by every
+# single package which wasn't given anything else.
+NO_OTHER: t.Mapping[str, t.Any] = MappingProxyType({})
+
+
+@attr.s(auto_attribs=True, frozen=True, slots=True)
 class SinglePackage(Package):
-    other: t.Dict[str, t.Any] = {}
+    other: t.Mapping[str, t.Any] = NO_OTHER
 
 
 @attr.s(auto_attribs=True)
@@ -15,6 +23,12 @@ class SingleSource(Source):
     # default argument for sources and if the user doesn't give out any sources just raise an exception saying
     # you need to fill the sources out. i know, it's a hack.
     sources: t.List[Source] = []
+    # searches are fanned out to every source at once, but never on more than this many threads.
+    max_workers: int = 8
+    # the amount of seconds a source gets to answer a search before its results are left out.
+    timeout: float = 10.0
+    # per source class overrides of the timeout above, for backends that are known to be slow (or fast).
+    timeouts: t.Dict[t.Type[Source], float] = attr.ib(factory=dict)
 
     def _package_to_single_package(self, package: Package) -> SinglePackage:
         """This converts a regular package from any other provider to one that can be usable.
@@ -25,8 +39,16 @@ class SingleSource(Source):
         Returns:
             The converted package.
         """
+        return SinglePackage(
+            package.name,
+            package.version,
+            package.description,
+            package.install_size,
+            package.download_size,
+            package.original_source,
+        )
 
-    def _packages_to_single_packages(self, packages: Package) -> t.List[SinglePackage]:
+    def _packages_to_single_packages(self, *packages: Package) -> t.List[SinglePackage]:
         """Iterable version of self._package_to_single_package.
 
         Args:
@@ -35,6 +57,34 @@ class SingleSource(Source):
         Returns:
             The converted packages.
         """
+        return [self._package_to_single_package(package) for package in packages]
+
+    def _timeout_for(self, source: Source) -> float:
+        """This gets the amount of seconds a source has to answer a search.
+
+        Args:
+            source: The source.
+
+        Returns:
+            The timeout of the source.
+        """
+        return self.timeouts.get(type(source), self.timeout)
+
+    def _search_source(
+        self, source: Source, started: t.Dict[int, float], *names: str
+    ) -> t.List[SinglePackage]:
+        """This searches a single source, noting down when the search actually started.
+
+        Args:
+            source: The source to search from.
+            started: Where the starting time of the search gets stored, keyed by the id of the source.
+            *names: The names of the packages.
+
+        Returns:
+            The converted packages found by the source.
+        """
+        started[id(source)] = time.monotonic()
+        return self._packages_to_single_packages(*source.package(*names))
 
     @property
     def os_supported(self) -> t.List[System]:
@@ -47,31 +97,133 @@ class SingleSource(Source):
     def supported(self) -> None:
         super().supported()
 
-    def package(self, name: str) -> t.List[SinglePackage]:  # type: ignore
-        packages: t.List[SinglePackage] = []
-
-        for source in self.sources:
-            converted_packages = self._packages_to_single_packages(
-                *source.package(name)
-            )
-            packages.extend(converted_packages)
+    def package(self, *names: str) -> t.List[SinglePackage]:  # type: ignore
+        # every source is searched at the same time, and each one gets its own deadline which starts ticking once
+        # its search actually starts (a source may have to wait for a free worker first). whatever the late sources
+        # didn't manage to return is simply left out.
+        results: t.Dict[int, t.List[SinglePackage]] = {}
+        started: t.Dict[int, float] = {}
+        executor = futures.ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(self.sources)))
+        )
+        pending = {
+            executor.submit(self._search_source, source, started, *names): source
+            for source in self.sources
+        }
+
+        try:
+            while pending:
+                now = time.monotonic()
+                deadlines = {
+                    future: started.get(id(source), now) + self._timeout_for(source)
+                    for future, source in pending.items()
+                }
+
+                for future, deadline in deadlines.items():
+                    if deadline <= now and not future.done():
+                        source = pending.pop(future)
+                        future.cancel()
+                        self.context.warn(
+                            f"The source '{source.__class__.__name__}' didn't answer within "
+                            f"{self._timeout_for(source)} second(s), leaving its packages out"
+                        )
+
+                if not pending:
+                    break
+
+                next_deadline = min(deadlines[future] for future in pending)
+                done, _ = futures.wait(
+                    list(pending),
+                    timeout=max(0.0, next_deadline - now),
+                    return_when=futures.FIRST_COMPLETED,
+                )
+
+                for future in done:
+                    source = pending.pop(future)
+                    try:
+                        results[id(source)] = future.result()
+                    except Exception as error:
+                        self.context.error(
+                            f"The source '{source.__class__.__name__}' failed to search for packages: {error}"
+                        )
+        finally:
+            executor.shutdown(wait=False)
+
+        # the results are kept in the same order as the sources, not in the order they came in.
+        return [
+            package
+            for source in self.sources
+            for package in results.get(id(source), [])
+        ]
+
+    def _group_by_source(
+        self, *packages: Package
+    ) -> t.List[t.Tuple[Source, t.List[Package]]]:
+        """This groups packages by their original source, keeping the order the sources first show up in.
 
-        return packages
+        Args:
+            *packages: The packages to group.
 
-    def install_package(self, *packages: Package) -> None:
+        Returns:
+            Each source with its packages.
+        """
+        # sources aren't necessarily hashable, so they're grouped by identity instead.
+        groups: t.Dict[int, t.Tuple[Source, t.List[Package]]] = {}
         for package in packages:
             source = package.original_source
-            source.install_package(package)
+            groups.setdefault(id(source), (source, []))[1].append(package)
+
+        return list(groups.values())
+
+    def _batch(self, operation: str, *packages: Package) -> None:
+        """This does an operation on packages with a single call per source, doing the calls of different sources at
+        the same time.
+
+        Args:
+            operation: The name of the operation, which is the name of the source method to call.
+            *packages: The packages to do the operation on.
+
+        Raises:
+            Exception: The first error raised by a source (in the order of the sources), once every source is done.
+
+        Returns:
+            Nothing.
+        """
+        groups = self._group_by_source(*packages)
+        if len(groups) <= 1:
+            for source, batch in groups:
+                getattr(source, operation)(*batch)
+            return
+
+        with futures.ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(groups)))
+        ) as executor:
+            # every source runs its batch to the end, even if another one fails, so that no source is left midway.
+            results = [
+                (source, executor.submit(getattr(source, operation), *batch))
+                for source, batch in groups
+            ]
+
+        errors = []
+        for source, future in results:
+            error = future.exception()
+            if error is not None:
+                self.context.error(
+                    f"The source '{source.__class__.__name__}' failed to do '{operation}': {error}"
+                )
+                errors.append(error)
+
+        if errors:
+            raise errors[0]
+
+    def install_package(self, *packages: Package) -> None:
+        self._batch("install_package", *packages)
 
     def remove_package(self, *packages: Package) -> None:
-        for package in packages:
-            source = package.original_source
-            source.remove_package(package)
+        self._batch("remove_package", *packages)
 
     def update_package(self, *packages: Package) -> None:
-        for package in packages:
-            source = package.original_source
-            source.update_package(package)
+        self._batch("update_package", *packages)
 
     def greet(self) -> None:
         self.context.success(
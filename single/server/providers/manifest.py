@@ -0,0 +1,207 @@
+"""This is the provider manifest, a cache of provider listings and metadata so that unchanged providers don't have to be
+found and parsed again on every start."""
+from pathlib import Path
+from loguru import logger
+import typing as t
+import threading
+import hashlib
+import json
+import attr
+import toml
+
+MANIFEST_VERSION = 1
+PROVIDER_FILES = ("provider.toml", "__init__.py")
+
+
+def fingerprint(provider_path: Path) -> t.List[t.Optional[t.List[int]]]:
+    """This gets a cheap fingerprint of a provider folder, made from the modification times and sizes of the folder and
+    its files.
+
+    Args:
+        provider_path: The provider path.
+
+    Raises:
+        FileNotFoundError: If the provider path doesn't exist.
+
+    Returns:
+        The fingerprint of the provider folder.
+    """
+    stat = provider_path.stat()
+    fingerprint_: t.List[t.Optional[t.List[int]]] = [[stat.st_mtime_ns, stat.st_size]]
+    for file in PROVIDER_FILES:
+        try:
+            stat = (provider_path / file).stat()
+        except FileNotFoundError:
+            fingerprint_.append(None)
+        else:
+            fingerprint_.append([stat.st_mtime_ns, stat.st_size])
+
+    return fingerprint_
+
+
+def content_hash(provider_path: Path) -> str:
+    """This hashes the contents of the files of a provider folder.
+
+    Args:
+        provider_path: The provider path.
+
+    Returns:
+        The hash of the provider folder.
+    """
+    hash_ = hashlib.sha256()
+    for file in PROVIDER_FILES:
+        try:
+            hash_.update((provider_path / file).read_bytes())
+        except FileNotFoundError:
+            pass
+        hash_.update(b"\0")
+
+    return hash_.hexdigest()
+
+
+@attr.s(auto_attribs=True)
+class ProviderManifest:
+    """This is a cache of which providers each provider directory has, and of what each provider's provider.toml says.
+
+    A provider directory is only listed again once its modification time changes, and a provider.toml is only parsed
+    again once the provider's fingerprint changes and its contents don't match the cached hash anymore.
+
+    Args:
+        path: The path of the manifest file, or None if the manifest shouldn't be saved.
+    """
+
+    path: t.Optional[Path] = None
+    _listings: t.Dict[str, t.Dict[str, t.Any]] = attr.ib(factory=dict, repr=False)
+    _entries: t.Dict[str, t.Dict[str, t.Any]] = attr.ib(factory=dict, repr=False)
+    _dirty: bool = attr.ib(default=False, repr=False)
+    _lock: threading.RLock = attr.ib(factory=threading.RLock, init=False, repr=False)
+
+    @classmethod
+    def load(cls, path: Path) -> "ProviderManifest":
+        """This loads a manifest from a file. A missing, unreadable or outdated manifest file gives an empty manifest.
+
+        Args:
+            path: The path of the manifest file.
+
+        Returns:
+            The manifest.
+        """
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError) as error:
+            logger.debug(f"Not using the provider manifest at '{path}': {error}")
+            return cls(path)
+
+        if data.get("version") != MANIFEST_VERSION:
+            logger.debug(f"The provider manifest at '{path}' is outdated, ignoring it")
+            return cls(path)
+
+        return cls(path, data["listings"], data["entries"])
+
+    def save(self) -> None:
+        """This saves the manifest to its file, if anything changed.
+
+        Returns:
+            Nothing.
+        """
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+
+            data = {
+                "version": MANIFEST_VERSION,
+                "listings": self._listings,
+                "entries": self._entries,
+            }
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporary_path = self.path.with_suffix(".tmp")
+                temporary_path.write_text(json.dumps(data))
+                temporary_path.replace(self.path)
+            except OSError as error:
+                logger.warning(f"Couldn't save the provider manifest: {error}")
+                return
+
+            self._dirty = False
+
+    def find(self, dirs: t.List[Path]) -> t.List[Path]:
+        """This finds providers from directories, only listing a directory again if it changed.
+
+        Args:
+            dirs: The directories.
+
+        Returns:
+            A list of paths which could be providers.
+        """
+        paths: t.List[Path] = []
+
+        with self._lock:
+            for dir_ in dirs:
+                try:
+                    mtime = dir_.stat().st_mtime_ns
+                except FileNotFoundError:
+                    logger.debug(f"Directory {dir_} doesn't exist, continuing.")
+                    continue
+
+                listing = self._listings.get(str(dir_))
+                if listing is not None and listing["mtime"] == mtime:
+                    logger.trace(f"Directory {dir_} didn't change, using the manifest")
+                    paths.extend(Path(path) for path in listing["providers"])
+                    continue
+
+                logger.trace(f"Directory {dir_} changed, listing it")
+                providers = sorted(
+                    str(path) for path in dir_.iterdir() if path.is_dir()
+                )
+                self._listings[str(dir_)] = {"mtime": mtime, "providers": providers}
+                for key in list(self._entries):
+                    if Path(key).parent == dir_ and key not in providers:
+                        del self._entries[key]
+                self._dirty = True
+                paths.extend(Path(path) for path in providers)
+
+        return paths
+
+    def metadata(self, provider_path: Path) -> t.Dict[str, t.Any]:
+        """This gets the metadata table of a provider's provider.toml, only parsing it if it changed.
+
+        Args:
+            provider_path: The provider path.
+
+        Raises:
+            FileNotFoundError: If the provider path or its provider.toml doesn't exist.
+            NotADirectoryError: If the provider path isn't a directory.
+
+        Returns:
+            The metadata table.
+        """
+        if not provider_path.is_dir() and provider_path.exists():
+            raise NotADirectoryError(
+                f"provider path '{provider_path}' must be a directory"
+            )
+
+        key = str(provider_path)
+        fingerprint_ = fingerprint(provider_path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["fingerprint"] == fingerprint_:
+                return entry["metadata"]
+
+            hash_ = content_hash(provider_path)
+            if entry is not None and entry["hash"] == hash_:
+                entry["fingerprint"] = fingerprint_
+                self._dirty = True
+                return entry["metadata"]
+
+            metadata = toml.loads((provider_path / "provider.toml").read_text())[
+                "metadata"
+            ]
+            self._entries[key] = {
+                "fingerprint": fingerprint_,
+                "hash": hash_,
+                "metadata": metadata,
+            }
+            self._dirty = True
+
+            return metadata
@@ -1,4 +1,6 @@
 from single.core import ProviderMetadata
+from single.server.providers.manifest import ProviderManifest
+from single.server.providers.support import SupportCache
 from pathlib import Path
 from single.server.providers.errors import (
     preprocess_provider_error,
@@ -7,45 +9,127 @@ from single.server.providers.errors import (
 from loguru import logger
 from toml.decoder import TomlDecodeError
 from single.context import Context
-from single import UnsupportedSystemError
+from single import UnsupportedSystemError, Source
 import typing as t
 
 
-def preprocess_provider(
+def read_provider(
     provider_dir: Path,
-) -> t.Union[ProviderMetadata, Exception]:
-    """This brings the provider to the pre-processing phase.
+    manifest: t.Optional[ProviderManifest] = None,
+    lazy: bool = False,
+) -> ProviderMetadata:
+    """This gets the provider metadata from a provider folder, without reporting anything if it fails.
 
-    The pre processing phase tries to get provider metadata from a provider folder. This phase
-    will fail if an error occurs while trying to get the provider metadata.
+    Args:
+        provider_dir: The provider directory.
+        manifest: The provider manifest to get the provider's metadata from. By default the provider.toml is always
+                  parsed.
+        lazy: Whether or not to defer executing the provider's module until its classes are first used.
+
+    Returns:
+        The provider metadata, or raise whatever went wrong.
+    """
+    if manifest is None:
+        return ProviderMetadata.from_provider(provider_dir, lazy)
+
+    return ProviderMetadata.from_metadata(
+        provider_dir, manifest.metadata(provider_dir), lazy
+    )
+
+
+def preprocess_provider_failed(error: Exception, provider_dir: Path) -> Exception:
+    """This reports an error found during the pre-processing phase.
 
     Args:
+        error: The error.
         provider_dir: The provider directory.
 
     Returns:
-        Provider metadata if nothing go
+        The error.
     """
-    logger.debug(f"Pre-processing provider (path is '{provider_dir}')")
-    try:
-        return ProviderMetadata.from_provider(provider_dir)
-    except FileNotFoundError as error:
+    if isinstance(error, FileNotFoundError):
         preprocess_provider_error(f"A certain file wasn't found: {error}", provider_dir)
-        return error
-    except AttributeError as error:
+    elif isinstance(error, AttributeError):
         preprocess_provider_error(
             f"A source reference or a package reference is missing: {error}",
             provider_dir,
         )
-        return error
-    except TomlDecodeError as error:
+    elif isinstance(error, TomlDecodeError):
         preprocess_provider_error(
             f"The provider configuration couldn't be read properly: {error}",
             provider_dir,
         )
-        return error
+    else:
+        # the provider's module may raise anything when it gets executed, for example while it's still being
+        # written to when reloading.
+        preprocess_provider_error(
+            f"The provider couldn't be loaded: {error.__class__.__name__}: {error}",
+            provider_dir,
+        )
+
+    return error
+
+
+def preprocess_provider(
+    provider_dir: Path,
+    manifest: t.Optional[ProviderManifest] = None,
+    lazy: bool = False,
+) -> t.Union[ProviderMetadata, Exception]:
+    """This brings the provider to the pre-processing phase.
+
+    The pre processing phase tries to get provider metadata from a provider folder. This phase
+    will fail if an error occurs while trying to get the provider metadata.
+
+    Args:
+        provider_dir: The provider directory.
+        manifest: The provider manifest to get the provider's metadata from. By default the provider.toml is always
+                  parsed.
+        lazy: Whether or not to defer executing the provider's module until its classes are first used.
+
+    Returns:
+        Provider metadata if nothing go
+    """
+    logger.debug(f"Pre-processing provider (path is '{provider_dir}')")
+    try:
+        return read_provider(provider_dir, manifest, lazy)
+    except Exception as error:
+        return preprocess_provider_failed(error, provider_dir)
 
 
-def postprocess_provider(provider: ProviderMetadata, context: Context) -> None:
+def check_provider(
+    provider: ProviderMetadata,
+    context: Context,
+    verdicts: t.Optional[SupportCache] = None,
+) -> Source:
+    """This initializes the source of a provider and checks if it supports this system, without reporting anything.
+
+    Args:
+        provider: The provider metadata.
+        context: The context to give to the source.
+        verdicts: The support cache to take verdicts from. By default the source is always probed.
+
+    Raises:
+        UnsupportedSystemError: If the source doesn't support this system.
+
+    Returns:
+        The initialized source.
+    """
+    # noinspection PyArgumentList
+    source_reference = provider.source_reference(context)  # type: ignore
+
+    if verdicts is None:
+        source_reference.supported()
+    else:
+        verdicts.check(provider, source_reference)
+
+    return source_reference
+
+
+def postprocess_provider(
+    provider: ProviderMetadata,
+    context: Context,
+    verdicts: t.Optional[SupportCache] = None,
+) -> Source:
     """This brings a provider to the post-processing phase.
 
     The post-processing phase tests the source reference grabbed from the provider metadata
@@ -55,20 +139,18 @@ def postprocess_provider(provider: ProviderMetadata, context: Context) -> None:
     Args:
         provider: The provider metadata.
         context: The context.
+        verdicts: The support cache to take verdicts from. By default the source is always probed.
 
     Returns:
-        Nothing.
+        The initialized source, which passed the checks.
     """
     logger.debug(f"Post-processing provider '{provider.name}'")
-    # noinspection PyArgumentList
-    source_reference = provider.source_reference(context)  # some bug happened
-
     try:
-        source_reference.supported()
+        source_reference = check_provider(provider, context, verdicts)
     except UnsupportedSystemError as error:
         raise postprocess_provider_error(provider, error)
 
     logger.debug("Now greeting server")
     source_reference.greet()
 
-    return None
+    return source_reference
@@ -0,0 +1,210 @@
+"""This is the incremental provider reloader, which only reloads the providers that were added, changed or removed."""
+from single.core import ProviderMetadata
+from single.context import Context, ServerContext
+from single.exceptions import UnsupportedSystemError
+from single.models import Source
+from single.constants import PROVIDER_MANIFEST_PATH, SUPPORT_CACHE_PATH
+from single.server.providers.core import find_providers, load_many
+from single.server.providers.manifest import ProviderManifest, fingerprint
+from single.server.providers.processing import postprocess_provider
+from single.server.providers.support import SupportCache
+from single.server.providers.errors import preprocess_provider_error
+from single import utils
+from pathlib import Path
+from loguru import logger
+import typing as t
+import threading
+import attr
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class ReloadResult:
+    """This is what changed during a reload.
+
+    Args:
+        added: The paths of the providers that were added.
+        changed: The paths of the providers that were changed.
+        removed: The paths of the providers that were removed.
+        loaded: The providers that were loaded.
+        unloaded: The providers that were unloaded, either because they were changed or removed.
+    """
+
+    added: t.List[Path]
+    changed: t.List[Path]
+    removed: t.List[Path]
+    loaded: t.List[ProviderMetadata]
+    unloaded: t.List[ProviderMetadata]
+
+    @property
+    def empty(self) -> bool:
+        """Whether or not nothing changed.
+
+        Returns:
+            Whether or not nothing changed.
+        """
+        return not (self.added or self.changed or self.removed)
+
+
+@attr.s(auto_attribs=True)
+class ProviderReloader:
+    """This keeps track of which provider was loaded from which path, so that only what changed gets reloaded.
+
+    The provider list and the error list are kept in sync in place, so other references to them (like the ones the
+    server has) always see the current providers and errors, without duplicates or stale errors.
+
+    Args:
+        provider_list: The provider list.
+        errors_list: The error list.
+        dirs: The provider directories. By default these are the usual provider directories.
+        manifest: The provider manifest to use.
+        context: The context to give to the sources of the providers.
+        lazy: Whether or not to defer executing the providers' modules and the post-processing phase until the
+              providers are first used.
+        verdicts: The support cache to use.
+    """
+
+    provider_list: t.List[ProviderMetadata]
+    errors_list: t.List[Exception]
+    dirs: t.Optional[t.List[Path]] = None
+    manifest: ProviderManifest = attr.ib(
+        factory=lambda: ProviderManifest.load(PROVIDER_MANIFEST_PATH)
+    )
+    context: Context = attr.ib(factory=lambda: ServerContext(logger))
+    lazy: bool = False
+    verdicts: SupportCache = attr.ib(
+        factory=lambda: SupportCache.load(SUPPORT_CACHE_PATH)
+    )
+    _fingerprints: t.Dict[Path, t.Any] = attr.ib(factory=dict, init=False, repr=False)
+    _providers: t.Dict[Path, ProviderMetadata] = attr.ib(
+        factory=dict, init=False, repr=False
+    )
+    _errors: t.Dict[Path, Exception] = attr.ib(factory=dict, init=False, repr=False)
+    _lock: threading.RLock = attr.ib(factory=threading.RLock, init=False, repr=False)
+
+    def reload(self, force: bool = False) -> ReloadResult:
+        """This reloads the providers that were added, changed or removed since the last reload.
+
+        Args:
+            force: Whether or not to reload every provider, even the ones which didn't change.
+
+        Returns:
+            What changed during the reload.
+        """
+        with self._lock:
+            fingerprints: t.Dict[Path, t.Any] = {}
+            for path in find_providers(self.dirs, self.manifest):
+                try:
+                    fingerprints[path] = fingerprint(path)
+                except FileNotFoundError:
+                    logger.trace(
+                        f"The provider at '{path}' disappeared while reloading"
+                    )
+
+            added = [path for path in fingerprints if path not in self._fingerprints]
+            removed = [path for path in self._fingerprints if path not in fingerprints]
+            changed = [
+                path
+                for path in fingerprints
+                if path in self._fingerprints
+                and (force or fingerprints[path] != self._fingerprints[path])
+            ]
+            loaded: t.List[ProviderMetadata] = []
+            unloaded: t.List[ProviderMetadata] = []
+
+            for path in removed + changed:
+                self._errors.pop(path, None)
+                provider = self._providers.pop(path, None)
+                if provider is not None:
+                    logger.info(f"Unloading provider '{provider.name}'")
+                    unloaded.append(provider)
+
+            paths = added + changed
+            for path, provider_or_error in zip(
+                paths,
+                load_many(paths, self.context, self.manifest, self.lazy, self.verdicts),
+            ):
+                if isinstance(provider_or_error, Exception):
+                    self._errors[path] = provider_or_error
+                else:
+                    self._providers[path] = provider_or_error
+                    loaded.append(provider_or_error)
+
+            self._fingerprints = fingerprints
+            self.manifest.save()
+            self._sync()
+
+        result = ReloadResult(added, changed, removed, loaded, unloaded)
+        if not result.empty:
+            logger.info(
+                f"{len(added)} provider(s) added, {len(changed)} changed and {len(removed)} removed; "
+                f"{len(self.provider_list)}/{len(fingerprints)} provider(s) loaded"
+            )
+            logger.debug(
+                f"Providers now loaded: {utils.prettify_list([provider.name for provider in self.provider_list])}"
+            )
+
+        return result
+
+    def activate(self, provider: ProviderMetadata) -> t.Optional[Source]:
+        """This initializes the source of a provider once it's first used.
+
+        If the providers are loaded lazily, this is where the provider's module gets executed and where the
+        provider is brought through the post-processing phase. A provider which turns out to be unusable is moved
+        from the provider list to the error list.
+
+        Args:
+            provider: The provider.
+
+        Returns:
+            The initialized source, or None if the provider is unusable.
+        """
+        try:
+            if self.lazy:
+                source = postprocess_provider(provider, self.context, self.verdicts)
+                self.verdicts.save()
+                return source
+
+            # noinspection PyArgumentList
+            return provider.source_reference(self.context)  # type: ignore
+        except UnsupportedSystemError as error:
+            self._discard(provider, error)
+        except Exception as error:
+            path = self._path_of(provider)
+            if path is not None:
+                preprocess_provider_error(
+                    f"The provider couldn't be loaded: {error.__class__.__name__}: {error}",
+                    path,
+                )
+            self._discard(provider, error)
+
+        return None
+
+    def _path_of(self, provider: ProviderMetadata) -> t.Optional[Path]:
+        with self._lock:
+            for path, loaded_provider in self._providers.items():
+                if loaded_provider is provider:
+                    return path
+
+        return None
+
+    def _discard(self, provider: ProviderMetadata, error: Exception) -> None:
+        with self._lock:
+            path = self._path_of(provider)
+            if path is None:
+                return
+
+            logger.info(f"Unloading provider '{provider.name}'")
+            del self._providers[path]
+            self._errors[path] = error
+            self._sync()
+
+    def _sync(self) -> None:
+        # the providers and the errors are ordered the same way the provider directories are.
+        self.provider_list[:] = [
+            self._providers[path]
+            for path in self._fingerprints
+            if path in self._providers
+        ]
+        self.errors_list[:] = [
+            self._errors[path] for path in self._fingerprints if path in self._errors
+        ]
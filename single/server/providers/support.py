@@ -0,0 +1,138 @@
+"""This is the support cache, which remembers whether a source supports this system so that it doesn't have to be
+probed again on every start."""
+from single.exceptions import UnsupportedSystemError
+from single.core import ProviderMetadata
+from single.models import Source
+from single import utils
+from pathlib import Path
+from loguru import logger
+import typing as t
+import threading
+import json
+import time
+import attr
+
+SUPPORT_CACHE_VERSION = 2
+# the amount of seconds a verdict is trusted for, since what's installed on a system changes over time.
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+
+@attr.s(auto_attribs=True)
+class SupportCache:
+    """This is a cache of `Source.supported` verdicts.
+
+    A verdict is keyed by the provider's name and version and the system, so a verdict is never reused once any of
+    these change. A verdict that the source is supported also holds the source's backend version, and is only reused
+    while the backend version stays the same. Getting the backend version usually runs the backend, which fails when
+    it isn't installed, so a verdict that the source is unsupported is reused without it.
+
+    Args:
+        path: The path of the cache file, or None if the cache shouldn't be saved.
+        max_age: The amount of seconds a verdict is trusted for.
+    """
+
+    path: t.Optional[Path] = None
+    max_age: float = DEFAULT_MAX_AGE
+    _verdicts: t.Dict[str, t.Dict[str, t.Any]] = attr.ib(factory=dict, repr=False)
+    _dirty: bool = attr.ib(default=False, init=False, repr=False)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, init=False, repr=False)
+
+    @classmethod
+    def load(cls, path: Path, max_age: float = DEFAULT_MAX_AGE) -> "SupportCache":
+        """This loads a support cache from a file. A missing, unreadable or outdated file gives an empty cache.
+
+        Args:
+            path: The path of the cache file.
+            max_age: The amount of seconds a verdict is trusted for.
+
+        Returns:
+            The support cache.
+        """
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError) as error:
+            logger.debug(f"Not using the support cache at '{path}': {error}")
+            return cls(path, max_age)
+
+        if data.get("version") != SUPPORT_CACHE_VERSION:
+            logger.debug(f"The support cache at '{path}' is outdated, ignoring it")
+            return cls(path, max_age)
+
+        return cls(path, max_age, data["verdicts"])
+
+    def save(self) -> None:
+        """This saves the support cache to its file, if anything changed.
+
+        Returns:
+            Nothing.
+        """
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+
+            data = {"version": SUPPORT_CACHE_VERSION, "verdicts": self._verdicts}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporary_path = self.path.with_suffix(".tmp")
+                temporary_path.write_text(json.dumps(data))
+                temporary_path.replace(self.path)
+            except OSError as error:
+                logger.warning(f"Couldn't save the support cache: {error}")
+                return
+
+            self._dirty = False
+
+    @staticmethod
+    def _key(provider: ProviderMetadata) -> str:
+        return "\0".join([provider.name, provider.version, utils.system().value])
+
+    @staticmethod
+    def _backend_version(source: Source) -> t.Optional[str]:
+        try:
+            return source.backend_version
+        except Exception as error:
+            logger.debug(f"Couldn't get the backend version of a source: {error}")
+            return None
+
+    def check(self, provider: ProviderMetadata, source: Source) -> None:
+        """This checks whether or not a source supports this system, only probing it if there's no trusted verdict.
+
+        Args:
+            provider: The provider of the source.
+            source: The source.
+
+        Raises:
+            UnsupportedSystemError: If the source doesn't support this system.
+
+        Returns:
+            Nothing.
+        """
+        key = self._key(provider)
+        with self._lock:
+            verdict = self._verdicts.get(key)
+
+        if verdict is not None and time.time() - verdict["checked_at"] < self.max_age:
+            if verdict["error"] is not None:
+                raise UnsupportedSystemError(*verdict["error"])
+
+            backend_version = self._backend_version(source)
+            if backend_version is not None and backend_version == verdict["backend"]:
+                return
+
+        try:
+            source.supported()
+        except UnsupportedSystemError as error:
+            self._store(key, list(error.args), None)
+            raise
+        self._store(key, None, self._backend_version(source))
+
+    def _store(
+        self, key: str, error: t.Optional[t.List[str]], backend: t.Optional[str]
+    ) -> None:
+        with self._lock:
+            self._verdicts[key] = {
+                "checked_at": time.time(),
+                "error": error,
+                "backend": backend,
+            }
+            self._dirty = True
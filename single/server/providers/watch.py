@@ -0,0 +1,109 @@
+"""This watches the provider directories so that changed providers are reloaded without having to be asked to."""
+from single.constants import PROVIDERS_DIRS
+from pathlib import Path
+from loguru import logger
+import typing as t
+import threading
+import attr
+
+try:
+    import inotify_simple  # type: ignore  # optional, only works on linux
+except ImportError:
+    inotify_simple = None
+
+# the amount of seconds to wait for more changes after a change, so that a provider being copied over is only
+# reloaded once.
+DEBOUNCE = 0.25
+
+
+@attr.s(auto_attribs=True)
+class ProviderWatcher:
+    """This watches the provider directories on a background thread and calls back when they might've changed.
+
+    Inotify is used when the optional `inotify_simple` package is installed, otherwise the directories are polled.
+    Either way, the callback is called every poll interval too, since inotify can't watch directories which don't
+    exist yet. The callback is expected to be cheap when nothing changed, which the provider reloader is.
+
+    Args:
+        callback: What to call when the provider directories might've changed.
+        dirs: The provider directories. By default these are the usual provider directories.
+        interval: The amount of seconds between polls.
+    """
+
+    callback: t.Callable[[], t.Any]
+    dirs: t.List[Path] = attr.ib(factory=lambda: list(PROVIDERS_DIRS))
+    interval: float = 2.0
+    _stopped: threading.Event = attr.ib(factory=threading.Event, init=False, repr=False)
+    _thread: t.Optional[threading.Thread] = attr.ib(
+        default=None, init=False, repr=False
+    )
+
+    def start(self) -> None:
+        """This starts watching the provider directories.
+
+        Returns:
+            Nothing.
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="provider-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """This stops watching the provider directories.
+
+        Returns:
+            Nothing.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _call_back(self) -> None:
+        try:
+            self.callback()
+        except Exception:
+            logger.exception("Reloading the providers after a change failed")
+
+    def _watch(self) -> None:
+        if inotify_simple is None:
+            logger.debug(
+                f"Polling the provider directories every {self.interval} second(s)"
+            )
+            while not self._stopped.wait(self.interval):
+                self._call_back()
+            return
+
+        logger.debug("Watching the provider directories using inotify")
+        flags = inotify_simple.flags
+        mask = (
+            flags.CREATE
+            | flags.DELETE
+            | flags.MODIFY
+            | flags.CLOSE_WRITE
+            | flags.MOVED_FROM
+            | flags.MOVED_TO
+        )
+        with inotify_simple.INotify() as inotify:
+            while not self._stopped.is_set():
+                self._add_watches(inotify, mask)
+                if inotify.read(timeout=int(self.interval * 1000)):
+                    # let the rest of the changes settle before reloading.
+                    while inotify.read(timeout=int(DEBOUNCE * 1000)):
+                        pass
+                if not self._stopped.is_set():
+                    self._call_back()
+
+    def _add_watches(self, inotify: t.Any, mask: int) -> None:
+        # adding a watch to an already watched path just gives back the same watch, so this can be done every time.
+        for dir_ in self.dirs:
+            if not dir_.is_dir():
+                continue
+
+            for path in [dir_, *(path for path in dir_.iterdir() if path.is_dir())]:
+                try:
+                    inotify.add_watch(str(path), mask)
+                except OSError as error:
+                    logger.trace(f"Couldn't watch '{path}': {error}")
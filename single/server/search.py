@@ -0,0 +1,677 @@
+"""This is where searches on the server are done, either through the catalog or through the sources themselves."""
+from single import Package, Source
+from single.models import PackageTable, PackageView
+from single.core import ProviderMetadata
+from single.server.catalog import (
+    Catalog,
+    CatalogEntry,
+    DEFAULT_MAX_AGE,
+    normalize_name,
+)
+from single.server.fuzzy import FuzzyIndex, DEFAULT_SUGGESTIONS
+from concurrent import futures
+from loguru import logger
+import typing as t
+import threading
+import collections
+import queue
+import uuid
+import time
+import attr
+
+# the maximum amount of providers searched at the same time.
+DEFAULT_MAX_WORKERS = 8
+# the maximum amount of packages a streaming search gives back, however broad the query is.
+MAX_RESULTS = 50000
+# the maximum amount of packages a plain search finds in the catalog per provider and per package searched for, as
+# broad queries (such as `lib`) are better fetched page by page with a streaming search.
+DEFAULT_LIMIT = 1000
+# the default and the maximum amount of packages in a page of a streaming search.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 5000
+# the amount of chunks a streaming search buffers before waiting for the client to catch up.
+MAX_BUFFERED_CHUNKS = 64
+
+# a package found by a search, with the name of its provider.
+FoundPackage = t.Tuple[str, Package]
+# a package found by a search which is only read, such as to give it back to a client, which may be a view of it.
+SearchResult = t.Tuple[str, t.Union[Package, PackageView]]
+# a result of a search cursor.
+T = t.TypeVar("T")
+# a search in the search cache, which is the normalized names searched for, the limit and the name of the provider.
+CacheKey = t.Tuple[t.Tuple[str, ...], t.Optional[int], str]
+
+# the default maximum amount of packages held by the search cache.
+DEFAULT_CACHE_SIZE = 100000
+# the default amount of seconds search results are cached for.
+DEFAULT_CACHE_TTL = 5 * 60
+
+# the providers whose sources can't list their packages, so they can't be put in the catalog.
+unindexable: t.Set[str] = set()
+
+
+def refresh_catalog(
+    catalog: Catalog,
+    provider: ProviderMetadata,
+    source: Source,
+    force: bool = False,
+    max_age: float = DEFAULT_MAX_AGE,
+) -> bool:
+    """This refreshes the listing of a provider in the catalog if it's stale (or if forced to).
+
+    Args:
+        catalog: The catalog.
+        provider: The provider.
+        source: The source of the provider.
+        force: Whether or not to refresh the listing even if it's still fresh.
+        max_age: The amount of seconds a listing stays fresh.
+
+    Returns:
+        Whether or not the provider has a usable listing in the catalog.
+    """
+    if provider.name in unindexable:
+        return False
+    if not force and catalog.is_fresh(provider.name, provider.version, max_age):
+        return True
+
+    logger.debug(f"Refreshing the catalog listing of the provider '{provider.name}'")
+    try:
+        packages = source.catalog()
+    except NotImplementedError:
+        logger.debug(
+            f"The provider '{provider.name}' can't list its packages, it will be searched directly"
+        )
+        unindexable.add(provider.name)
+        return False
+    except Exception as error:
+        # a listing which is a bit stale is still better than not finding the provider's packages at all.
+        usable = catalog.refreshed_at(provider.name) is not None
+        logger.warning(
+            f"Couldn't refresh the catalog listing of the provider '{provider.name}': {error}, "
+            + ("using the listing it has" if usable else "it will be searched directly")
+        )
+        return usable
+
+    count = catalog.refresh(provider.name, provider.version, packages)
+    logger.debug(
+        f"The provider '{provider.name}' has {count} package(s) in the catalog"
+    )
+    return True
+
+
+def entry_to_package(
+    entry: CatalogEntry, provider: ProviderMetadata, source: Source
+) -> Package:
+    """This converts a catalog entry back into a package of its provider.
+
+    Args:
+        entry: The catalog entry.
+        provider: The provider of the entry.
+        source: The source of the provider.
+
+    Returns:
+        The package.
+    """
+    return provider.package_reference(  # type: ignore
+        entry.name,
+        entry.version,
+        entry.description,
+        entry.install_size,
+        entry.download_size,
+        source,
+    )
+
+
+def search_provider(
+    packages: t.List[str],
+    provider: ProviderMetadata,
+    catalog: Catalog,
+    get_source: t.Callable[[ProviderMetadata], t.Optional[Source]],
+    limit: t.Optional[int] = None,
+    index: t.Optional[FuzzyIndex] = None,
+) -> t.Sequence[Package]:
+    """This searches for packages in a single provider, using the catalog if the provider has a listing in it.
+
+    Args:
+        packages: The packages to search for.
+        provider: The provider to search packages from.
+        catalog: The catalog.
+        get_source: A function which gets the source of a provider, or None if the provider is unusable.
+        limit: The maximum amount of packages to find in the catalog.
+        index: The fuzzy index over the catalog. If it's given, descriptions are searched as well.
+
+    Returns:
+        The packages found, which are a package table if they were found in the catalog.
+    """
+    source = get_source(provider)
+    if source is None:
+        return []
+    if not refresh_catalog(catalog, provider, source):
+        return source.package(*packages)
+
+    segment = None if index is None else index.segment(provider.name, catalog)
+    found = PackageTable(source, provider.package_reference)
+    seen: t.Set[str] = set()
+    for name in packages:
+        if segment is None:
+            entries = catalog.substring(name, [provider.name], limit)
+        else:
+            entries = [entry for _, entry in segment.find(name, limit)]
+
+        for entry in entries:
+            if entry.name in seen:
+                continue
+
+            seen.add(entry.name)
+            found.append(
+                entry.name,
+                entry.version,
+                entry.description,
+                entry.install_size,
+                entry.download_size,
+            )
+
+    return found
+
+
+def find_exact(
+    name: str,
+    providers: t.List[ProviderMetadata],
+    catalog: Catalog,
+    get_source: t.Callable[[ProviderMetadata], t.Optional[Source]],
+) -> t.Optional[FoundPackage]:
+    """This finds the package with exactly the given name in the first provider (in order) which provides it.
+
+    Args:
+        name: The name of the package.
+        providers: The providers to find the package in.
+        catalog: The catalog.
+        get_source: A function which gets the source of a provider, or None if the provider is unusable.
+
+    Returns:
+        The package with the name of its provider, or None if no provider provides it.
+    """
+    key = normalize_name(name)
+    for provider in providers:
+        source = get_source(provider)
+        if source is None:
+            continue
+
+        if refresh_catalog(catalog, provider, source):
+            for entry in catalog.exact(name, [provider.name]):
+                return provider.name, entry_to_package(entry, provider, source)
+            continue
+
+        for package in source.package(name):
+            if normalize_name(package.name) == key:
+                return provider.name, package
+
+    return None
+
+
+def suggest(
+    name: str,
+    providers: t.List[ProviderMetadata],
+    catalog: Catalog,
+    get_source: t.Callable[[ProviderMetadata], t.Optional[Source]],
+    index: FuzzyIndex,
+    limit: int = DEFAULT_SUGGESTIONS,
+) -> t.List[FoundPackage]:
+    """This suggests the packages with the names most similar to a (possibly mistyped) name.
+
+    Args:
+        name: The name.
+        providers: The providers to suggest packages from. Providers without a listing in the catalog are skipped.
+        catalog: The catalog.
+        get_source: A function which gets the source of a provider, or None if the provider is unusable.
+        index: The fuzzy index over the catalog.
+        limit: The maximum amount of suggestions.
+
+    Returns:
+        The suggestions with the name of their provider, most similar first.
+    """
+    usable = {}
+    for provider in providers:
+        source = get_source(provider)
+        if source is not None and refresh_catalog(catalog, provider, source):
+            usable[provider.name] = provider, source
+
+    return [
+        (entry.provider, entry_to_package(entry, *usable[entry.provider]))
+        for entry in index.suggest(name, list(usable), catalog, limit)
+    ]
+
+
+@attr.s(auto_attribs=True)
+class SearchCache:
+    """This is a cache of search results, so that searching for the same packages again doesn't hit the providers.
+
+    Results are cached per query and per provider, so a search over some providers reuses whatever was cached from
+    searches over other sets of providers. The cache is bounded by the total amount of packages it holds; the least
+    recently used results are evicted first.
+
+    Args:
+        max_packages: The maximum amount of packages held by the cache.
+        ttl: The amount of seconds results are kept for.
+        ttls: Per provider overrides of the amount of seconds results are kept for, by the provider's name.
+    """
+
+    max_packages: int = DEFAULT_CACHE_SIZE
+    ttl: float = DEFAULT_CACHE_TTL
+    ttls: t.Dict[str, float] = attr.ib(factory=dict)
+    hits: int = attr.ib(default=0, init=False)
+    misses: int = attr.ib(default=0, init=False)
+    evictions: int = attr.ib(default=0, init=False)
+    _entries: "collections.OrderedDict[CacheKey, t.Tuple[float, t.Sequence[Package]]]" = attr.ib(
+        factory=collections.OrderedDict, init=False, repr=False
+    )
+    _size: int = attr.ib(default=0, init=False, repr=False)
+    _generations: t.Dict[str, int] = attr.ib(factory=dict, init=False, repr=False)
+    _epoch: int = attr.ib(default=0, init=False, repr=False)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, init=False, repr=False)
+
+    @staticmethod
+    def _key(packages: t.List[str], provider: str, limit: t.Optional[int]) -> CacheKey:
+        return tuple(normalize_name(name) for name in packages), limit, provider
+
+    def generation(self, provider: str) -> t.Tuple[int, int]:
+        """This gets the generation of a provider, which changes every time the provider's results are invalidated.
+
+        Args:
+            provider: The name of the provider.
+
+        Returns:
+            The generation.
+        """
+        with self._lock:
+            return self._epoch, self._generations.get(provider, 0)
+
+    def get(
+        self, packages: t.List[str], provider: str, limit: t.Optional[int] = None
+    ) -> t.Optional[t.Sequence[Package]]:
+        """This gets the cached results of a search in a provider.
+
+        Args:
+            packages: The packages searched for.
+            provider: The name of the provider.
+            limit: The limit of the search.
+
+        Returns:
+            The packages found, or None if they aren't cached (anymore).
+        """
+        key = self._key(packages, provider, limit)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(
+        self,
+        packages: t.List[str],
+        provider: str,
+        found: t.Sequence[Package],
+        generation: t.Tuple[int, int],
+        limit: t.Optional[int] = None,
+    ) -> None:
+        """This caches the results of a search in a provider, unless the provider's results got invalidated since
+        the search started.
+
+        Args:
+            packages: The packages searched for.
+            provider: The name of the provider.
+            found: The packages found.
+            generation: The generation of the provider from before the search started.
+            limit: The limit of the search.
+
+        Returns:
+            Nothing.
+        """
+        if len(found) > self.max_packages:
+            return
+
+        key = self._key(packages, provider, limit)
+        with self._lock:
+            if (self._epoch, self._generations.get(provider, 0)) != generation:
+                return
+
+            if key in self._entries:
+                self._remove(key)
+            expires_at = time.monotonic() + self.ttls.get(provider, self.ttl)
+            self._entries[key] = expires_at, found
+            self._size += len(found)
+            while self._size > self.max_packages:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        # this has to be called while holding the lock.
+        _, found = self._entries.pop(key)
+        self._size -= len(found)
+
+    def invalidate(self, providers: t.Optional[t.Iterable[str]] = None) -> None:
+        """This forgets the cached results of some providers, or of every provider.
+
+        Args:
+            providers: The names of the providers. By default the results of every provider are forgotten.
+
+        Returns:
+            Nothing.
+        """
+        with self._lock:
+            if providers is None:
+                self._epoch += 1
+                self._entries.clear()
+                self._size = 0
+                return
+
+            names = set(providers)
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+            for key in [key for key in self._entries if key[2] in names]:
+                self._remove(key)
+
+    def stats(self) -> t.Dict[str, int]:
+        """This gets the counters of the cache, to see how well it's doing.
+
+        Returns:
+            The hits, misses, evictions, the amount of cached results and the amount of packages held.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "packages": self._size,
+            }
+
+
+def iter_search(
+    packages: t.List[str],
+    providers: t.List[ProviderMetadata],
+    catalog: Catalog,
+    get_source: t.Callable[[ProviderMetadata], t.Optional[Source]],
+    limit: t.Optional[int] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    cache: t.Optional[SearchCache] = None,
+    index: t.Optional[FuzzyIndex] = None,
+) -> t.Iterator[t.Tuple[ProviderMetadata, t.Sequence[Package]]]:
+    """This searches for packages in every provider at the same time, giving back the packages of each provider as
+    soon as that provider is done.
+
+    Args:
+        packages: The packages to search for.
+        providers: The providers to search packages from.
+        catalog: The catalog.
+        get_source: A function which gets the source of a provider, or None if the provider is unusable.
+        limit: The maximum amount of packages to find in the catalog, per provider.
+        max_workers: The maximum amount of providers searched at the same time.
+        cache: The cache to take results from and put results in. By default nothing is cached.
+        index: The fuzzy index over the catalog, if any.
+
+    Returns:
+        An iterator of each provider with the packages found in it, in the order the providers finish (the cached
+        providers first).
+    """
+    missing = []
+    for provider in providers:
+        cached = None if cache is None else cache.get(packages, provider.name, limit)
+        if cached is None:
+            missing.append(provider)
+        else:
+            yield provider, cached
+
+    if not missing:
+        return
+
+    executor = futures.ThreadPoolExecutor(max_workers=min(max_workers, len(missing)))
+    pending = {
+        executor.submit(
+            search_provider, packages, provider, catalog, get_source, limit, index
+        ): (provider, None if cache is None else cache.generation(provider.name))
+        for provider in missing
+    }
+
+    try:
+        for future in futures.as_completed(pending):
+            provider, generation = pending[future]
+            try:
+                found = future.result()
+            except Exception as error:
+                logger.error(
+                    f"The provider '{provider.name}' failed to search for packages: {error}"
+                )
+                continue
+
+            if cache is not None and generation is not None:
+                cache.put(packages, provider.name, found, generation, limit)
+            yield provider, found
+    finally:
+        # the caller may stop early, in which case the providers still searching are left to finish on their own.
+        executor.shutdown(wait=False)
+
+
+def search(
+    packages: t.List[str],
+    providers: t.List[ProviderMetadata],
+    catalog: Catalog,
+    get_source: t.Callable[[ProviderMetadata], t.Optional[Source]],
+    cache: t.Optional[SearchCache] = None,
+    index: t.Optional[FuzzyIndex] = None,
+    limit: t.Optional[int] = None,
+) -> t.List[SearchResult]:
+    """This searches for packages in providers, using the catalog for every provider that has a listing in it.
+
+    Args:
+        packages: The packages to search for.
+        providers: The providers to search packages from.
+        catalog: The catalog.
+        get_source: A function which gets the source of a provider, or None if the provider is unusable.
+        cache: The cache to take results from and put results in. By default nothing is cached.
+        index: The fuzzy index over the catalog, if any.
+        limit: The maximum amount of packages to find in the catalog, per provider and per package searched for.
+
+    Returns:
+        A list of packages found with the name of their provider, in the same order as the providers.
+    """
+    found = {
+        provider.name: packages_
+        for provider, packages_ in iter_search(
+            packages, providers, catalog, get_source, limit, cache=cache, index=index
+        )
+    }
+
+    return [
+        (provider.name, package)
+        for provider in providers
+        for package in readable(found.get(provider.name, []))
+    ]
+
+
+def readable(
+    packages: t.Sequence[Package],
+) -> t.Iterable[t.Union[Package, PackageView]]:
+    """This goes through packages which are only going to be read, taking views of them out of package tables instead
+    of making every package.
+
+    Args:
+        packages: The packages.
+
+    Returns:
+        The packages, or views of them.
+    """
+    return packages.views() if isinstance(packages, PackageTable) else packages
+
+
+@attr.s(auto_attribs=True)
+class SearchCursor(t.Generic[T]):
+    """This is a search running in the background, whose results are fetched page by page.
+
+    Args:
+        search: The search, giving back chunks of results; packages with the name of their provider for package
+                searches, for example.
+        max_results: The maximum amount of results the search gives back in total.
+    """
+
+    search: t.Iterator[t.List[T]]
+    max_results: int = MAX_RESULTS
+    _chunks: "queue.Queue[t.Optional[t.List[T]]]" = attr.ib(
+        factory=lambda: queue.Queue(maxsize=MAX_BUFFERED_CHUNKS), init=False
+    )
+    _buffer: t.List[T] = attr.ib(factory=list, init=False)
+    _done: bool = attr.ib(default=False, init=False)
+    _closed: threading.Event = attr.ib(factory=threading.Event, init=False)
+    last_used: float = attr.ib(factory=time.monotonic, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        threading.Thread(
+            target=self._produce, name="search-cursor", daemon=True
+        ).start()
+
+    def _produce(self) -> None:
+        produced = 0
+        try:
+            for chunk in self.search:
+                if self._closed.is_set():
+                    return
+
+                chunk = chunk[: self.max_results - produced]
+                produced += len(chunk)
+                if chunk:
+                    self._put(chunk)
+                if produced >= self.max_results:
+                    logger.debug(
+                        f"A search hit the limit of {self.max_results} package(s), stopping it"
+                    )
+                    return
+        except Exception:
+            logger.exception("A search failed")
+        finally:
+            self._put(None)
+
+    def _put(self, chunk: t.Optional[t.List[T]]) -> None:
+        # a full queue means the client is slow to fetch; don't give up unless the cursor got closed.
+        while not self._closed.is_set():
+            try:
+                self._chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def fetch(
+        self, page_size: int = DEFAULT_PAGE_SIZE, timeout: float = 1.0
+    ) -> t.Tuple[t.List[T], bool]:
+        """This fetches the next page of packages, waiting for the first package of the page if needed.
+
+        Args:
+            page_size: The maximum amount of packages in the page.
+            timeout: The amount of seconds to wait for the first package of the page.
+
+        Returns:
+            The page, which may be empty if no package came in on time, and whether or not the search is done.
+        """
+        self.last_used = time.monotonic()
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        block = not self._buffer
+        while len(self._buffer) < page_size and not self._done:
+            try:
+                chunk = self._chunks.get(
+                    block=block, timeout=timeout if block else None
+                )
+            except queue.Empty:
+                break
+
+            block = False
+            if chunk is None:
+                self._done = True
+            else:
+                self._buffer.extend(chunk)
+
+        page, self._buffer = self._buffer[:page_size], self._buffer[page_size:]
+        return page, self._done and not self._buffer
+
+    def close(self) -> None:
+        """This closes the cursor, stopping the search if it's still running.
+
+        Returns:
+            Nothing.
+        """
+        self._closed.set()
+        close = getattr(self.search, "close", None)
+        if close is not None:
+            try:
+                close()
+            except ValueError:
+                pass  # the generator is still running on the producer thread, which will stop on its own
+
+
+@attr.s(auto_attribs=True)
+class SearchCursors:
+    """This keeps track of the open search cursors of the server.
+
+    Args:
+        idle_timeout: The amount of seconds an unused cursor is kept around for.
+    """
+
+    idle_timeout: float = 5 * 60
+    _cursors: t.Dict[str, "SearchCursor[t.Any]"] = attr.ib(factory=dict, init=False)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, init=False)
+
+    def open(self, cursor: "SearchCursor[t.Any]") -> str:
+        """This registers a cursor, closing any cursor which has been idle for too long.
+
+        Args:
+            cursor: The cursor.
+
+        Returns:
+            The id of the cursor.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for cursor_id, idle_cursor in list(self._cursors.items()):
+                if now - idle_cursor.last_used > self.idle_timeout:
+                    logger.debug(f"Closing the idle search cursor {cursor_id}")
+                    del self._cursors[cursor_id]
+                    idle_cursor.close()
+
+            cursor_id = uuid.uuid4().hex
+            self._cursors[cursor_id] = cursor
+
+        return cursor_id
+
+    def get(self, cursor_id: str) -> "SearchCursor[t.Any]":
+        """This gets a cursor.
+
+        Args:
+            cursor_id: The id of the cursor.
+
+        Raises:
+            KeyError: If there's no such cursor, or it was closed.
+
+        Returns:
+            The cursor.
+        """
+        with self._lock:
+            return self._cursors[cursor_id]
+
+    def close(self, cursor_id: str) -> None:
+        """This closes a cursor, if it's still open.
+
+        Args:
+            cursor_id: The id of the cursor.
+
+        Returns:
+            Nothing.
+        """
+        with self._lock:
+            cursor = self._cursors.pop(cursor_id, None)
+
+        if cursor is not None:
+            cursor.close()
@@ -1,20 +1,131 @@
 """These are just some utilities used by the single server."""
 from single import _enums as enums
+from single.context import ServerContext
 from loguru import logger
+from contextlib import contextmanager
+from pathlib import Path
+import typing as t
+import threading
+import socket
+import errno
+import stat
+import os
+import queue
 import sys
+import attr
 
+# the amount of log messages waiting to be written before messages start getting dropped.
+DEFAULT_LOG_BUFFER = 10000
+# the maximum amount of log messages written at once.
+DEFAULT_LOG_BATCH = 256
+# messages at least this severe (warnings and up) wait a bit for room instead of being dropped right away.
+KEEP_LEVEL = 30
 
-def set_logging_level(logging_level: enums.LoggingLevel) -> None:
+
+@attr.s(auto_attribs=True)
+class QueueSink:
+    """This is a logging sink which writes messages on a thread of its own, so that logging never waits on the
+    terminal or the disk.
+
+    Messages are written in batches. If the buffer is full, less severe messages are dropped (and counted), while
+    warnings and worse wait a moment for room first.
+
+    Args:
+        stream: The stream to write the messages to.
+        max_size: The amount of messages waiting to be written before messages start getting dropped.
+        batch_size: The maximum amount of messages written at once.
+    """
+
+    stream: t.TextIO
+    max_size: int = DEFAULT_LOG_BUFFER
+    batch_size: int = DEFAULT_LOG_BATCH
+    dropped: int = attr.ib(default=0, init=False)
+    _queue: "queue.Queue[t.Optional[str]]" = attr.ib(init=False, repr=False)
+    _thread: threading.Thread = attr.ib(init=False, repr=False)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._queue = queue.Queue(maxsize=self.max_size)
+        self._thread = threading.Thread(
+            target=self._drain, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        """This queues a message to be written.
+
+        Args:
+            message: The formatted message, as given by loguru.
+
+        Returns:
+            Nothing.
+        """
+        try:
+            self._queue.put_nowait(message)
+            return
+        except queue.Full:
+            pass
+
+        record = getattr(message, "record", None)
+        if record is not None and record["level"].no >= KEEP_LEVEL:
+            try:
+                self._queue.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+        with self._lock:
+            self.dropped += 1
+
+    def _drain(self) -> None:
+        while True:
+            message = self._queue.get()
+            batch = []
+            while message is not None:
+                batch.append(message)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    message = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            with self._lock:
+                dropped, self.dropped = self.dropped, 0
+            if dropped:
+                batch.append(f"{dropped} log message(s) were dropped\n")
+
+            if batch:
+                self.stream.write("".join(batch))
+                self.stream.flush()
+            if message is None:
+                return
+
+    def stop(self) -> None:
+        """This writes every message left and stops the writing thread. This is called by loguru once the sink is
+        removed.
+
+        Returns:
+            Nothing.
+        """
+        self._queue.put(None)
+        self._thread.join(5)
+
+
+def set_logging_level(logging_level: enums.LoggingLevel, buffered: bool = True) -> None:
     """This sets the logging level without the use of an environment variable.
 
     Args:
         logging_level: The logging level.
+        buffered: Whether or not to write the logs on a thread of their own instead of on the thread logging.
 
     Returns:
         Nothing.
     """
     logger.remove()
-    logger.add(sys.stderr, level=logging_level.value)
+    sink: t.Any = QueueSink(sys.stderr) if buffered else sys.stderr
+    logger.add(sink, level=logging_level.value, colorize=sys.stderr.isatty())
+    ServerContext.minimum_level = logger.level(logging_level.value).no
 
 
 def ml_error(*message: str) -> None:
@@ -30,3 +141,57 @@ def ml_error(*message: str) -> None:
 
     for line in combined_msg.splitlines():
         logger.error(line)
+
+
+def prepare_socket_path(path: Path) -> None:
+    """This prepares a path for a unix socket to be bound to, removing the socket left behind by a server which didn't
+    shut down cleanly.
+
+    Args:
+        path: The path of the unix socket.
+
+    Raises:
+        OSError: If another server is still listening on the unix socket, or if something other than a unix socket
+                 is at the path.
+
+    Returns:
+        Nothing.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.lstat().st_mode
+    except FileNotFoundError:
+        return
+
+    # only ever remove a socket, so that a mistyped path can't delete a file.
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.ENOTSOCK, "the path isn't a unix socket", str(path))
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        logger.debug(f"Removing the stale unix socket at '{path}'")
+        path.unlink()
+    else:
+        raise OSError(errno.EADDRINUSE, "a server is already listening", str(path))
+    finally:
+        probe.close()
+
+
+@contextmanager
+def umask(mask: int) -> t.Iterator[None]:
+    """This sets the umask of the process for the duration of a block, so that the files created in it have the
+    permissions wanted from the start.
+
+    Args:
+        mask: The umask.
+
+    Returns:
+        Nothing.
+    """
+    previous = os.umask(mask)
+    try:
+        yield
+    finally:
+        os.umask(previous)
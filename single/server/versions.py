@@ -0,0 +1,295 @@
+"""This is the version engine, which turns the versions of packages into keys that can be compared, so that it can be
+told whether or not an installed package is older than the one a provider has.
+
+Every package manager numbers its versions its own way, so a source tells which scheme its versions follow through
+`Source.version_scheme`:
+
+- `pep440` for python packages, such as `1!2.0.post1` or `2.0rc1.dev3+local.7`.
+- `debian` for dpkg, such as `1:2.30-1ubuntu0.1` or `1.0~rc1`, which is older than `1.0`.
+- `semver` for semantic versions, such as `1.2.3-beta.2+build.5`.
+- `rpm` for rpm, such as `1:2.3-4.el8` or `1.0^git1`.
+- `generic` for anything else, which compares the numbers and the words of versions in order.
+
+A version which doesn't follow its scheme is compared the generic way, and is always older than the ones which do.
+Parsed versions are memoized, since the same versions come up again and again.
+"""
+from single.server.catalog import normalize_name
+import typing as t
+import functools
+import attr
+import re
+
+SCHEMES = ("generic", "pep440", "debian", "semver", "rpm")
+# the amount of parsed versions remembered.
+CACHE_SIZE = 2**16
+# a key of a version; keys of the same scheme can be compared with each other.
+Key = t.Tuple[t.Any, ...]
+
+_PEP440 = re.compile(
+    r"""
+    v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|rc|c)[-_.]?(?P<pre_n>[0-9]+)?)?
+    (?P<post>(?:-(?P<post_n1>[0-9]+))|(?:[-_.]?(?:post|rev|r)[-_.]?(?P<post_n2>[0-9]+)?))?
+    (?P<dev>[-_.]?dev[-_.]?(?P<dev_n>[0-9]+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+_PRE_RELEASES = {
+    "a": 0,
+    "alpha": 0,
+    "b": 1,
+    "beta": 1,
+    "c": 2,
+    "pre": 2,
+    "preview": 2,
+    "rc": 2,
+}
+_SEMVER = re.compile(
+    r"v?(?P<major>[0-9]+)\.(?P<minor>[0-9]+)\.(?P<patch>[0-9]+)"
+    r"(?:-(?P<pre>[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+[0-9A-Za-z.-]+)?"
+)
+_DEBIAN = re.compile(r"(?:(?P<epoch>[0-9]+):)?(?P<rest>[0-9][A-Za-z0-9.+~:-]*)")
+_DEBIAN_PARTS = re.compile(r"([^0-9]*)([0-9]*)")
+_RPM = re.compile(r"(?:(?P<epoch>[0-9]+):)?(?P<rest>[A-Za-z0-9._+~^-]+)")
+_SEGMENTS = re.compile(r"~|\^|[A-Za-z]+|[0-9]+")
+# how the segments of rpm (and generic) versions are ordered; a tilde comes before the end of a version, and a caret
+# after it but before anything else.
+_TILDE, _END, _CARET, _WORD, _NUMBER = range(5)
+# the part a debian version is padded with, which compares the same as nothing at all.
+_DEBIAN_NOTHING = ((0,), 0)
+
+
+def _segments(version: str) -> Key:
+    """This splits a version into its numbers and words, the way rpm does.
+
+    Args:
+        version: The version.
+
+    Returns:
+        The key of the version.
+    """
+    key: t.List[t.Tuple[t.Any, ...]] = []
+    for segment in _SEGMENTS.findall(version):
+        if segment == "~":
+            key.append((_TILDE,))
+        elif segment == "^":
+            key.append((_CARET,))
+        elif segment.isdigit():
+            key.append((_NUMBER, int(segment)))
+        else:
+            key.append((_WORD, segment))
+    key.append((_END,))
+    return tuple(key)
+
+
+def _generic(version: str) -> Key:
+    return _segments(version.lower())
+
+
+def _pep440(version: str) -> Key:
+    match = _PEP440.fullmatch(version.strip())
+    if match is None:
+        raise ValueError(f"'{version}' isn't a PEP 440 version")
+
+    release = [int(number) for number in match["release"].split(".")]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+
+    # a development release of a final release comes before its pre-releases, and a final release after them.
+    if match["pre"]:
+        pre = (_PRE_RELEASES[match["pre_l"].lower()], int(match["pre_n"] or 0))
+    elif match["dev"] and not match["post"]:
+        pre = (-1, 0)
+    else:
+        pre = (3, 0)
+
+    post = -1 if not match["post"] else int(match["post_n1"] or match["post_n2"] or 0)
+    dev = (1, 0) if not match["dev"] else (0, int(match["dev_n"] or 0))
+    local = tuple(
+        (1, int(part)) if part.isdigit() else (0, part.lower())
+        for part in re.split(r"[-_.]", match["local"] or "")
+        if part
+    )
+    return int(match["epoch"] or 0), tuple(release), pre, post, dev, local
+
+
+def _debian_part(text: str) -> Key:
+    """This makes the key of the upstream version or the revision of a debian version, the way dpkg compares them.
+
+    Args:
+        text: The upstream version or the revision.
+
+    Returns:
+        The key, which alternates between letters and numbers.
+    """
+    parts = []
+    for letters, number in _DEBIAN_PARTS.findall(text):
+        if not letters and not number:
+            continue
+
+        # a tilde comes before anything, even the end, then letters and then every other character.
+        weights = tuple(
+            -1 if char == "~" else ord(char) if char.isalpha() else ord(char) + 256
+            for char in letters
+        )
+        parts.append((weights + (0,), int(number or 0)))
+
+    while parts and parts[-1] == _DEBIAN_NOTHING:
+        parts.pop()
+    parts.append(_DEBIAN_NOTHING)
+    return tuple(parts)
+
+
+def _debian(version: str) -> Key:
+    match = _DEBIAN.fullmatch(version.strip())
+    if match is None:
+        raise ValueError(f"'{version}' isn't a debian version")
+
+    upstream, _, revision = match["rest"].rpartition("-")
+    if not upstream:
+        upstream, revision = revision, ""
+    return int(match["epoch"] or 0), _debian_part(upstream), _debian_part(revision)
+
+
+def _semver(version: str) -> Key:
+    match = _SEMVER.fullmatch(version.strip())
+    if match is None:
+        raise ValueError(f"'{version}' isn't a semantic version")
+
+    # a pre-release comes before its release.
+    pre: Key = (1,)
+    if match["pre"]:
+        pre = (
+            0,
+            tuple(
+                (0, int(part)) if part.isdigit() else (1, part)
+                for part in match["pre"].split(".")
+            ),
+        )
+    return int(match["major"]), int(match["minor"]), int(match["patch"]), pre
+
+
+def _rpm(version: str) -> Key:
+    match = _RPM.fullmatch(version.strip())
+    if match is None:
+        raise ValueError(f"'{version}' isn't an rpm version")
+
+    upstream, _, release = match["rest"].rpartition("-")
+    if not upstream:
+        upstream, release = release, ""
+    return int(match["epoch"] or 0), _segments(upstream), _segments(release)
+
+
+_PARSERS: t.Dict[str, t.Callable[[str], Key]] = {
+    "generic": _generic,
+    "pep440": _pep440,
+    "debian": _debian,
+    "semver": _semver,
+    "rpm": _rpm,
+}
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse(version: str, scheme: str = "generic") -> Key:
+    """This parses a version into a key, which can be compared with the keys of other versions of the same scheme.
+
+    Args:
+        version: The version.
+        scheme: The scheme of the version; one of SCHEMES.
+
+    Raises:
+        ValueError: If the scheme doesn't exist.
+
+    Returns:
+        The key of the version.
+    """
+    if scheme not in _PARSERS:
+        raise ValueError(
+            f"the version scheme '{scheme}' doesn't exist, use one of {', '.join(SCHEMES)}"
+        )
+
+    try:
+        return 1, _PARSERS[scheme](version)
+    except ValueError:
+        return 0, _generic(version)
+
+
+def compare(first: str, second: str, scheme: str = "generic") -> int:
+    """This compares two versions.
+
+    Args:
+        first: The first version.
+        second: The second version.
+        scheme: The scheme of the versions.
+
+    Returns:
+        A negative number if the first version is older, 0 if they're the same and a positive number if it's newer.
+    """
+    first_key, second_key = parse(first, scheme), parse(second, scheme)
+    return (first_key > second_key) - (first_key < second_key)
+
+
+@attr.s(auto_attribs=True, frozen=True, slots=True)
+class Update:
+    """This is an installed package which has a newer version available.
+
+    Args:
+        name: The name of the package.
+        installed: The version installed.
+        available: The newer version available.
+    """
+
+    name: str
+    installed: str
+    available: str
+
+
+def updates(
+    installed: t.Iterable[t.Tuple[str, str]],
+    available: t.Iterable[t.Tuple[str, str]],
+    scheme: str = "generic",
+) -> t.List[Update]:
+    """This finds the installed packages which have a newer version available, in bulk.
+
+    Both sides are sorted by their normalized names (which is cheap when they already are, as the catalog and the
+    installed state give them back) and then merged, so every package is only looked at once.
+
+    Args:
+        installed: The names and versions of the installed packages.
+        available: The names and versions of the packages available. If a package is available more than once, the
+                   newest version is used.
+        scheme: The scheme of the versions.
+
+    Returns:
+        The packages which have a newer version available, by name.
+    """
+
+    def keyed(
+        packages: t.Iterable[t.Tuple[str, str]]
+    ) -> t.List[t.Tuple[str, str, str]]:
+        return sorted(
+            (normalize_name(name), name, version) for name, version in packages
+        )
+
+    installed_, available_ = keyed(installed), keyed(available)
+    found: t.List[Update] = []
+    position = 0
+    for key, name, version in installed_:
+        while position < len(available_) and available_[position][0] < key:
+            position += 1
+
+        newest: t.Optional[str] = None
+        end = position
+        while end < len(available_) and available_[end][0] == key:
+            candidate = available_[end][2]
+            if newest is None or parse(candidate, scheme) > parse(newest, scheme):
+                newest = candidate
+            end += 1
+
+        if newest is not None and parse(newest, scheme) > parse(version, scheme):
+            found.append(Update(name, version, newest))
+
+    return found
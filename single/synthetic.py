@@ -0,0 +1,327 @@
+"""These are the synthetic providers, which behave like real package managers (a catalog of a given size, slow and
+sometimes failing calls, slow support checks and long installs) without touching any, so that the server can be
+load tested locally.
+
+A synthetic provider is an ordinary provider directory whose module makes its source from its own provider.toml:
+
+    from single import Package
+    from single.synthetic import synthetic_source
+
+    SyntheticSource = synthetic_source(__file__)
+
+and whose provider.toml has a `synthetic` table next to the `metadata` table. Every key of the table is optional:
+
+    [synthetic]
+    preset = "apt"              # start from the behaviour of a package manager; see PRESETS.
+    packages = 60000            # the amount of packages in the catalog.
+    seed = 0                    # the seed the package names and the random behaviour come from.
+    latency = 0.3               # the median amount of seconds a search (or listing) takes.
+    latency_distribution = "lognormal"  # constant, uniform, exponential or lognormal.
+    latency_spread = 0.5        # the sigma of lognormal latencies, or the +/- range of uniform ones.
+    failure_rate = 0.01         # the chance of a call failing.
+    supported_delay = 0.05      # the amount of seconds the support check takes.
+    install_time = 2.0          # the amount of seconds installing a package takes.
+    remove_time = 1.0           # the amount of seconds removing a package takes.
+    update_time = 2.0           # the amount of seconds updating a package takes.
+    indexable = true            # whether or not the source can list its catalog.
+
+`write_provider` writes such a directory.
+"""
+from single.models import Source, Package
+from single.enums import System
+from pathlib import Path
+import typing as t
+import threading
+import random
+import toml
+import attr
+import math
+import time
+
+# the behaviour of some package managers, which the other keys of the synthetic table are applied on top of.
+PRESETS: t.Dict[str, t.Dict[str, t.Any]] = {
+    "apt": dict(
+        packages=60000,
+        latency=0.3,
+        latency_distribution="lognormal",
+        latency_spread=0.4,
+        failure_rate=0.001,
+        supported_delay=0.05,
+        install_time=2.0,
+        remove_time=1.0,
+        update_time=2.0,
+        indexable=True,
+    ),
+    "pip": dict(
+        packages=300000,
+        latency=0.8,
+        latency_distribution="lognormal",
+        latency_spread=0.8,
+        failure_rate=0.02,
+        supported_delay=0.2,
+        install_time=4.0,
+        remove_time=0.5,
+        update_time=4.0,
+        indexable=False,
+    ),
+}
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+_SYLLABLES = (
+    "ba co de fi gu ha ji ka lo mu ne po qu ra si tu vo wa xe yo ze ar en il on us st tr pl gr"
+).split()
+_MODULE = """from single import Package
+from single.synthetic import synthetic_source
+
+SyntheticSource = synthetic_source(__file__)
+"""
+
+
+class SyntheticFailure(RuntimeError):
+    """This is the error a synthetic source raises when a call is made to fail."""
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class SyntheticConfig:
+    """This is how a synthetic source behaves.
+
+    Args:
+        packages: The amount of packages in the catalog.
+        seed: The seed the package names and the random behaviour come from.
+        latency: The median amount of seconds a search (or listing) takes.
+        latency_distribution: How the latencies are distributed; one of LATENCY_DISTRIBUTIONS.
+        latency_spread: The sigma of lognormal latencies, or the +/- range of uniform ones.
+        failure_rate: The chance of a call failing, from 0 to 1.
+        supported_delay: The amount of seconds the support check takes.
+        install_time: The amount of seconds installing a package takes.
+        remove_time: The amount of seconds removing a package takes.
+        update_time: The amount of seconds updating a package takes.
+        indexable: Whether or not the source can list its catalog.
+    """
+
+    packages: int = 1000
+    seed: int = 0
+    latency: float = 0.0
+    latency_distribution: str = attr.ib(
+        default="constant", validator=attr.validators.in_(LATENCY_DISTRIBUTIONS)
+    )
+    latency_spread: float = 0.0
+    failure_rate: float = 0.0
+    supported_delay: float = 0.0
+    install_time: float = 0.0
+    remove_time: float = 0.0
+    update_time: float = 0.0
+    indexable: bool = True
+
+    @classmethod
+    def from_table(cls, table: t.Dict[str, t.Any]) -> "SyntheticConfig":
+        """This makes a config out of the synthetic table of a provider.toml.
+
+        Args:
+            table: The synthetic table.
+
+        Raises:
+            ValueError: If the table has a preset or a key which doesn't exist, or a bad latency distribution.
+
+        Returns:
+            The config.
+        """
+        table = dict(table)
+        preset = table.pop("preset", None)
+        if preset is not None and preset not in PRESETS:
+            raise ValueError(
+                f"the preset '{preset}' doesn't exist, use one of {', '.join(PRESETS)}"
+            )
+
+        fields = {field.name for field in attr.fields(cls)}
+        unknown = set(table) - fields
+        if unknown:
+            raise ValueError(
+                f"the synthetic table has unknown keys: {', '.join(sorted(unknown))}"
+            )
+
+        return cls(**{**PRESETS.get(preset or "", {}), **table})
+
+
+def package_names(count: int, seed: int) -> t.List[str]:
+    """This makes up package names, which look like the names of real packages.
+
+    Args:
+        count: The amount of names.
+        seed: The seed the names come from; the same seed always gives the same names.
+
+    Returns:
+        The names, which are all different.
+    """
+    random_ = random.Random(seed)
+    names: t.List[str] = []
+    seen: t.Set[str] = set()
+    while len(names) < count:
+        name = "".join(random_.choices(_SYLLABLES, k=random_.randint(2, 4)))
+        if random_.random() < 0.2:
+            name = f"lib{name}"
+        if random_.random() < 0.15:
+            name += random_.choice(("-dev", "-doc", "-common", "-utils"))
+        if name in seen:
+            name = f"{name}{len(names)}"
+        seen.add(name)
+        names.append(name)
+
+    return names
+
+
+class SyntheticSource(Source):
+    """This is a source which doesn't manage any packages, but behaves as its config says a package manager would."""
+
+    config: t.ClassVar[SyntheticConfig] = SyntheticConfig()
+    rng: t.ClassVar[random.Random] = random.Random(0)
+    os_supported = [System.LINUX, System.WINDOWS, System.MAC, System.BSD]
+    _catalogs: t.ClassVar[t.Dict[t.Tuple[int, int], t.List[str]]] = {}
+    _catalogs_lock: t.ClassVar[threading.Lock] = threading.Lock()
+
+    @property
+    def backend_version(self) -> str:
+        return "synthetic"
+
+    @property
+    def names(self) -> t.List[str]:
+        """The names of the packages in the catalog, which are made up once per config and then shared.
+
+        Returns:
+            The names of the packages.
+        """
+        key = self.config.packages, self.config.seed
+        with self._catalogs_lock:
+            if key not in self._catalogs:
+                self._catalogs[key] = package_names(*key)
+
+            return self._catalogs[key]
+
+    def _latency(self) -> float:
+        config = self.config
+        if config.latency_distribution == "uniform":
+            return self.rng.uniform(
+                config.latency - config.latency_spread,
+                config.latency + config.latency_spread,
+            )
+        if config.latency_distribution == "exponential":
+            # the latency is the median, so the mean is a bit higher.
+            return (
+                self.rng.expovariate(math.log(2) / config.latency)
+                if config.latency
+                else 0.0
+            )
+        if config.latency_distribution == "lognormal":
+            return (
+                self.rng.lognormvariate(math.log(config.latency), config.latency_spread)
+                if config.latency
+                else 0.0
+            )
+
+        return config.latency
+
+    def _call(self, seconds: float, what: str) -> None:
+        """This makes a call take its time, and fail as often as the config says.
+
+        Args:
+            seconds: The amount of seconds the call takes.
+            what: What the call does, for the error.
+
+        Raises:
+            SyntheticFailure: If the call is made to fail.
+
+        Returns:
+            Nothing.
+        """
+        time.sleep(max(0.0, seconds))
+        if self.rng.random() < self.config.failure_rate:
+            raise SyntheticFailure(f"the synthetic source failed to {what}")
+
+    def _package(self, name: str) -> Package:
+        return Package(name, "1.0.0", f"The synthetic {name} package.", 2.0, 1.0, self)
+
+    def supported(self) -> None:
+        time.sleep(self.config.supported_delay)
+        super().supported()
+
+    def package(self, *names: str) -> t.List[Package]:
+        self._call(self._latency(), "search for packages")
+        return [
+            self._package(package)
+            for package in self.names
+            if any(name in package for name in names)
+        ]
+
+    def catalog(self) -> t.List[Package]:
+        if not self.config.indexable:
+            raise NotImplementedError
+
+        self._call(self._latency(), "list its packages")
+        return [self._package(name) for name in self.names]
+
+    def install_package(self, *packages: Package) -> None:
+        self._call(self.config.install_time * len(packages), "install packages")
+
+    def remove_package(self, *packages: Package) -> None:
+        self._call(self.config.remove_time * len(packages), "remove packages")
+
+    def update_package(self, *packages: Package) -> None:
+        self._call(self.config.update_time * max(1, len(packages)), "update packages")
+
+    def greet(self) -> None:
+        self.context.info(
+            f"Synthetic source with {self.config.packages} package(s) ({self.config.latency_distribution} "
+            f"latencies around {self.config.latency}s)"
+        )
+
+
+def synthetic_source(module_path: t.Union[Path, str]) -> t.Type[SyntheticSource]:
+    """This makes the source of a synthetic provider, configured by the synthetic table of its provider.toml.
+
+    Args:
+        module_path: The path of the provider's module, which is usually `__file__`.
+
+    Raises:
+        ValueError: If the synthetic table is bad.
+
+    Returns:
+        The source class.
+    """
+    metadata = toml.loads((Path(module_path).parent / "provider.toml").read_text())
+    config = SyntheticConfig.from_table(metadata.get("synthetic", {}))
+    return type(
+        "SyntheticSource",
+        (SyntheticSource,),
+        {"config": config, "rng": random.Random(config.seed)},
+    )
+
+
+def write_provider(provider_dir: Path, name: str, **synthetic: t.Any) -> Path:
+    """This writes a synthetic provider directory.
+
+    Args:
+        provider_dir: The directory, which is made if it doesn't exist.
+        name: The name of the provider.
+        **synthetic: The synthetic table of the provider.toml.
+
+    Raises:
+        ValueError: If the synthetic table is bad.
+
+    Returns:
+        The directory.
+    """
+    SyntheticConfig.from_table(synthetic)
+    provider_dir.mkdir(parents=True, exist_ok=True)
+    metadata = {
+        "metadata": dict(
+            name=name,
+            version="0.1.0",
+            description="A synthetic provider, for load testing.",
+            source_name="SyntheticSource",
+            package_name="Package",
+            dependencies=[],
+        ),
+        "synthetic": synthetic,
+    }
+    (provider_dir / "provider.toml").write_text(toml.dumps(metadata))
+    (provider_dir / "__init__.py").write_text(_MODULE)
+    return provider_dir
@@ -6,8 +6,10 @@ import importlib.util
 import os
 import typing as t
 from single.enums import System
+import threading
 import platform
 import attr
+import sys
 
 
 @attr.s(auto_attribs=True, frozen=True)
@@ -17,22 +19,29 @@ class ServerState:
     Args:
         ok: Whether or not the server is in an okay state or not.
         errors: The recoverable errors found.
+        search_cache: The counters of the search cache, such as its hits and misses.
     """
 
     ok: bool
     errors: t.List[Exception]
+    search_cache: t.Dict[str, int] = attr.ib(factory=dict)
 
     @classmethod
-    def from_errors(cls, errors: t.List[Exception]) -> "ServerState":
+    def from_errors(
+        cls,
+        errors: t.List[Exception],
+        search_cache: t.Optional[t.Dict[str, int]] = None,
+    ) -> "ServerState":
         """This constructs a server state object from an error list, presumably from a server.
 
         Args:
             errors: The list of errors.
+            search_cache: The counters of the search cache.
 
         Returns:
             The server state.
         """
-        return cls(len(errors) == 0, errors)
+        return cls(len(errors) == 0, errors, search_cache or {})
 
 
 def get_module(path: Path) -> ModuleType:
@@ -55,6 +64,81 @@ def get_module(path: Path) -> ModuleType:
     return module
 
 
+@attr.s(auto_attribs=True)
+class LazyModule:
+    """This is a module which only gets executed the first time it is actually needed.
+
+    Args:
+        path: The path of the module.
+    """
+
+    path: Path
+    _module: t.Optional[ModuleType] = attr.ib(default=None, eq=False, repr=False)
+    _lock: threading.Lock = attr.ib(
+        factory=threading.Lock, init=False, eq=False, repr=False
+    )
+
+    @property
+    def loaded(self) -> bool:
+        """Whether or not the module was executed already.
+
+        Returns:
+            Whether or not the module was executed already.
+        """
+        return self._module is not None
+
+    def get(self) -> ModuleType:
+        """This gets the module, executing it if it wasn't executed yet.
+
+        Returns:
+            The module.
+        """
+        with self._lock:
+            if self._module is None:
+                self._module = get_module(self.path)
+
+            return self._module
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class LazyReference:
+    """This is a reference to something inside a lazy module, which is only looked up on first use.
+
+    Args:
+        module: The lazy module.
+        name: The name of the thing inside the module.
+    """
+
+    module: LazyModule
+    name: str
+
+    def resolve(self) -> t.Any:
+        """This looks up the referenced thing, executing the module if needed.
+
+        Raises:
+            AttributeError: If the module doesn't have the referenced thing.
+
+        Returns:
+            The referenced thing.
+        """
+        return getattr(self.module.get(), self.name)
+
+
+def resolve(reference: t.Any) -> t.Any:
+    """This resolves a reference if it's lazy, otherwise it's given back as is.
+
+    Args:
+        reference: The reference, lazy or not.
+
+    Returns:
+        The referenced thing.
+    """
+    if isinstance(reference, LazyReference):
+        return reference.resolve()
+
+    return reference
+
+
 def flatten_list(list_: t.List[t.Any]) -> t.List[t.Any]:
     """This flattens a list.
 
@@ -89,6 +173,19 @@ def prettify_list(list_: t.List[t.Any]) -> str:
     return ", ".join([str(item) for item in list_])
 
 
+def intern(value: t.Any) -> t.Any:
+    """This interns a string, so that every equal string shares a single copy. This saves a lot of memory for strings
+    repeated across many packages, such as versions and provider names.
+
+    Args:
+        value: The string, or anything else, which is given back as is.
+
+    Returns:
+        The interned string.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
 def system() -> System:
     """This retrieves the current system os name as an enum.
 
@@ -0,0 +1,352 @@
+"""This is the wire format, which is how packages and providers are sent between the server and the client by value.
+
+Sending a package or a provider as is over rpyc sends a reference to it, so every attribute the client reads from it
+is another round trip to the server. Instead, providers are sent as their names, and batches of packages are packed
+into a single blob of records which refer to their provider through an index into a table of provider names.
+"""
+from single.core import ProviderMetadata
+from single.models import Package, PackageView
+import typing as t
+import json
+import zlib
+import attr
+
+WIRE_VERSION = 1
+# blobs at least this big are compressed, smaller ones aren't worth the time.
+COMPRESS_THRESHOLD = 4096
+_RAW, _COMPRESSED = b"r", b"z"
+
+
+@attr.s(auto_attribs=True, frozen=True, slots=True)
+class PackageRecord:
+    """This is a package as seen by the client, which is a plain copy of a package instead of a reference to it.
+
+    Attributes:
+        provider: The name of the provider of the package.
+        name: The name of the package.
+        version: The version of the package.
+        description: The description of the package.
+        install_size: The install size of the package.
+        download_size: The download size of the package.
+    """
+
+    provider: str
+    name: str
+    version: str
+    description: str
+    install_size: float
+    download_size: float
+
+
+@attr.s(auto_attribs=True, frozen=True, slots=True)
+class JobRecord:
+    """This is a job on the server as seen by the client.
+
+    Attributes:
+        id: The id of the job.
+        operation: The name of the operation, such as `install`.
+        packages: The packages the job works on.
+        providers: The names of the providers the job works on.
+        priority: The priority of the job.
+        state: Where the job is at, such as `running`.
+        submitted_at: When the job was submitted, as a timestamp.
+        started_at: When the job started running, if it did.
+        finished_at: When the job finished, if it did.
+        error: What went wrong, if the job failed.
+        messages: The latest messages of the job.
+    """
+
+    id: str
+    operation: str
+    packages: t.List[str]
+    providers: t.List[str]
+    priority: int
+    state: str
+    submitted_at: float
+    started_at: t.Optional[float]
+    finished_at: t.Optional[float]
+    error: t.Optional[str]
+    messages: t.List[str]
+
+
+@attr.s(auto_attribs=True, frozen=True, slots=True)
+class InstalledRecord:
+    """This is a package installed through single as seen by the client.
+
+    Attributes:
+        provider: The name of the provider the package was installed from.
+        name: The name of the package.
+        version: The version of the package when it was last installed or updated through single.
+        installed_at: When the package was installed, as a timestamp.
+        updated_at: When the package was last installed or updated, as a timestamp.
+    """
+
+    provider: str
+    name: str
+    version: str
+    installed_at: float
+    updated_at: float
+
+
+@attr.s(auto_attribs=True, frozen=True, slots=True)
+class OutdatedRecord:
+    """This is an installed package which has a newer version available, as seen by the client.
+
+    Attributes:
+        provider: The name of the provider the package was installed from.
+        name: The name of the package.
+        installed: The version installed.
+        available: The newer version available.
+    """
+
+    provider: str
+    name: str
+    installed: str
+    available: str
+
+
+def provider_names(
+    providers: t.Iterable[t.Union[str, ProviderMetadata]]
+) -> t.List[str]:
+    """This converts providers into provider names, which is how providers are referred to over the wire.
+
+    Args:
+        providers: The providers, or their names.
+
+    Returns:
+        The names of the providers.
+    """
+    return [
+        provider if isinstance(provider, str) else provider.name
+        for provider in providers
+    ]
+
+
+def _load(blob: bytes) -> t.List[t.Any]:
+    """This decodes a blob, checking that it was packed using this version of the wire format.
+
+    Args:
+        blob: The blob, decompressed and without its prefix if it holds packages.
+
+    Raises:
+        ValueError: If the blob was packed using another version of the wire format.
+
+    Returns:
+        What was packed after the version of the wire format.
+    """
+    version, *payload = json.loads(blob)
+    if version != WIRE_VERSION:
+        raise ValueError(
+            f"the blob uses version {version} of the wire format, expected version {WIRE_VERSION}"
+        )
+
+    return payload
+
+
+def pack_packages(
+    packages: t.Iterable[t.Tuple[str, t.Union[Package, PackageView]]],
+    compress: bool = True,
+) -> bytes:
+    """This packs a batch of packages into a blob.
+
+    Args:
+        packages: The packages, each with the name of its provider.
+        compress: Whether or not to compress the blob if it's big enough.
+
+    Returns:
+        The blob.
+    """
+    providers: t.Dict[str, int] = {}
+    records = []
+    for provider, package in packages:
+        provider_id = providers.setdefault(provider, len(providers))
+        records.append(
+            [
+                provider_id,
+                package.name,
+                package.version,
+                package.description,
+                package.install_size,
+                package.download_size,
+            ]
+        )
+
+    data = json.dumps(
+        [WIRE_VERSION, list(providers), records], separators=(",", ":")
+    ).encode()
+    if compress and len(data) >= COMPRESS_THRESHOLD:
+        return _COMPRESSED + zlib.compress(data, 1)
+
+    return _RAW + data
+
+
+def unpack_packages(blob: bytes) -> t.List[PackageRecord]:
+    """This unpacks a blob of packages.
+
+    Args:
+        blob: The blob.
+
+    Raises:
+        ValueError: If the blob isn't a blob of packages, or was packed using another version of the wire format.
+
+    Returns:
+        The packages.
+    """
+    kind, data = blob[:1], blob[1:]
+    if kind == _COMPRESSED:
+        data = zlib.decompress(data)
+    elif kind != _RAW:
+        raise ValueError("this isn't a blob of packages")
+
+    providers, records = _load(data)
+
+    return [
+        PackageRecord(providers[provider_id], *fields)
+        for provider_id, *fields in records
+    ]
+
+
+def pack_jobs(jobs: t.Iterable[t.Any]) -> bytes:
+    """This packs jobs into a blob.
+
+    Args:
+        jobs: The jobs of the server.
+
+    Returns:
+        The blob.
+    """
+    records = [
+        [
+            job.id,
+            job.operation,
+            job.packages,
+            job.providers,
+            job.priority,
+            job.state.value,
+            job.submitted_at,
+            job.started_at,
+            job.finished_at,
+            job.error,
+            list(job.messages),
+        ]
+        for job in jobs
+    ]
+    return json.dumps([WIRE_VERSION, records], separators=(",", ":")).encode()
+
+
+def unpack_jobs(blob: bytes) -> t.List[JobRecord]:
+    """This unpacks a blob of jobs.
+
+    Args:
+        blob: The blob.
+
+    Raises:
+        ValueError: If the blob was packed using another version of the wire format.
+
+    Returns:
+        The jobs.
+    """
+    (records,) = _load(blob)
+
+    return [JobRecord(*record) for record in records]
+
+
+def pack_installed(packages: t.Iterable[t.Any]) -> bytes:
+    """This packs installed packages into a blob.
+
+    Args:
+        packages: The installed packages, as recorded by the server.
+
+    Returns:
+        The blob.
+    """
+    records = [
+        [
+            package.provider,
+            package.name,
+            package.version,
+            package.installed_at,
+            package.updated_at,
+        ]
+        for package in packages
+    ]
+    return json.dumps([WIRE_VERSION, records], separators=(",", ":")).encode()
+
+
+def unpack_installed(blob: bytes) -> t.List[InstalledRecord]:
+    """This unpacks a blob of installed packages.
+
+    Args:
+        blob: The blob.
+
+    Raises:
+        ValueError: If the blob was packed using another version of the wire format.
+
+    Returns:
+        The installed packages.
+    """
+    (records,) = _load(blob)
+
+    return [InstalledRecord(*record) for record in records]
+
+
+def pack_outdated(packages: t.Iterable[t.Tuple[str, t.Any]]) -> bytes:
+    """This packs outdated packages into a blob.
+
+    Args:
+        packages: The outdated packages, each with the name of its provider.
+
+    Returns:
+        The blob.
+    """
+    records = [
+        [provider, package.name, package.installed, package.available]
+        for provider, package in packages
+    ]
+    return json.dumps([WIRE_VERSION, records], separators=(",", ":")).encode()
+
+
+def unpack_outdated(blob: bytes) -> t.List[OutdatedRecord]:
+    """This unpacks a blob of outdated packages.
+
+    Args:
+        blob: The blob.
+
+    Raises:
+        ValueError: If the blob was packed using another version of the wire format.
+
+    Returns:
+        The outdated packages.
+    """
+    (records,) = _load(blob)
+
+    return [OutdatedRecord(*record) for record in records]
+
+
+def pack_metrics(snapshot: t.Dict[str, t.Any]) -> bytes:
+    """This packs a snapshot of the server's metrics into a blob.
+
+    Args:
+        snapshot: The snapshot.
+
+    Returns:
+        The blob.
+    """
+    return json.dumps([WIRE_VERSION, snapshot], separators=(",", ":")).encode()
+
+
+def unpack_metrics(blob: bytes) -> t.Dict[str, t.Any]:
+    """This unpacks a blob of metrics.
+
+    Args:
+        blob: The blob.
+
+    Raises:
+        ValueError: If the blob was packed using another version of the wire format.
+
+    Returns:
+        The snapshot of the metrics; the requests by method, and the source calls by provider and call.
+    """
+    (snapshot,) = _load(blob)
+
+    return snapshot
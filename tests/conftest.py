@@ -0,0 +1,60 @@
+from single import Source
+from single.core import ProviderMetadata
+from single.glue import SinglePackageManager
+from single.server import core
+from single.server.catalog import Catalog
+from single.server.engines import SingleThreadedServer
+from single.server.installed import InstalledState
+from single.server.search import SearchCache
+from tests.sources import make_providers
+from pathlib import Path
+from _pytest.monkeypatch import MonkeyPatch
+import typing as t
+import threading
+import pytest
+
+
+@pytest.fixture
+def server_state(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    # the state of the server is global, so every test gets its own.
+    monkeypatch.setattr(core, "providers", [])
+    monkeypatch.setattr(core, "sources", {})
+    monkeypatch.setattr(core, "catalog", Catalog(tmp_path / "catalog.db"))
+    monkeypatch.setattr(core, "installed", InstalledState(":memory:"))
+    monkeypatch.setattr(core, "search_cache", SearchCache())
+    monkeypatch.setattr(core.search_, "unindexable", set())
+
+
+@pytest.fixture
+def use_sources(
+    server_state: None, monkeypatch: MonkeyPatch
+) -> t.Callable[..., t.List[ProviderMetadata]]:
+    def use(**sources: Source) -> t.List[ProviderMetadata]:
+        providers, _ = make_providers(**sources)
+        monkeypatch.setattr(core, "providers", providers)
+        monkeypatch.setattr(core, "sources", sources)
+        return providers
+
+    return use
+
+
+@pytest.fixture
+def server(server_state: None) -> t.Iterator[SingleThreadedServer]:
+    server = SingleThreadedServer(
+        core.SinglePackageManagerService, hostname="127.0.0.1", port=0
+    )
+    server._listen()
+    threading.Thread(target=server.start, daemon=True).start()
+    try:
+        yield server
+    finally:
+        server.close()
+
+
+@pytest.fixture
+def manager(server: SingleThreadedServer) -> t.Iterator[SinglePackageManager]:
+    manager = SinglePackageManager.from_host("127.0.0.1", server.port)
+    try:
+        yield manager
+    finally:
+        manager.close()
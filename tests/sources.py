@@ -0,0 +1,128 @@
+from single import Source, Package, System
+from single.core import ProviderMetadata
+import typing as t
+import threading
+import attr
+import time
+
+
+@attr.s(auto_attribs=True)
+class SlowSource(Source):
+    delay: float = 0.0
+    count: int = 1
+
+    @property
+    def os_supported(self) -> t.List[System]:
+        return [System.LINUX, System.WINDOWS, System.MAC, System.BSD]
+
+    @property
+    def backend_version(self) -> str:
+        return "0.1.0"
+
+    def supported(self) -> None:
+        pass
+
+    def package(self, *names: str) -> t.List[Package]:
+        time.sleep(self.delay)
+        return [
+            Package(f"{name}-{index}", "1.0", "", 0, 0, self)
+            for name in names
+            for index in range(self.count)
+        ]
+
+    def install_package(self, *packages: Package) -> None:
+        pass
+
+    def remove_package(self, *packages: Package) -> None:
+        pass
+
+    def update_package(self, *packages: Package) -> None:
+        pass
+
+    def greet(self) -> None:
+        pass
+
+
+@attr.s(auto_attribs=True)
+class ListingSource(SlowSource):
+    names: t.List[str] = attr.ib(factory=list)
+    failing: bool = False
+
+    def catalog(self) -> t.List[Package]:
+        if self.failing:
+            raise RuntimeError("the backend is down")
+        return [Package(name, "1.0", "", 0, 0, self) for name in self.names]
+
+
+@attr.s(auto_attribs=True, eq=False)
+class GraphSource(Source):
+    provider: str = ""
+    graph: t.Dict[str, t.List[str]] = attr.ib(factory=dict)
+    delay: float = 0.0
+    broken: t.List[str] = attr.ib(factory=list)
+    batches: t.List[t.List[str]] = attr.ib(factory=list)
+    lock: threading.Lock = attr.ib(factory=threading.Lock)
+
+    @property
+    def os_supported(self) -> t.List[System]:
+        return [System.LINUX, System.WINDOWS, System.MAC, System.BSD]
+
+    @property
+    def backend_version(self) -> str:
+        return "0.1.0"
+
+    def supported(self) -> None:
+        pass
+
+    def package(self, *names: str) -> t.List[Package]:
+        return [
+            Package(name, "1.0", "", 0, 0, self) for name in names if name in self.graph
+        ]
+
+    def dependencies(self, package: Package) -> t.List[str]:
+        return self.graph[package.name]
+
+    def install_package(self, *packages: Package) -> None:
+        time.sleep(self.delay)
+        with self.lock:
+            self.batches.append(sorted(package.name for package in packages))
+        if any(package.name in self.broken for package in packages):
+            raise RuntimeError("the transaction failed")
+
+    def remove_package(self, *packages: Package) -> None:
+        pass
+
+    def update_package(self, *packages: Package) -> None:
+        pass
+
+    def greet(self) -> None:
+        pass
+
+
+@attr.s(auto_attribs=True)
+class VersionedSource(GraphSource):
+    versions: t.Dict[str, str] = attr.ib(factory=dict)
+    indexable: bool = True
+    version_scheme = "debian"
+
+    def package(self, *names: str) -> t.List[Package]:
+        return [
+            Package(name, version, "", 0, 0, self)
+            for name, version in self.versions.items()
+            if any(query in name for query in names)
+        ]
+
+    def catalog(self) -> t.List[Package]:
+        if not self.indexable:
+            raise NotImplementedError
+        return self.package("")
+
+
+def make_providers(
+    **sources: Source,
+) -> t.Tuple[t.List[ProviderMetadata], t.Callable[[ProviderMetadata], Source]]:
+    providers = [
+        ProviderMetadata(name, "0.1.0", "", type(source), Package, [])
+        for name, source in sources.items()
+    ]
+    return providers, lambda provider: sources[provider.name]
@@ -0,0 +1,50 @@
+from benchmarks import suite
+import pytest
+
+
+def test_benchmarks_run_and_compare() -> None:
+    results = suite.run(providers=2, packages=50, repeat=1, requests=8, clients=2)
+
+    assert set(results["results"]) == {
+        "load_cold",
+        "load_warm",
+        "load_warm_lazy",
+        "fanout_p50",
+        "fanout_p99",
+        "rpc_throughput",
+        "rpc_search_p50",
+        "rpc_search_p99",
+    }
+    assert all(
+        not comparison.regressed for comparison in suite.compare(results, results)
+    )
+
+
+def test_compare_flags_regressions_both_ways() -> None:
+    def results(latency: float, throughput: float) -> dict:
+        return {
+            "version": suite.RESULTS_VERSION,
+            "parameters": {},
+            "results": {
+                "latency": {"value": latency, "unit": "s", "higher_is_better": False},
+                "throughput": {
+                    "value": throughput,
+                    "unit": "req/s",
+                    "higher_is_better": True,
+                },
+            },
+        }
+
+    comparisons = suite.compare(results(1.0, 100.0), results(1.5, 50.0), 0.2)
+    assert [(comparison.name, comparison.regressed) for comparison in comparisons] == [
+        ("latency", True),
+        ("throughput", True),
+    ]
+    assert not any(
+        comparison.regressed
+        for comparison in suite.compare(results(1.0, 100.0), results(0.5, 200.0))
+    )
+    with pytest.raises(ValueError):
+        suite.compare(
+            results(1.0, 100.0), {**results(1.0, 100.0), "parameters": {"a": 1}}
+        )
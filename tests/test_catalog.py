@@ -0,0 +1,49 @@
+from single import Package
+from single.server.catalog import Catalog, normalize_name
+from pathlib import Path
+
+
+def make_packages(*names: str) -> list:
+    return [Package(name, "1.0", f"The {name} package.", 2.0, 1.0, None) for name in names]  # type: ignore
+
+
+def test_normalize_name() -> None:
+    assert normalize_name("Python_Dateutil") == "python-dateutil"
+    assert normalize_name(" zope.interface ") == "zope-interface"
+
+
+def test_catalog_lookups() -> None:
+    catalog = Catalog(":memory:")
+    catalog.refresh(
+        "apt", "0.1.0", make_packages("python3", "python3-pip", "libpython3")
+    )
+    catalog.refresh("pip", "0.1.0", make_packages("Python3_Foo"))
+
+    assert [entry.name for entry in catalog.exact("PYTHON3")] == ["python3"]
+    assert [entry.name for entry in catalog.prefix("python3-")] == [
+        "Python3_Foo",
+        "python3-pip",
+    ]
+    assert [entry.name for entry in catalog.substring("python3", ["apt"])] == [
+        "python3",
+        "python3-pip",
+        "libpython3",
+    ]
+
+
+def test_catalog_refreshes_providers_independently(tmp_path: Path) -> None:
+    catalog = Catalog(tmp_path / "catalog.sqlite3")
+    catalog.refresh("apt", "0.1.0", make_packages("vim", "emacs"))
+    catalog.refresh("pip", "0.1.0", make_packages("vim-bindings"))
+    catalog.refresh("apt", "0.1.0", make_packages("vim"))
+    catalog.close()
+
+    reopened = Catalog(tmp_path / "catalog.sqlite3")
+    assert reopened.is_fresh("apt", "0.1.0")
+    assert not reopened.is_fresh("apt", "0.2.0")
+    assert not reopened.is_fresh("snap", "0.1.0")
+    assert [entry.name for entry in reopened.substring("")] == ["vim", "vim-bindings"]
+
+    reopened.forget("pip")
+    assert not reopened.is_fresh("pip", "0.1.0")
+    assert [entry.provider for entry in reopened.substring("vim")] == ["apt"]
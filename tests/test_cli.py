@@ -0,0 +1,74 @@
+from typer.testing import CliRunner
+from single.cli.server import app as server_app
+from single import synthetic
+from pathlib import Path
+import subprocess
+import sys
+import os
+import single.cli
+import pytest
+
+# the modules the command lines mustn't import until a command which uses them runs.
+HEAVY_MODULES = ("single.server", "single.models", "rpyc", "loguru")
+# the amount of seconds importing the modules of single itself may take when a command line starts.
+STARTUP_BUDGET = 0.05
+# timing depends on the machine running the tests, so the startup budget is only checked when this is set.
+TIMING_TESTS = "SINGLE_TIMING_TESTS"
+root = Path(__file__).parent.parent
+
+
+def python(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=root,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+
+@pytest.mark.parametrize("module", ["client", "server", "combined"])
+def test_cli_imports_only_what_it_uses(module: str) -> None:
+    result = python(f"import sys, single.cli.{module}; print(*sys.modules)")
+    loaded = result.stdout.split()
+
+    assert not [
+        name
+        for name in loaded
+        for heavy in HEAVY_MODULES
+        if name == heavy or name.startswith(f"{heavy}.")
+    ]
+
+
+@pytest.mark.skipif(
+    not os.environ.get(TIMING_TESTS), reason=f"set {TIMING_TESTS} to check timings"
+)
+def test_cli_starts_within_budget() -> None:
+    # every line of -X importtime is "import time: self | cumulative | module", in microseconds.
+    result = python("import single.cli.combined", "-X", "importtime")
+    spent = sum(
+        int(line.split("|")[0].split(":")[1])
+        for line in result.stderr.splitlines()
+        if line.split("|")[-1].strip().startswith("single")
+    )
+
+    assert spent / 1_000_000 < STARTUP_BUDGET
+
+
+def test_cli_apps_are_still_exported() -> None:
+    result = python(
+        "import sys, single, single.cli; single.cli.client_app; single.Package;"
+        "print('single.models' in sys.modules)"
+    )
+
+    assert result.stdout.strip() == "True"
+    with pytest.raises(AttributeError):
+        single.cli.nothing  # type: ignore
+
+
+def test_synthetic_help_lists_the_presets() -> None:
+    result = CliRunner().invoke(server_app, ["synthetic", "--help"])
+
+    assert result.exit_code == 0
+    assert all(preset in result.output for preset in synthetic.PRESETS)
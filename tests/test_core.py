@@ -29,3 +29,14 @@ def test_that_provider_metadata_processes_a_provider_folder_correctly() -> None:
     assert provider_metadata.source_reference == Source
     assert provider_metadata.package_reference == Package
     assert provider_metadata.dependencies == []
+
+
+def test_that_provider_metadata_defers_executing_a_lazy_provider() -> None:
+    provider_folder = current_folder / "providers" / "test"
+    provider_metadata = core.ProviderMetadata.from_provider(provider_folder, lazy=True)
+
+    assert provider_metadata.name == "Test Provider"
+    assert provider_metadata.deferred
+    assert provider_metadata.source_reference == Source
+    assert provider_metadata.package_reference == Package
+    assert not provider_metadata.deferred
@@ -0,0 +1,54 @@
+from single import _enums as enums
+from single.server.engines import make_server
+from rpyc import Service  # type: ignore
+from concurrent import futures
+import threading
+import rpyc  # type: ignore
+import pytest
+
+
+class EchoService(Service):
+    @staticmethod
+    def exposed_echo(value: str) -> str:
+        return value
+
+
+def start_in_thread(engine: enums.ServerEngine, **kwargs: int):  # type: ignore
+    server = make_server(engine, EchoService, hostname="127.0.0.1", port=0, **kwargs)
+    server._listen()
+    threading.Thread(target=server.start, daemon=True).start()
+    return server
+
+
+@pytest.mark.parametrize("engine", list(enums.ServerEngine))
+def test_engines_serve_many_clients(engine: enums.ServerEngine) -> None:
+    server = start_in_thread(engine, max_workers=2, queue_depth=16)
+
+    def call(index: int) -> str:
+        conn = rpyc.connect("127.0.0.1", server.port)
+        try:
+            return conn.root.echo(str(index))
+        finally:
+            conn.close()
+
+    try:
+        with futures.ThreadPoolExecutor(8) as executor:
+            assert list(executor.map(call, range(16))) == [str(i) for i in range(16)]
+    finally:
+        server.close()
+
+
+def test_pool_engine_turns_clients_away_when_full() -> None:
+    server = start_in_thread(enums.ServerEngine.POOL, max_workers=1, queue_depth=0)
+
+    try:
+        first = rpyc.connect("127.0.0.1", server.port)
+        assert first.root.echo("hi") == "hi"
+
+        with pytest.raises(EOFError):
+            second = rpyc.connect("127.0.0.1", server.port)
+            second.root.echo("hi")
+
+        first.close()
+    finally:
+        server.close()
@@ -0,0 +1,120 @@
+from single import Package
+from single.server import search as search_
+from single.server.catalog import Catalog, CatalogEntry
+from single.server.fuzzy import (
+    FuzzyIndex,
+    Segment,
+    EXACT,
+    PREFIX,
+    SUBSTRING,
+    DESCRIPTION,
+)
+from tests.sources import ListingSource, make_providers
+from _pytest.monkeypatch import MonkeyPatch
+import typing as t
+import threading
+import time
+
+
+def make_entries(**descriptions: str) -> t.List[CatalogEntry]:
+    return [
+        CatalogEntry("apt", name, "1.0", description, 0, 0)
+        for name, description in descriptions.items()
+    ]
+
+
+def test_segment_ranks_matches() -> None:
+    segment = Segment.from_entries(
+        0.0,
+        "apt",
+        make_entries(
+            libvim="The vim library",
+            vim="Vi IMproved",
+            neovim="A fork of vim",
+            emacs="An editor, unlike vim",
+            nano="A small text editor",
+        ),
+    )
+
+    assert [(rank, entry.name) for rank, entry in segment.find("VIM")] == [
+        (EXACT, "vim"),
+        (SUBSTRING, "libvim"),
+        (SUBSTRING, "neovim"),
+        (DESCRIPTION, "emacs"),
+    ]
+    assert [entry.name for _, entry in segment.find("text edit")] == ["nano"]
+    assert [entry.name for _, entry in segment.find("vim", limit=2)] == [
+        "vim",
+        "libvim",
+    ]
+    assert segment.find("vi", descriptions=False)[0][0] == PREFIX
+
+
+def test_segment_suggests_names_for_typos() -> None:
+    segment = Segment.from_entries(
+        0.0,
+        "apt",
+        make_entries(**{"python3-requests": "", "python3-pip": "", "ruby": ""}),
+    )
+
+    assert [entry.name for _, entry in segment.suggest("pyhton3-requests")] == [
+        "python3-requests"
+    ]
+    assert segment.suggest("zzz") == []
+
+
+def test_fuzzy_index_follows_the_catalog() -> None:
+    catalog = Catalog(":memory:")
+    index = FuzzyIndex()
+    catalog.refresh("apt", "0.1.0", [Package("vim", "1.0", "", 0, 0, None)])  # type: ignore
+    segment = index.segment("apt", catalog)
+
+    assert segment is index.segment("apt", catalog)
+    time.sleep(0.01)
+    catalog.refresh("apt", "0.1.0", [Package("emacs", "1.0", "", 0, 0, None)])  # type: ignore
+    assert [entry.name for entry in index.suggest("emac", ["apt"], catalog)] == [
+        "emacs"
+    ]
+    catalog.forget("apt")
+    assert index.segment("apt", catalog) is None
+
+
+def test_search_only_suggests_packages_when_asked_to() -> None:
+    providers, get_source = make_providers(
+        apt=ListingSource(names=["firefox", "thunderbird"])
+    )
+    catalog, index = Catalog(":memory:"), FuzzyIndex()
+    found = search_.search(["firefix"], providers, catalog, get_source, index=index)
+    suggested = search_.suggest("firefix", providers, catalog, get_source, index)
+
+    assert found == []
+    assert [(provider, package.name) for provider, package in suggested] == [
+        ("apt", "firefox")
+    ]
+
+
+def test_segments_are_built_once_at_a_time(monkeypatch: MonkeyPatch) -> None:
+    catalog = Catalog(":memory:")
+    catalog.refresh("apt", "0.1.0", [Package("vim", "1.0", "", 0, 0, None)])  # type: ignore
+    index = FuzzyIndex()
+    builds = []
+    from_entries = Segment.from_entries
+
+    def slow_from_entries(*args: t.Any) -> Segment:
+        builds.append(args)
+        time.sleep(0.1)
+        return from_entries(*args)
+
+    monkeypatch.setattr(Segment, "from_entries", slow_from_entries)
+    segments: t.List[t.Optional[Segment]] = []
+    searches = [
+        threading.Thread(target=lambda: segments.append(index.segment("apt", catalog)))
+        for _ in range(4)
+    ]
+    for search in searches:
+        search.start()
+    for search in searches:
+        search.join()
+
+    assert len(builds) == 1
+    assert len(segments) == 4 and all(segment is segments[0] for segment in segments)
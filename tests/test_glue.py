@@ -0,0 +1,108 @@
+from single import _enums as enums
+from single._models import ConnectionPool
+from single.glue import SinglePackageManager
+from single.server import core
+from single.server.engines import make_server, SingleThreadedServer
+from single.server.utils import prepare_socket_path
+from pathlib import Path
+import threading
+import rpyc  # type: ignore
+import socket
+import pytest
+
+
+def listen_on_unix_socket(path: Path):  # type: ignore
+    prepare_socket_path(path)
+    server = make_server(
+        enums.ServerEngine.THREADED,
+        core.SinglePackageManagerService,
+        socket_path=str(path),
+    )
+    server._listen()
+    return server
+
+
+def test_glue_talks_over_a_unix_socket_and_reuses_connections(
+    tmp_path: Path, server_state: None
+) -> None:
+    server = listen_on_unix_socket(tmp_path / "server.sock")
+    threading.Thread(target=server.start, daemon=True).start()
+    manager = SinglePackageManager.from_unix_socket(tmp_path / "server.sock")
+
+    try:
+        opened = []
+        connect = manager._pool.connect
+        manager._pool.connect = lambda: opened.append(None) or connect()  # type: ignore
+
+        for _ in range(5):
+            assert manager.search(["foo"], []) == []
+        assert opened == []
+
+        # a broken connection is replaced by a new one.
+        with manager._pool.connection() as conn:
+            conn.close()
+        assert manager.search(["foo"], []) == []
+        assert len(opened) == 1
+    finally:
+        manager.close()
+        server.close()
+
+
+def test_glue_can_share_a_connection_of_its_own(server: SingleThreadedServer) -> None:
+    conn = rpyc.connect("127.0.0.1", server.port)
+    manager = SinglePackageManager(conn)
+
+    try:
+        for _ in range(3):
+            assert manager.search(["foo"], []) == []
+        assert not conn.closed
+    finally:
+        manager.close()
+    assert conn.closed
+
+
+def test_connection_pool_stays_within_its_size() -> None:
+    class FakeConnection:
+        closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+    pool = ConnectionPool(FakeConnection, size=2)  # type: ignore
+    connections = [pool.acquire() for _ in range(3)]
+    for conn in connections:
+        pool.release(conn)
+
+    assert [conn.closed for conn in connections] == [False, False, True]
+    assert pool.acquire() is connections[1]
+
+    pool.close()
+    assert connections[0].closed
+    with pytest.raises(ValueError):
+        pool.acquire()
+
+
+def test_stale_unix_sockets_are_replaced(tmp_path: Path) -> None:
+    path = tmp_path / "server.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+
+    prepare_socket_path(path)
+    assert not path.exists()
+
+    server = listen_on_unix_socket(path)
+    try:
+        with pytest.raises(OSError):
+            prepare_socket_path(path)
+    finally:
+        server.close()
+
+
+def test_only_sockets_are_replaced(tmp_path: Path) -> None:
+    path = tmp_path / "important.txt"
+    path.write_text("keep me")
+
+    with pytest.raises(OSError):
+        prepare_socket_path(path)
+    assert path.read_text() == "keep me"
@@ -0,0 +1,70 @@
+from single import Package
+from single.core import ProviderMetadata
+from single.glue import SinglePackageManager
+from single.server.installed import InstalledState
+from tests.sources import GraphSource
+from pathlib import Path
+import typing as t
+import sqlite3
+import pytest
+
+
+def test_installed_state_survives_restarts(tmp_path: Path) -> None:
+    source = GraphSource(provider="apt", graph={"Git": [], "vim": []})
+    state = InstalledState(tmp_path / "installed.db")
+    state.record_installed("apt", source.package("Git", "vim"))
+    state.record_installed("pip", [Package("git", "2.0", "", 0, 0, source)])
+    state.record_removed("apt", ["vim"])
+    state.close()
+
+    state = InstalledState(tmp_path / "installed.db")
+    assert [(package.provider, package.name) for package in state.installed()] == [
+        ("apt", "Git"),
+        ("pip", "git"),
+    ]
+    assert [package.version for package in state.owners("GIT")] == ["1.0", "2.0"]
+    assert [package.provider for package in state.installed(["pip"])] == ["pip"]
+
+
+def test_installed_state_keeps_the_install_time_on_updates() -> None:
+    source = GraphSource(provider="apt", graph={"git": []})
+    state = InstalledState(":memory:")
+    state.record_installed("apt", [Package("git", "1.0", "", 0, 0, source)])
+    state.record_installed("apt", [Package("git", "1.1", "", 0, 0, source)])
+    (package,) = state.installed()
+
+    assert package.version == "1.1"
+    assert package.installed_at <= package.updated_at
+
+
+def test_installed_state_refuses_newer_databases(tmp_path: Path) -> None:
+    conn = sqlite3.connect(str(tmp_path / "installed.db"))
+    conn.execute("PRAGMA user_version = 99")
+    conn.close()
+
+    with pytest.raises(RuntimeError):
+        InstalledState(tmp_path / "installed.db").installed()
+
+
+def test_server_records_installs_removals_and_updates(
+    use_sources: t.Callable[..., t.List[ProviderMetadata]],
+    manager: SinglePackageManager,
+) -> None:
+    use_sources(
+        pip=GraphSource(provider="pip", graph={"app": [], "lib": []}),
+        apt=GraphSource(provider="apt", graph={"app": [], "lib": []}),
+    )
+    manager.install(["app", "lib"], ["apt"])
+    assert [(record.provider, record.name) for record in manager.installed()] == [
+        ("apt", "app"),
+        ("apt", "lib"),
+    ]
+
+    # pip comes first, but lib was installed from apt, so that's where it's removed from.
+    manager.remove(["lib"], [])
+    assert [record.name for record in manager.installed(["apt"])] == ["app"]
+    assert manager.owners("lib") == []
+
+    manager.update([], ["apt"])
+    (record,) = manager.owners("app")
+    assert record.provider == "apt" and record.version == "1.0"
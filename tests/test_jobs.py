@@ -0,0 +1,122 @@
+from single import _enums as enums
+from single.core import ProviderMetadata
+from single.glue import SinglePackageManager
+from single.server import core
+from single.server.jobs import JobScheduler, Job
+from tests.sources import GraphSource
+from _pytest.monkeypatch import MonkeyPatch
+import typing as t
+import threading
+import time
+
+
+def blocking(release: threading.Event, ran: t.List[str]) -> t.Callable[[Job], None]:
+    def run(job: Job) -> None:
+        ran.append(job.operation)
+        release.wait(5)
+
+    return run
+
+
+def test_jobs_run_by_priority_within_provider_limits() -> None:
+    scheduler = JobScheduler(max_jobs=2, provider_limits={"pip": 2})
+    release, ran = threading.Event(), []  # type: ignore
+
+    apt = scheduler.submit("apt-1", blocking(release, ran), [], ["apt"])
+    scheduler.submit("apt-2", blocking(release, ran), [], ["apt"])
+    scheduler.submit("apt-3", blocking(release, ran), [], ["apt"], priority=10)
+    # apt is busy, so this one goes ahead of the apt jobs waiting in front of it.
+    pip = scheduler.submit("pip-1", blocking(release, ran), [], ["pip"])
+    scheduler.wait(pip.id, 0.2)
+
+    assert ran == ["apt-1", "pip-1"]
+    release.set()
+    for job in scheduler.jobs():
+        scheduler.wait(job.id, 5)
+
+    assert ran == ["apt-1", "pip-1", "apt-3", "apt-2"]
+    assert scheduler.get(apt.id).state is enums.JobState.DONE
+
+
+def test_jobs_can_be_cancelled_and_report_failures() -> None:
+    scheduler = JobScheduler(max_jobs=1)
+    release, ran = threading.Event(), []  # type: ignore
+
+    def fail(job: Job) -> None:
+        raise RuntimeError("the backend exploded")
+
+    running = scheduler.submit("running", blocking(release, ran), [], ["apt"])
+    queued = scheduler.submit("queued", blocking(release, ran), [], ["apt"])
+    failing = scheduler.submit("failing", fail, [], ["pip"])
+
+    assert scheduler.cancel(queued.id)
+    assert queued.state is enums.JobState.CANCELLED
+    release.set()
+    scheduler.wait(failing.id, 5)
+
+    assert ran == ["running"]
+    assert failing.state is enums.JobState.FAILED
+    assert failing.error == "RuntimeError: the backend exploded"
+    assert not scheduler.cancel(failing.id)
+
+
+def test_running_jobs_stop_at_their_next_check() -> None:
+    scheduler = JobScheduler()
+    started = threading.Event()
+
+    def run(job: Job) -> None:
+        started.set()
+        while True:
+            job.check_cancelled()
+            time.sleep(0.01)
+
+    job = scheduler.submit("loop", run, [], [])
+    started.wait(5)
+    scheduler.cancel(job.id)
+
+    assert scheduler.wait(job.id, 5).state is enums.JobState.CANCELLED
+
+
+def test_jobs_without_providers_only_wait_for_the_ones_they_claim() -> None:
+    scheduler = JobScheduler(max_jobs=2)
+    release, ran = threading.Event(), []  # type: ignore
+
+    def claiming(provider: str) -> t.Callable[[Job], None]:
+        def run(job: Job) -> None:
+            scheduler.claim(job, [provider])
+            ran.append(job.operation)
+
+        return run
+
+    scheduler.submit("apt", blocking(release, ran), [], ["apt"])
+    any_apt = scheduler.submit("any-apt", claiming("apt"), [], [])
+    any_pip = scheduler.submit("any-pip", claiming("pip"), [], [])
+    scheduler.wait(any_pip.id, 5)
+
+    assert any_pip.state is enums.JobState.DONE
+    assert any_pip.providers == ["pip"]
+    assert ran == ["apt", "any-pip"]
+    release.set()
+    scheduler.wait(any_apt.id, 5)
+    assert ran == ["apt", "any-pip", "any-apt"]
+
+
+def test_glue_submits_and_follows_jobs(
+    use_sources: t.Callable[..., t.List[ProviderMetadata]],
+    manager: SinglePackageManager,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    source = GraphSource(provider="graph", graph={"app": ["lib"], "lib": []})
+    use_sources(graph=source)
+    monkeypatch.setattr(core, "jobs", JobScheduler())
+    job_id = manager.submit("install", ["app"], ["graph"])
+    job = manager.job(job_id, timeout=5)
+
+    assert job.state == "done"
+    assert source.batches == [["lib"], ["app"]]
+    assert [job.id for job in manager.jobs()] == [job_id]
+    assert not manager.cancel(job_id)
+
+    job = manager.job(manager.submit("remove", ["app"], []), timeout=5)
+    assert job.state == "done"
+    assert job.providers == ["graph"]
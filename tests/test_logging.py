@@ -0,0 +1,55 @@
+from single.context import ServerContext
+from single.server.utils import QueueSink
+from _pytest.monkeypatch import MonkeyPatch
+import typing as t
+import threading
+
+
+class SlowStream:
+    def __init__(self) -> None:
+        self.writes: t.List[str] = []
+        self.release = threading.Event()
+
+    def write(self, text: str) -> None:
+        self.release.wait(5)
+        self.writes.append(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def test_queue_sink_batches_and_drops_instead_of_blocking() -> None:
+    stream = SlowStream()
+    sink = QueueSink(stream, max_size=10, batch_size=100)  # type: ignore
+
+    for index in range(50):
+        sink.write(f"message {index}\n")
+
+    stream.release.set()
+    sink.stop()
+    written = "".join(stream.writes)
+
+    assert "message 0\n" in written
+    # the first message may already be taken by the writer when the buffer fills up.
+    assert written.count("message") in (10, 11)
+    assert "log message(s) were dropped" in written
+    assert len(stream.writes) <= 3
+
+
+def test_server_context_skips_disabled_levels(monkeypatch: MonkeyPatch) -> None:
+    logged = []
+
+    class Logger:
+        def opt(self, depth: int) -> "Logger":
+            return self
+
+        def __getattr__(self, name: str) -> t.Callable[[str], None]:
+            return lambda line: logged.append((name, line))
+
+    monkeypatch.setattr(ServerContext, "minimum_level", 20)
+    context = ServerContext(Logger())  # type: ignore
+    context.debug("hidden")
+    context.info("one\ntwo")
+    context.warn("three")
+
+    assert logged == [("info", "one"), ("info", "two"), ("warning", "three")]
@@ -0,0 +1,122 @@
+from single import Source, Package, System
+from single.server.providers.manage import SingleSource, SinglePackage
+import typing as t
+import time
+import attr
+import pytest
+
+
+@attr.s(auto_attribs=True)
+class SleepySource(Source):
+    delay: float = 0.0
+    fail: bool = False
+
+    @property
+    def os_supported(self) -> t.List[System]:
+        return [System.LINUX, System.WINDOWS, System.MAC, System.BSD]
+
+    @property
+    def backend_version(self) -> str:
+        return "0.1.0"
+
+    def supported(self) -> None:
+        super().supported()
+
+    def package(self, *names: str) -> t.List[Package]:
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("the backend exploded")
+
+        return [Package(name, "0.1.0", "", 1.0, 1.0, self) for name in names]
+
+    def install_package(self, *packages: Package) -> None:
+        pass
+
+    def remove_package(self, *packages: Package) -> None:
+        pass
+
+    def update_package(self, *packages: Package) -> None:
+        pass
+
+    def greet(self) -> None:
+        pass
+
+
+def test_single_source_package_searches_sources_concurrently() -> None:
+    sources = [SleepySource(delay=0.2) for _ in range(4)]
+    single_source = SingleSource(sources=sources)  # type: ignore
+
+    start = time.monotonic()
+    packages = single_source.package("a", "b")
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.6
+    assert len(packages) == 8
+    assert all(isinstance(package, SinglePackage) for package in packages)
+    assert [package.original_source for package in packages[::2]] == sources
+
+
+def test_single_source_package_leaves_out_late_and_failing_sources() -> None:
+    fast, slow, broken = (
+        SleepySource(),
+        SleepySource(delay=1.0),
+        SleepySource(fail=True),
+    )
+    single_source = SingleSource(sources=[slow, fast, broken], timeout=0.1)  # type: ignore
+
+    start = time.monotonic()
+    packages = single_source.package("a")
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.5
+    assert [package.original_source for package in packages] == [fast]
+
+
+def test_single_source_package_uses_per_source_timeouts() -> None:
+    slow = SleepySource(delay=0.2)
+    single_source = SingleSource(  # type: ignore
+        sources=[slow], timeout=0.05, timeouts={SleepySource: 1.0}
+    )
+
+    assert [package.original_source for package in single_source.package("a")] == [slow]
+
+
+@attr.s(auto_attribs=True, eq=False)
+class RecordingSource(SleepySource):
+    calls: t.List[t.Tuple[str, ...]] = attr.ib(factory=list)
+
+    def install_package(self, *packages: Package) -> None:
+        time.sleep(self.delay)
+        self.calls.append(tuple(package.name for package in packages))
+        if self.fail:
+            raise RuntimeError("the transaction failed")
+
+
+def test_single_source_installs_in_one_batch_per_source() -> None:
+    first, second = RecordingSource(delay=0.2), RecordingSource(delay=0.2)
+    single_source = SingleSource(sources=[first, second])
+    packages = [
+        Package(f"pkg{index}", "0.1.0", "", 1.0, 1.0, (first, second)[index % 2])
+        for index in range(50)
+    ]
+
+    start = time.monotonic()
+    single_source.install_package(*packages)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.35
+    assert first.calls == [tuple(f"pkg{index}" for index in range(0, 50, 2))]
+    assert len(second.calls) == 1 and len(second.calls[0]) == 25
+
+
+def test_single_source_batch_failures_dont_stop_other_sources() -> None:
+    failing, working = RecordingSource(fail=True), RecordingSource(delay=0.1)
+    single_source = SingleSource(sources=[failing, working])
+
+    with pytest.raises(RuntimeError, match="the transaction failed"):
+        single_source.install_package(
+            Package("a", "0.1.0", "", 1.0, 1.0, failing),
+            Package("b", "0.1.0", "", 1.0, 1.0, working),
+        )
+
+    assert working.calls == [("b",)]
@@ -0,0 +1,65 @@
+from single.server.providers import manifest as manifest_
+from single.server.providers.manifest import ProviderManifest
+from pathlib import Path
+from _pytest.monkeypatch import MonkeyPatch
+import shutil
+import pytest
+
+current_folder = Path(__file__).parent
+
+
+@pytest.fixture
+def providers_dir(tmp_path: Path) -> Path:
+    providers_dir = tmp_path / "providers"
+    providers_dir.mkdir()
+    shutil.copytree(
+        str(current_folder / "providers" / "test"), str(providers_dir / "test")
+    )
+    return providers_dir
+
+
+def test_manifest_finds_providers_and_restores_them_after_a_restart(
+    providers_dir: Path, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    manifest = ProviderManifest(tmp_path / "providers.json")
+    assert manifest.find([providers_dir, tmp_path / "i-do-not-exist"]) == [
+        providers_dir / "test"
+    ]
+    assert manifest.metadata(providers_dir / "test")["name"] == "Test Provider"
+    manifest.save()
+
+    def fail(*args: object) -> None:
+        raise AssertionError("nothing should've been parsed or listed")
+
+    monkeypatch.setattr(manifest_.toml, "loads", fail)
+    monkeypatch.setattr(Path, "iterdir", fail)
+    reloaded = ProviderManifest.load(tmp_path / "providers.json")
+    assert reloaded.find([providers_dir]) == [providers_dir / "test"]
+    assert reloaded.metadata(providers_dir / "test")["name"] == "Test Provider"
+
+
+def test_manifest_notices_changed_and_added_providers(providers_dir: Path) -> None:
+    manifest = ProviderManifest()
+    manifest.find([providers_dir])
+    manifest.metadata(providers_dir / "test")
+
+    provider_toml = providers_dir / "test" / "provider.toml"
+    provider_toml.write_text(
+        provider_toml.read_text().replace("Test Provider", "Changed Provider")
+    )
+    shutil.copytree(str(providers_dir / "test"), str(providers_dir / "added"))
+
+    assert manifest.metadata(providers_dir / "test")["name"] == "Changed Provider"
+    assert manifest.find([providers_dir]) == [
+        providers_dir / "added",
+        providers_dir / "test",
+    ]
+
+
+def test_manifest_raises_like_provider_metadata(tmp_path: Path) -> None:
+    manifest = ProviderManifest()
+
+    with pytest.raises(FileNotFoundError):
+        manifest.metadata(tmp_path / "i-do-not-exist")
+    with pytest.raises(NotADirectoryError):
+        manifest.metadata(current_folder / "providers" / "provider-file")
@@ -0,0 +1,61 @@
+from single.core import ProviderMetadata
+from single.glue import SinglePackageManager
+from single.server import core
+from single.server.metrics import Metrics, serve, write_prometheus
+from tests.sources import SlowSource
+from pathlib import Path
+from _pytest.monkeypatch import MonkeyPatch
+import urllib.request
+import typing as t
+import pytest
+
+
+def test_metrics_measure_calls_and_failures() -> None:
+    metrics = Metrics()
+    source = metrics.instrument_source("slow", SlowSource(count=3))
+
+    assert len(source.package("foo")) == 3
+    with pytest.raises(ZeroDivisionError):
+        metrics.call("rpc", ("divide",), lambda: 1 / 0)
+
+    snapshot = metrics.snapshot()
+    package = snapshot["source"]["slow"]["package"]
+    assert (package["count"], package["returned"], package["errors"]) == (1, 3, 0)
+    assert snapshot["rpc"]["divide"]["errors"] == 1
+    assert package["p99"] <= 0.001
+
+
+def test_metrics_are_exported_in_the_prometheus_format(tmp_path: Path) -> None:
+    metrics = Metrics()
+    metrics.call("rpc", ("search",), lambda: b"12345")
+    text = metrics.prometheus()
+
+    assert 'single_rpc_duration_seconds_bucket{method="search",le="+Inf"} 1' in text
+    assert 'single_rpc_returned_total{method="search"} 5' in text
+    assert "# TYPE single_source_in_flight gauge" in text
+
+    write_prometheus(metrics, tmp_path / "metrics.prom")
+    assert (tmp_path / "metrics.prom").read_text() == text
+
+    server = serve(metrics, 0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            assert response.read().decode() == metrics.prometheus()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_glue_reads_the_metrics_of_the_server(
+    use_sources: t.Callable[..., t.List[ProviderMetadata]],
+    manager: SinglePackageManager,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(core, "metrics", Metrics())
+    use_sources(slow=core.metrics.instrument_source("slow", SlowSource()))
+    manager.search(["vim"], [])
+    metrics = manager.metrics()
+
+    assert metrics["source"]["slow"]["package"]["returned"] == 1
+    assert 'provider="slow",call="package"' in manager.prometheus_metrics()
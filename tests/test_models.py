@@ -0,0 +1,93 @@
+from single import Package, PackageTable
+from single.server import search as search_
+from single.server.catalog import Catalog
+from single.server.providers.manage import SinglePackage
+from single.core import ProviderMetadata
+from tests.sources import SlowSource
+from pathlib import Path
+import tracemalloc
+import typing as t
+import pytest
+
+
+class TableSource(SlowSource):
+    def package(self, *names: str) -> PackageTable:  # type: ignore
+        return PackageTable.from_packages(super().package(*names), self)
+
+
+def test_packages_are_slotted_and_share_versions() -> None:
+    first = Package("vim", "".join(["9.", "0"]), "", 1.0, 1.0, None)
+    second = Package("nano", "".join(["9.", "0"]), "", 1.0, 1.0, None)
+
+    assert not hasattr(first, "__dict__")
+    assert first.version is second.version
+
+
+def test_single_packages_share_an_immutable_default() -> None:
+    first = SinglePackage("vim", "9.0", "", 1.0, 1.0, None)
+    second = SinglePackage("nano", "9.0", "", 1.0, 1.0, None)
+
+    assert first.other is second.other
+    with pytest.raises(TypeError):
+        first.other["key"] = "value"  # type: ignore
+
+
+def test_package_table_gives_back_packages_and_views() -> None:
+    source = SlowSource(count=3)
+    packages = source.package("foo")
+    table = PackageTable.from_packages(packages, source)
+
+    assert len(table) == 3
+    assert list(table) == packages
+    assert table[-1] == packages[-1]
+    assert table[1:] == packages[1:]
+    with pytest.raises(IndexError):
+        table.view(3)
+
+    view = table.view(-1)
+    assert (view.name, view.version, view.original_source) == (
+        packages[-1].name,
+        packages[-1].version,
+        source,
+    )
+    assert view.package() == packages[-1]
+    assert [view.name for view in table.views()] == [
+        package.name for package in packages
+    ]
+
+
+def test_package_table_is_smaller_than_packages() -> None:
+    names = [f"package-{index}" for index in range(20000)]
+
+    def measure(make: t.Callable[[], t.Any]) -> int:
+        tracemalloc.start()
+        try:
+            kept = make()  # noqa: F841
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    packages = measure(
+        lambda: [Package(name, "1.0", "", 1.0, 1.0, None) for name in names]
+    )
+    table = measure(
+        lambda: PackageTable.from_packages(
+            Package(name, "1.0", "", 1.0, 1.0, None) for name in names
+        )
+    )
+
+    assert table * 2 < packages
+
+
+def test_search_takes_tables_from_sources(tmp_path: Path) -> None:
+    provider = ProviderMetadata("table", "0.1.0", "", TableSource, Package, [])
+    source = TableSource(count=2)
+
+    found = search_.search(
+        ["foo"], [provider], Catalog(tmp_path / "catalog.db"), lambda _: source
+    )
+
+    assert [(name, package.name) for name, package in found] == [
+        ("table", "foo-0"),
+        ("table", "foo-1"),
+    ]
@@ -0,0 +1,95 @@
+from typer.testing import CliRunner
+from single import Package
+from single.cli.client import app as client_app
+from single.core import ProviderMetadata
+from single.glue import SinglePackageManager
+from single.server import core, versions
+from single.server.engines import SingleThreadedServer
+from tests.sources import VersionedSource
+import typing as t
+import attr
+import pytest
+import time
+
+
+@attr.s(auto_attribs=True)
+class SlowVersionedSource(VersionedSource):
+    listings: int = 0
+    failing: bool = False
+
+    def catalog(self) -> t.List[Package]:
+        time.sleep(self.delay)
+        if self.failing:
+            raise RuntimeError("the backend is down")
+        self.listings += 1
+        return super().catalog()
+
+
+@pytest.fixture
+def providers(
+    use_sources: t.Callable[..., t.List[ProviderMetadata]]
+) -> t.Dict[str, SlowVersionedSource]:
+    sources = {
+        "apt": SlowVersionedSource(versions={"vim": "9.1", "git": "2.40"}, delay=0.3),
+        "snap": SlowVersionedSource(versions={"code": "1.80"}, delay=0.0),
+        "flatpak": SlowVersionedSource(versions={"gimp": "2.10"}, delay=0.3),
+    }
+    use_sources(**sources)
+    core.installed.record_versions("apt", [("vim", "9.0"), ("git", "2.40")])
+    core.installed.record_versions("snap", [("code", "1.79")])
+    core.installed.record_versions("flatpak", [("gimp", "2.8")])
+    return sources
+
+
+def test_outdated_packages_are_found_concurrently(
+    providers: t.Dict[str, SlowVersionedSource]
+) -> None:
+    started = time.perf_counter()
+    found = [
+        (provider.name, updates)
+        for provider, updates in core.iter_outdated(core.providers)
+    ]
+
+    assert time.perf_counter() - started < 0.55
+    assert found[0] == ("snap", [versions.Update("code", "1.79", "1.80")])
+    assert dict(found)["apt"] == [versions.Update("vim", "9.0", "9.1")]
+    assert dict(found)["flatpak"] == [versions.Update("gimp", "2.8", "2.10")]
+
+
+def test_outdated_scan_reuses_fresh_listings_and_stale_ones_on_failures(
+    providers: t.Dict[str, SlowVersionedSource]
+) -> None:
+    list(core.iter_outdated(core.providers))
+    list(core.iter_outdated(core.providers))
+    assert providers["snap"].listings == 1
+
+    list(core.iter_outdated(core.providers, max_age=0))
+    assert providers["snap"].listings == 2
+
+    # a listing which can't be refreshed is still used as it is.
+    providers["apt"].failing = True
+    found = {
+        provider.name: [update.name for update in updates]
+        for provider, updates in core.iter_outdated(core.providers[:2], max_age=0)
+    }
+    assert found == {"apt": ["vim"], "snap": ["code"]}
+
+
+def test_outdated_packages_reach_the_client(
+    providers: t.Dict[str, SlowVersionedSource],
+    server: SingleThreadedServer,
+    manager: SinglePackageManager,
+) -> None:
+    assert [(record.provider, record.name) for record in manager.outdated()] == [
+        ("apt", "vim"),
+        ("snap", "code"),
+        ("flatpak", "gimp"),
+    ]
+    streamed = list(manager.outdated_iter(["snap", "apt"], page_size=1))
+    assert {record.name for record in streamed} == {"vim", "code"}
+
+    result = CliRunner().invoke(
+        client_app, ["outdated", "--port", str(server.port), "--providers", "snap"]
+    )
+    assert result.exit_code == 0
+    assert result.output == "snap: code 1.79 -> 1.80\n"
@@ -0,0 +1,81 @@
+from single.server import planner
+from single.server.search import FoundPackage
+from tests.sources import GraphSource
+import typing as t
+import time
+import pytest
+
+
+def make_resolver(
+    *sources: GraphSource,
+) -> t.Callable[[t.Optional[str], str], t.Optional[FoundPackage]]:
+    def resolve(provider: t.Optional[str], name: str) -> t.Optional[FoundPackage]:
+        for source in sources:
+            if provider in (None, source.provider) and name in source.graph:
+                return source.provider, source.package(name)[0]
+        return None
+
+    return resolve
+
+
+def test_plan_orders_dependencies_across_providers() -> None:
+    system = GraphSource(provider="apt", graph={"python": [], "libssl": []})
+    pip = GraphSource(
+        provider="pip",
+        graph={"app": ["requests", "apt:python"], "requests": ["apt:libssl"]},
+    )
+    resolve = make_resolver(system, pip)
+
+    plan = planner.plan_install([resolve(None, "app")], resolve)  # type: ignore
+
+    assert plan.levels == [
+        [("apt", "libssl"), ("apt", "python")],
+        [("pip", "requests")],
+        [("pip", "app")],
+    ]
+
+
+def test_plan_detects_cycles_and_missing_dependencies() -> None:
+    source = GraphSource(
+        provider="p", graph={"a": ["b"], "b": ["c"], "c": ["a"], "d": ["x"]}
+    )
+    resolve = make_resolver(source)
+
+    with pytest.raises(planner.DependencyCycleError) as error:
+        planner.plan_install([resolve(None, "a")], resolve)  # type: ignore
+    assert error.value.cycle == [("p", "a"), ("p", "b"), ("p", "c"), ("p", "a")]
+
+    with pytest.raises(planner.PackageNotFoundError):
+        planner.plan_install([resolve(None, "d")], resolve)  # type: ignore
+
+
+def test_execute_plan_runs_levels_in_parallel_and_skips_broken_branches() -> None:
+    first = GraphSource(
+        provider="first", graph={"a": [], "b": [], "c": ["a"]}, delay=0.2
+    )
+    second = GraphSource(
+        provider="second",
+        graph={"x": [], "y": ["x"], "z": ["first:b"]},
+        delay=0.2,
+        broken=["x"],
+    )
+    resolve = make_resolver(first, second)
+    requested = [resolve(None, name) for name in ["c", "y", "z"]]
+    plan = planner.plan_install(requested, resolve)  # type: ignore
+
+    start = time.monotonic()
+    result = planner.execute_plan(plan, provider_limits={"first": 2})
+    elapsed = time.monotonic() - start
+
+    # two levels, each taking a single round of transactions.
+    assert elapsed < 0.6
+    assert sorted(first.batches) == [["a"], ["b"], ["c"]]
+    assert second.batches == [["x"], ["z"]]
+    assert sorted(result.installed) == [
+        ("first", "a"),
+        ("first", "b"),
+        ("first", "c"),
+        ("second", "z"),
+    ]
+    assert list(result.failed) == [("second", "x")]
+    assert result.skipped == [("second", "y")]
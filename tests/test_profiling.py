@@ -0,0 +1,80 @@
+from single.core import ProviderMetadata
+from single.glue import SinglePackageManager
+from single.server import core
+from single.server.profiling import Profiler
+from tests.sources import SlowSource
+from pathlib import Path
+from _pytest.monkeypatch import MonkeyPatch
+import typing as t
+import pstats
+import pytest
+import time
+
+
+def busy(seconds: float) -> int:
+    deadline, spins = time.perf_counter() + seconds, 0
+    while time.perf_counter() < deadline:
+        spins += 1
+
+    return spins
+
+
+def test_profiler_profiles_nothing_until_started(tmp_path: Path) -> None:
+    profiler = Profiler(tmp_path)
+    assert profiler.call("rpc", ("search",), busy, 0.001)
+    assert profiler.stop() == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profiler_writes_pstats_per_call(tmp_path: Path) -> None:
+    profiler = Profiler(tmp_path)
+    source = profiler.instrument_source("slow", SlowSource(count=2))
+    profiler.start("cprofile")
+
+    assert len(source.package("foo")) == 2
+    profiler.call("rpc", ("search",), busy, 0.01)
+    paths = profiler.stop()
+
+    assert [path.name for path in paths] == [
+        "rpc-search.pstats",
+        "source-slow-package.pstats",
+    ]
+    functions = {function for _, _, function in pstats.Stats(str(paths[0])).stats}
+    assert "busy" in functions
+
+
+def test_profiler_samples_collapsed_stacks(tmp_path: Path) -> None:
+    profiler = Profiler(tmp_path)
+    profiler.start("sampling", interval=0.001)
+    profiler.call("rpc", ("search",), busy, 0.05)
+    (path,) = profiler.stop()
+
+    assert path.name == "rpc-search.collapsed"
+    stacks = path.read_text().splitlines()
+    assert stacks and all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+    assert any("busy (" in line for line in stacks)
+
+
+def test_profiler_rejects_bad_settings(tmp_path: Path) -> None:
+    profiler = Profiler(tmp_path)
+    with pytest.raises(ValueError):
+        profiler.start("perf")
+    with pytest.raises(ValueError):
+        profiler.start("cprofile", rate=0)
+    assert not profiler.enabled
+
+
+def test_glue_toggles_profiling(
+    tmp_path: Path,
+    use_sources: t.Callable[..., t.List[ProviderMetadata]],
+    manager: SinglePackageManager,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(core, "profiler", Profiler(tmp_path / "profiles"))
+    use_sources(slow=core.profiler.instrument_source("slow", SlowSource()))
+    assert manager.start_profiling() == []
+    manager.search(["vim"], [])
+    paths = [Path(path).name for path in manager.stop_profiling()]
+
+    assert "source-slow-package.pstats" in paths
+    assert manager.stop_profiling() == []
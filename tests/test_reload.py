@@ -0,0 +1,198 @@
+from single import Source, Package
+from single.core import ProviderMetadata
+from single.server import core
+from single.server.providers.manifest import ProviderManifest
+from single.server.providers.reload import ProviderReloader
+from single.server.providers.watch import ProviderWatcher
+from single.context import VoidContext
+from tests.sources import VersionedSource
+from _pytest.monkeypatch import MonkeyPatch
+from pathlib import Path
+import typing as t
+import threading
+import os
+
+PROVIDER_TOML = """
+[metadata]
+name = "{name}"
+version = "0.1.0"
+description = "Reloading Provider."
+source_name = "ReloadingSource"
+package_name = "Package"
+dependencies = []
+"""
+PROVIDER_MODULE = """
+from single import Source, Package, System
+
+
+class ReloadingSource(Source):
+    os_supported = [System.LINUX, System.WINDOWS, System.MAC, System.BSD]
+    backend_version = "0.1.0"
+
+    def supported(self):
+        super().supported()
+
+    def package(self, *names):
+        return []
+
+    def install_package(self, *packages):
+        pass
+
+    def remove_package(self, *packages):
+        pass
+
+    def update_package(self, *packages):
+        pass
+
+    def greet(self):
+        pass
+"""
+
+
+def write_provider(path: Path, name: str, module: str = PROVIDER_MODULE) -> None:
+    path.mkdir(exist_ok=True)
+    (path / "provider.toml").write_text(PROVIDER_TOML.format(name=name))
+    (path / "__init__.py").write_text(module)
+
+
+def remove_provider(path: Path) -> None:
+    for file in path.iterdir():
+        file.unlink()
+    path.rmdir()
+
+
+def test_reloader_only_reloads_what_changed(tmp_path: Path) -> None:
+    write_provider(tmp_path / "a", "A")
+    write_provider(tmp_path / "b", "B")
+    providers: t.List[t.Any] = []
+    errors: t.List[Exception] = []
+    reloader = ProviderReloader(
+        providers, errors, [tmp_path], ProviderManifest(), VoidContext()
+    )
+
+    result = reloader.reload()
+    assert [provider.name for provider in providers] == ["A", "B"]
+    assert [provider.name for provider in result.loaded] == ["A", "B"]
+    assert reloader.reload().empty
+
+    write_provider(tmp_path / "a", "Changed A", "this is not python")
+    os.utime(str(tmp_path / "a" / "__init__.py"), ns=(1, 1))
+    write_provider(tmp_path / "c", "C")
+    result = reloader.reload()
+    assert result.added == [tmp_path / "c"]
+    assert result.changed == [tmp_path / "a"]
+    assert [provider.name for provider in result.unloaded] == ["A"]
+    assert [provider.name for provider in providers] == ["B", "C"]
+    assert len(errors) == 1
+
+    write_provider(tmp_path / "a", "A")
+    remove_provider(tmp_path / "c")
+    result = reloader.reload()
+    assert result.removed == [tmp_path / "c"]
+    assert [provider.name for provider in providers] == ["A", "B"]
+    assert errors == []
+
+
+def test_reloading_keeps_what_is_known_about_names_still_loaded(
+    tmp_path: Path, server_state: None, monkeypatch: MonkeyPatch
+) -> None:
+    write_provider(tmp_path / "a", "A")
+    write_provider(tmp_path / "b", "A")
+    reloader = ProviderReloader(
+        core.providers, [], [tmp_path], ProviderManifest(), VoidContext()
+    )
+    monkeypatch.setattr(core, "reloader", reloader)
+    core.reload_providers()
+    source = VersionedSource(versions={"vim": "1.0"})
+    core.sources["A"] = source
+    core.catalog.refresh("A", "0.1.0", source.catalog())
+
+    remove_provider(tmp_path / "b")
+    assert [provider.name for provider in core.reload_providers().unloaded] == ["A"]
+    assert core.sources == {"A": source}
+    assert core.catalog.refreshed_at("A") is not None
+
+    remove_provider(tmp_path / "a")
+    core.reload_providers()
+    assert core.sources == {}
+    assert core.catalog.refreshed_at("A") is None
+
+
+def test_watcher_calls_back_until_stopped(tmp_path: Path) -> None:
+    called = threading.Event()
+    watcher = ProviderWatcher(called.set, [tmp_path], interval=0.05)
+
+    watcher.start()
+    try:
+        assert called.wait(5)
+    finally:
+        watcher.stop()
+
+
+def test_lazy_reloader_checks_providers_on_first_use(tmp_path: Path) -> None:
+    write_provider(tmp_path / "a", "A")
+    write_provider(
+        tmp_path / "b",
+        "B",
+        PROVIDER_MODULE.replace(
+            "super().supported()", "raise UnsupportedSystemError('no', 'no')"
+        ).replace("import Source,", "import Source, UnsupportedSystemError,"),
+    )
+    providers: t.List[t.Any] = []
+    errors: t.List[Exception] = []
+    reloader = ProviderReloader(
+        providers, errors, [tmp_path], ProviderManifest(), VoidContext(), lazy=True
+    )
+
+    reloader.reload()
+    assert [provider.name for provider in providers] == ["A", "B"]
+    assert all(provider.deferred for provider in providers)
+
+    a, b = providers
+    assert reloader.activate(a) is not None
+    assert reloader.activate(b) is None
+    assert providers == [a]
+    assert len(errors) == 1
+
+
+class BlockingReloader:
+    def __init__(self, slow: str) -> None:
+        self.slow = slow
+        self.release = threading.Event()
+        self.activations: t.List[str] = []
+
+    def activate(self, provider: ProviderMetadata) -> Source:
+        self.activations.append(provider.name)
+        if provider.name == self.slow:
+            self.release.wait(5)
+        return VersionedSource()
+
+
+def test_a_slow_provider_only_blocks_its_own_users(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    slow, fast = (
+        ProviderMetadata(name, "0.1.0", "", Source, Package, [])
+        for name in ("slow", "fast")
+    )
+    reloader = BlockingReloader("slow")
+    monkeypatch.setattr(core, "reloader", reloader)
+    monkeypatch.setattr(core, "sources", {})
+    monkeypatch.setattr(core, "activation_locks", {})
+
+    found: t.List[t.Optional[Source]] = []
+    users = [
+        threading.Thread(target=lambda: found.append(core.get_source(slow)))
+        for _ in range(2)
+    ]
+    for user in users:
+        user.start()
+
+    assert core.get_source(fast) is not None
+    assert found == []
+
+    reloader.release.set()
+    for user in users:
+        user.join()
+    assert len(found) == 2 and found[0] is found[1] is not None
+    assert sorted(reloader.activations) == ["fast", "slow"]
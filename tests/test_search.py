@@ -0,0 +1,111 @@
+from single import Package
+from single.server import search as search_
+from single.server.catalog import Catalog
+from tests.sources import SlowSource, ListingSource, make_providers
+from pathlib import Path
+import typing as t
+import time
+import pytest
+
+
+def test_search_falls_back_when_listing_fails() -> None:
+    providers, get_source = make_providers(
+        listing=ListingSource(names=["foo-listed"], failing=True)
+    )
+    catalog = Catalog(":memory:")
+
+    found = search_.search(["foo"], providers, catalog, get_source)
+    assert [package.name for _, package in found] == ["foo-0"]
+
+    get_source(providers[0]).failing = False  # type: ignore
+    assert search_.refresh_catalog(catalog, providers[0], get_source(providers[0]))
+    get_source(providers[0]).failing = True  # type: ignore
+    assert search_.refresh_catalog(
+        catalog, providers[0], get_source(providers[0]), force=True
+    )
+    found = search_.search(["foo"], providers, catalog, get_source)
+    assert [package.name for _, package in found] == ["foo-listed"]
+
+
+def test_iter_search_gives_back_fast_providers_first(tmp_path: Path) -> None:
+    providers, get_source = make_providers(
+        slow_search=SlowSource(delay=0.3), fast_search=SlowSource()
+    )
+    catalog = Catalog(tmp_path / "catalog.db")
+
+    found = search_.iter_search(["foo"], providers, catalog, get_source)
+    assert [provider.name for provider, _ in found] == ["fast_search", "slow_search"]
+
+    packages = search_.search(["foo"], providers, catalog, get_source)
+    assert [provider for provider, _ in packages] == ["slow_search", "fast_search"]
+
+
+def test_search_cursor_pages_and_caps_results(tmp_path: Path) -> None:
+    providers, get_source = make_providers(
+        many_a=SlowSource(count=30), many_b=SlowSource(delay=0.1, count=30)
+    )
+    catalog = Catalog(tmp_path / "catalog.db")
+    found = search_.iter_search(["foo"], providers, catalog, get_source)
+    cursor = search_.SearchCursor((packages for _, packages in found), max_results=50)
+
+    pages = []
+    done = False
+    while not done:
+        page, done = cursor.fetch(page_size=20)
+        pages.append(len(page))
+
+    assert sum(pages) == 50
+    assert max(pages) <= 20
+
+
+def test_search_cursors_close_idle_cursors() -> None:
+    cursors = search_.SearchCursors(idle_timeout=0.0)
+    first = search_.SearchCursor(iter([]))
+    first_id = cursors.open(first)
+    cursors.open(search_.SearchCursor(iter([])))
+
+    with pytest.raises(KeyError):
+        cursors.get(first_id)
+
+
+def test_search_cache_skips_providers_with_cached_results(tmp_path: Path) -> None:
+    providers, get_source = make_providers(
+        cached_a=SlowSource(delay=0.2), cached_b=SlowSource(delay=0.2)
+    )
+    catalog = Catalog(tmp_path / "catalog.db")
+    cache = search_.SearchCache(ttls={"cached_b": 0.0})
+
+    first = search_.search(["Foo"], providers, catalog, get_source, cache)
+    start = time.monotonic()
+    again = search_.search(["foo"], providers[:1], catalog, get_source, cache)
+    assert time.monotonic() - start < 0.1
+    assert again == first[:1]
+
+    # the results of cached_b expire right away.
+    search_.search(["foo"], providers, catalog, get_source, cache)
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
+
+
+def test_search_cache_evicts_and_invalidates() -> None:
+    cache = search_.SearchCache(max_packages=3)
+    source = SlowSource()
+    package = Package("foo", "1.0", "", 0, 0, source)
+
+    cache.put(["a"], "p", [package] * 2, cache.generation("p"))
+    cache.put(["b"], "q", [package], cache.generation("q"))
+    assert cache.get(["a"], "p") is not None
+    cache.put(["c"], "q", [package], cache.generation("q"))
+    # the least recently used results are evicted once the cache holds too many packages.
+    assert cache.get(["b"], "q") is None
+    assert cache.stats()["evictions"] == 1
+
+    generation = cache.generation("p")
+    cache.invalidate(["p"])
+    assert cache.get(["a"], "p") is None
+    # results of a search which started before the invalidation aren't cached.
+    cache.put(["a"], "p", [package], generation)
+    assert cache.get(["a"], "p") is None
+
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,153 @@
+from single import Source, Package, System, UnsupportedSystemError
+from single.core import ProviderMetadata
+from single.context import BufferedContext, VoidContext
+from single.server.providers.core import get_providers
+from single.server.providers.support import SupportCache
+from pathlib import Path
+import typing as t
+import attr
+import time
+import pytest
+
+PROVIDER_TOML = """
+[metadata]
+name = "{name}"
+version = "0.1.0"
+description = "Slow Provider."
+source_name = "SlowSource"
+package_name = "Package"
+dependencies = []
+"""
+PROVIDER_MODULE = """
+from single import Source, Package, System
+import time
+
+
+class SlowSource(Source):
+    os_supported = [System.LINUX, System.WINDOWS, System.MAC, System.BSD]
+    backend_version = "0.1.0"
+
+    def supported(self):
+        time.sleep({delay})
+        super().supported()
+
+    def package(self, *names):
+        return []
+
+    def install_package(self, *packages):
+        pass
+
+    def remove_package(self, *packages):
+        pass
+
+    def update_package(self, *packages):
+        pass
+
+    def greet(self):
+        self.context.info("{name} says hi")
+"""
+
+
+@attr.s(auto_attribs=True)
+class CountingSource(Source):
+    probes: t.List[None] = attr.ib(factory=list)
+    unsupported: bool = False
+    backend: t.Optional[str] = "0.1.0"
+
+    @property
+    def os_supported(self) -> t.List[System]:
+        return [System.LINUX, System.WINDOWS, System.MAC, System.BSD]
+
+    @property
+    def backend_version(self) -> str:
+        if self.backend is None:
+            raise FileNotFoundError("the backend isn't installed")
+        return self.backend
+
+    def supported(self) -> None:
+        self.probes.append(None)
+        if self.unsupported:
+            raise UnsupportedSystemError("nope", "install it")
+
+    def package(self, *names: str) -> t.List[Package]:
+        return []
+
+    def install_package(self, *packages: Package) -> None:
+        pass
+
+    def remove_package(self, *packages: Package) -> None:
+        pass
+
+    def update_package(self, *packages: Package) -> None:
+        pass
+
+    def greet(self) -> None:
+        pass
+
+
+def test_support_cache_remembers_verdicts_across_restarts(tmp_path: Path) -> None:
+    provider = ProviderMetadata("Counting", "0.1.0", "", CountingSource, Package, [])
+    supported, unsupported = CountingSource(), CountingSource(unsupported=True)
+    cache = SupportCache(tmp_path / "support.json")
+
+    cache.check(provider, supported)
+    cache.save()
+    reloaded = SupportCache.load(tmp_path / "support.json")
+    reloaded.check(provider, supported)
+    assert len(supported.probes) == 1
+
+    other_version = attr.evolve(provider, version="0.2.0")
+    for _ in range(2):
+        with pytest.raises(UnsupportedSystemError) as error:
+            reloaded.check(other_version, unsupported)
+        assert error.value.action_needed == "install it"
+    assert len(unsupported.probes) == 1
+
+
+def test_support_cache_handles_backends_changing_and_missing() -> None:
+    provider = ProviderMetadata("Counting", "0.1.0", "", CountingSource, Package, [])
+    source = CountingSource()
+    cache = SupportCache()
+
+    cache.check(provider, source)
+    source.backend = "0.2.0"
+    cache.check(provider, source)
+    cache.check(provider, source)
+    assert len(source.probes) == 2
+
+    missing = CountingSource(unsupported=True, backend=None)
+    for _ in range(2):
+        with pytest.raises(UnsupportedSystemError):
+            cache.check(attr.evolve(provider, name="Missing"), missing)
+    assert len(missing.probes) == 1
+
+
+def test_get_providers_loads_concurrently_in_a_deterministic_order(
+    tmp_path: Path,
+) -> None:
+    for name, delay in [("a", 0.3), ("b", 0.0), ("c", 0.3), ("d", 0.1)]:
+        provider_dir = tmp_path / name
+        provider_dir.mkdir()
+        (provider_dir / "provider.toml").write_text(PROVIDER_TOML.format(name=name))
+        (provider_dir / "__init__.py").write_text(
+            PROVIDER_MODULE.format(name=name, delay=delay)
+        )
+
+    start = time.monotonic()
+    providers, errors = get_providers([tmp_path])
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.6
+    assert [provider.name for provider in providers] == ["a", "b", "c", "d"]
+    assert errors == []
+
+
+def test_buffered_context_replays_in_order() -> None:
+    buffered, target = BufferedContext(), BufferedContext()
+    buffered.info("one")
+    buffered.warn("two", "three")
+    buffered.replay(target)
+    buffered.replay(VoidContext())
+
+    assert target.messages == [("info", ("one",)), ("warn", ("two", "three"))]
+    assert buffered.messages == []
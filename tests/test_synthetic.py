@@ -0,0 +1,54 @@
+from single.server.providers.core import get_providers
+from single.synthetic import (
+    SyntheticConfig,
+    SyntheticFailure,
+    package_names,
+    synthetic_source,
+    write_provider,
+)
+from pathlib import Path
+import pytest
+import time
+
+
+def test_synthetic_providers_load_and_follow_their_config(tmp_path: Path) -> None:
+    write_provider(tmp_path / "fast", "fast", packages=50, seed=1, indexable=False)
+    write_provider(
+        tmp_path / "flaky", "flaky", packages=10, failure_rate=1.0, latency=0.05
+    )
+    providers, errors = get_providers([tmp_path])
+    assert errors == []
+    sources = {provider.name: provider.source_reference() for provider in providers}
+
+    names = package_names(50, 1)
+    assert [package.name for package in sources["fast"].package(names[0])][0] == names[
+        0
+    ]
+    with pytest.raises(NotImplementedError):
+        sources["fast"].catalog()
+
+    started = time.perf_counter()
+    with pytest.raises(SyntheticFailure):
+        sources["flaky"].package("anything")
+    assert time.perf_counter() - started >= 0.05
+
+
+def test_synthetic_config_presets_and_validation(tmp_path: Path) -> None:
+    config = SyntheticConfig.from_table({"preset": "pip", "packages": 10})
+    assert (config.packages, config.indexable, config.latency_distribution) == (
+        10,
+        False,
+        "lognormal",
+    )
+
+    with pytest.raises(ValueError):
+        SyntheticConfig.from_table({"preset": "yum"})
+    with pytest.raises(ValueError):
+        SyntheticConfig.from_table({"latency_distribution": "bimodal"})
+    with pytest.raises(ValueError):
+        write_provider(tmp_path / "bad", "bad", packagez=10)
+
+    provider_dir = write_provider(tmp_path / "apt", "apt", preset="apt", packages=5)
+    source = synthetic_source(provider_dir / "__init__.py")
+    assert source.config.install_time == 2.0
+    assert len(package_names(1000, 0)) == len(set(package_names(1000, 0)))
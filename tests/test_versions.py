@@ -0,0 +1,98 @@
+from single.core import ProviderMetadata
+from single.server import core, versions
+from tests.sources import VersionedSource
+import typing as t
+import pytest
+
+
+@pytest.mark.parametrize(
+    "scheme, older, newer",
+    [
+        ("pep440", "1.0a1", "1.0"),
+        ("pep440", "1.0.dev1", "1.0a1"),
+        ("pep440", "1.0", "1.0.post1"),
+        ("pep440", "1.0rc1", "1.0.post1.dev1"),
+        ("pep440", "2.0", "1!0.1"),
+        ("pep440", "1.0", "1.0+local.1"),
+        ("pep440", "not a version", "0.1"),
+        ("debian", "1.0~rc1", "1.0"),
+        ("debian", "1.0~~", "1.0~"),
+        ("debian", "1.0-1", "1.0-2"),
+        ("debian", "1.0", "1.0.1"),
+        ("debian", "1.0a", "1.0+"),
+        ("debian", "2.30-1", "2.30-1ubuntu0.1"),
+        ("debian", "2.0", "1:0.9"),
+        ("semver", "1.0.0-alpha", "1.0.0-alpha.1"),
+        ("semver", "1.0.0-alpha.1", "1.0.0-alpha.beta"),
+        ("semver", "1.0.0-rc.1", "1.0.0"),
+        ("semver", "1.9.0", "1.10.0"),
+        ("rpm", "1.0~rc1", "1.0"),
+        ("rpm", "1.0", "1.0^git1"),
+        ("rpm", "1.0^git1", "1.0.1"),
+        ("rpm", "1.0-2.el8", "1.0-10.el8"),
+        ("generic", "1.9", "1.10"),
+    ],
+)
+def test_versions_are_ordered(scheme: str, older: str, newer: str) -> None:
+    assert versions.compare(older, newer, scheme) < 0
+    assert versions.compare(newer, older, scheme) > 0
+
+
+@pytest.mark.parametrize(
+    "scheme, first, second",
+    [
+        ("pep440", "1.0", "v1.0.0"),
+        ("pep440", "1.0alpha1", "1.0a1"),
+        ("debian", "1.0", "1.0-0"),
+        ("debian", "0:1.0", "1.0"),
+        ("semver", "1.0.0+build.1", "1.0.0"),
+    ],
+)
+def test_equal_versions_compare_equal(scheme: str, first: str, second: str) -> None:
+    assert versions.compare(first, second, scheme) == 0
+
+
+def test_parsing_is_memoized_and_checks_the_scheme() -> None:
+    versions.parse("7.1.0", "semver")
+    hits = versions.parse.cache_info().hits
+    versions.parse("7.1.0", "semver")
+
+    assert versions.parse.cache_info().hits == hits + 1
+    with pytest.raises(ValueError):
+        versions.parse("1.0", "calver")
+
+
+def test_updates_are_found_in_bulk() -> None:
+    installed = [("Zlib", "1.2"), ("curl", "8.0"), ("git", "2.40"), ("vim", "9.0")]
+    available = [
+        ("git", "2.39"),
+        ("zlib", "1.3"),
+        ("curl", "8.1"),
+        ("curl", "8.2"),
+        ("nano", "7.0"),
+    ]
+
+    assert versions.updates(installed, available) == [
+        versions.Update("curl", "8.0", "8.2"),
+        versions.Update("Zlib", "1.2", "1.3"),
+    ]
+
+
+@pytest.mark.parametrize("indexable", [True, False])
+def test_server_finds_outdated_packages(
+    use_sources: t.Callable[..., t.List[ProviderMetadata]], indexable: bool
+) -> None:
+    source = VersionedSource(
+        versions={"vim": "2:9.0-1", "git": "1:2.39-1", "nano": "7.0"},
+        indexable=indexable,
+    )
+    (provider,) = use_sources(apt=source)
+    core.installed.record_versions(
+        "apt", [("vim", "2:9.0~rc1-1"), ("git", "1:2.40-1"), ("curl", "8.0")]
+    )
+
+    assert core.outdated(provider) == [versions.Update("vim", "2:9.0~rc1-1", "2:9.0-1")]
+
+    core.record("update", provider, [])
+    assert [package.version for package in core.installed.owners("vim")] == ["2:9.0-1"]
+    assert core.outdated(provider) == []
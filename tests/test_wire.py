@@ -0,0 +1,41 @@
+from single import wire
+from single.core import ProviderMetadata
+from single.glue import SinglePackageManager
+from tests.sources import SlowSource
+from single import Package
+import typing as t
+import pytest
+
+
+def test_packages_survive_a_round_trip() -> None:
+    source = SlowSource()
+    packages = [
+        (f"provider{index % 3}", Package(f"pkg{index}", "1.0", "", index, 0, source))
+        for index in range(1000)
+    ]
+
+    blob = wire.pack_packages(packages)
+    assert blob[:1] == b"z"
+    records = wire.unpack_packages(blob)
+    assert [(record.provider, record.name) for record in records] == [
+        (provider, package.name) for provider, package in packages
+    ]
+    assert records[10].install_size == 10
+    assert wire.unpack_packages(wire.pack_packages([])) == []
+
+    with pytest.raises(ValueError):
+        wire.unpack_packages(b"nope")
+
+
+def test_glue_gets_packages_by_value(
+    use_sources: t.Callable[..., t.List[ProviderMetadata]],
+    manager: SinglePackageManager,
+) -> None:
+    (provider,) = use_sources(wire=SlowSource(count=5))
+
+    found = manager.search(["foo"], [provider])
+    assert [record.name for record in found] == [f"foo-{i}" for i in range(5)]
+    assert all(isinstance(record, wire.PackageRecord) for record in found)
+    assert [record.name for record in manager.search_iter(["foo"], [], 2)] == [
+        f"foo-{i}" for i in range(5)
+    ]